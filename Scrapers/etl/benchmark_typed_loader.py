@@ -0,0 +1,125 @@
+import sys
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from typed_loader import LISTING_SCHEMA, DEFAULT_CHUNKSIZE, apply_schema, concat_typed
+
+# --------------------------------------------------
+# Memory benchmark for typed loading
+# --------------------------------------------------
+# Builds a synthetic price history shaped like tvs_unified and loads
+# it the way pd.read_sql("select * ...") does (object strings, float64)
+# and the way typed_loader does (typed chunks). Each mode runs in its
+# own process so peak RSS is measured independently.
+#
+# Usage: python benchmark_typed_loader.py [rows]
+
+BRANDS = ["SAMSUNG", "LG", "SONY", "TCL", "MI", "VU", "ACER", "HISENSE", "ONEPLUS", "UNKNOWN"]
+PLATFORMS = ["amazon", "flipkart", "croma"]
+STOCK = ["in_stock", "out_of_stock"]
+DISPLAYS = ["LED", "QLED", "OLED", "MINI LED"]
+RESOLUTIONS = ["HD READY", "FULL HD", "4K ULTRA HD", "UNKNOWN"]
+
+
+def raw_rows(start, stop, seed=7):
+    """Rows as the MySQL driver hands them to pandas: Python objects only"""
+    rng = np.random.default_rng(seed + start)
+    n = stop - start
+    model = rng.integers(0, 5000, n)
+    price = rng.integers(8000, 250000, n)
+
+    return pd.DataFrame({
+        "platform": np.array(PLATFORMS, dtype=object)[rng.integers(0, 3, n)],
+        "product_id": [f"P{m:06d}" for m in model],
+        "brand": np.array(BRANDS, dtype=object)[model % len(BRANDS)],
+        "model_id": [f"{m:05d}MODEL" for m in model],
+        "full_name": [f"TV {m} 55 inch smart" for m in model],
+        "sale_price": price.astype(object),
+        "original_cost": (price * 1.3).astype(int).astype(object),
+        "discount": rng.integers(0, 60, n).astype(float),
+        "rating": rng.integers(30, 50, n) / 10,
+        "stock_status": np.array(STOCK, dtype=object)[rng.integers(0, 2, n)],
+        "scraped_at": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, n), unit="h"),
+        "product_url": [f"https://example.com/p/{m}" for m in model],
+        "image_url": [f"https://example.com/i/{m}.jpg" for m in model],
+        "display_type": np.array(DISPLAYS, dtype=object)[model % len(DISPLAYS)],
+        "screen_resolution": np.array(RESOLUTIONS, dtype=object)[model % len(RESOLUTIONS)],
+    })
+
+
+def load_untyped(rows):
+    return raw_rows(0, rows)
+
+
+def load_typed(rows):
+    frames = []
+    for start in range(0, rows, DEFAULT_CHUNKSIZE):
+        chunk = raw_rows(start, min(start + DEFAULT_CHUNKSIZE, rows))
+        frames.append(apply_schema(chunk, LISTING_SCHEMA))
+    return concat_typed(frames)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def measure(mode, rows, queue):
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    df = load_untyped(rows) if mode == "untyped" else load_typed(rows)
+
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        "mode": mode,
+        "seconds": round(elapsed, 2),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1024 ** 2, 1),
+        "traced_peak_mb": round(traced_peak / 1024 ** 2, 1),
+        "peak_rss_mb": peak_rss_mb(),
+    })
+
+
+def run(rows):
+    ctx = get_context("spawn")
+    results = []
+
+    for mode in ["untyped", "typed"]:
+        queue = ctx.Queue()
+        process = ctx.Process(target=measure, args=(mode, rows, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Synthetic history rows: {rows:,}\n")
+    untyped, typed = run(rows)
+
+    for result in (untyped, typed):
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] else "n/a"
+        print(
+            f"{result['mode']:>8}: frame {result['frame_mb']} MB, "
+            f"traced peak {result['traced_peak_mb']} MB, "
+            f"peak RSS {rss}, {result['seconds']} s"
+        )
+
+    print(f"\nFrame size reduction: {untyped['frame_mb'] / typed['frame_mb']:.1f}x")
+    print(f"Traced peak reduction: {untyped['traced_peak_mb'] / typed['traced_peak_mb']:.1f}x")
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------
+# Brand normalization
+# --------------------------------------------------
+# Shared by every platform. The brand column is factorized first, so
+# each distinct raw brand is normalized exactly once and the results
+# are mapped back to the rows with one array lookup. Cost follows the
+# number of distinct brands, not the number of rows.
+
+UNKNOWN_BRAND = "UNKNOWN"
+
+# --------------------------------------------------
+# VALID TV BRANDS
+# --------------------------------------------------
+VALID_TV_BRANDS = {
+    "ACER", "ACERPURE", "AISEN", "AIWA", "AMAZONBASICS", "BLAUPUNKT", "BPL",
+    "BUSH", "COOCAA", "COMPAQ", "CORNEA", "CROMA", "DAIWA", "DYANORA",
+    "ELISTA", "GEEPAS", "HAIER", "HAIKAWA", "HISENSE", "HUIDI", "HYEON",
+    "HYUNDAI", "IBELL", "IFFALCON", "IMPEX", "INFINIX", "INTEX", "ITEL",
+    "JVC", "KARBONN", "KODAK", "LG", "LIMEBERRY", "LLOYD", "LUGOSI",
+    "LUMIO", "MADURA", "MARQ", "MASHIVA", "METZ", "MI", "MICROMAX",
+    "MITASHI", "MOTOROLA", "MTC", "NACSON", "NEXAVISION", "NIKASHI", "NU",
+    "ONEPLUS", "ONIDA", "PANASONIC", "PHILIPS", "REALME", "REINTECH",
+    "RELIANCE", "SAMSUNG", "SANSUI", "SANYO", "SEVISION", "SHARP", "SHINCO",
+    "SKYWALL", "SKYLIVE", "SONY", "STARSHINE", "STUDYNLEARN", "TCL",
+    "TG", "THOMSON", "TIVORA", "TOSHIBA", "TRUSENSE", "UNIMAX", "UNIBOOM",
+    "UREN", "VASAP", "VIDEOCON", "VISTEK", "VU", "VW", "VZY", "WESTINGHOUSE",
+    "WESTON", "WOBBLE", "WYBOR", "XIAOMI", "ZEBRONICS", "GOOGLE",
+    "DARWIN"
+}
+
+# --------------------------------------------------
+# BRAND ALIASES
+# --------------------------------------------------
+# Keys are matched against the raw value (stripped) and against the
+# cleaned upper case value, so scraped mojibake can be listed as is.
+BRAND_ALIASES = {
+    "AISEN®": "AISEN",
+    "AISENÂ®": "AISEN",
+    "AisenÃ‚Â®": "AISEN",
+    "acer": "ACER",
+    "BLACK & DECKER": "BLACK+DECKER",
+    "BLACK+DECKER": "BLACK+DECKER",
+}
+
+TRADEMARK_CHARS = "®™©"
+
+
+def fix_mojibake(value):
+    """
+    Undo UTF-8 text that was decoded as latin-1/cp1252, possibly twice
+    (AISENÃ‚Â® -> AISENÂ® -> AISEN®).
+    """
+    for _ in range(3):
+        repaired = None
+        for codec in ("cp1252", "latin-1"):
+            try:
+                repaired = value.encode(codec).decode("utf-8")
+                break
+            except (UnicodeEncodeError, UnicodeDecodeError):
+                continue
+
+        if repaired is None or repaired == value:
+            break
+        value = repaired
+
+    return value
+
+
+def normalize_brand(value, validate=True):
+    """
+    Normalize one brand name:
+    - Check aliases on the raw value first
+    - Repair mojibake, upper/strip, drop trademark signs
+    - Check aliases again, then the valid brand list
+    - validate=False keeps brands that are not in the valid list
+    """
+    if value is None or pd.isna(value):
+        return UNKNOWN_BRAND
+
+    raw = str(value).strip()
+    if raw in BRAND_ALIASES:
+        return BRAND_ALIASES[raw]
+
+    brand = fix_mojibake(raw).upper()
+    for char in TRADEMARK_CHARS:
+        brand = brand.replace(char, "")
+    brand = " ".join(brand.split())
+
+    brand = BRAND_ALIASES.get(brand, brand)
+
+    if not brand:
+        return UNKNOWN_BRAND
+
+    if validate and brand not in VALID_TV_BRANDS:
+        return UNKNOWN_BRAND
+
+    return brand
+
+
+def normalize_brands(brands, validate=True):
+    """Vectorized normalize_brand over a Series via its distinct values"""
+    codes, uniques = pd.factorize(brands, use_na_sentinel=True)
+
+    # Missing values get code -1, which indexes the trailing UNKNOWN
+    lookup = np.array(
+        [normalize_brand(u, validate) for u in uniques] + [UNKNOWN_BRAND],
+        dtype=object
+    )
+
+    return pd.Series(lookup[codes], index=brands.index, name=brands.name)
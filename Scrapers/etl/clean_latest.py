@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from column_statistics import summarize
+from db_connection import get_engine
+from table_publisher import publish_table, staging_name, swap_in, widen_floats
+from typed_loader import load_table
+
+# --------------------------------------------------
+# Clean latest prices
+# --------------------------------------------------
+# tv_platform_latest_clean is tv_platform_latest_master without rows
+# the API can never show, plus an outlier flag:
+#
+#   dropped     sale_price <= 0, original_cost <= 0,
+#               discount outside 0..100, rating outside 0..5
+#   is_outlier  sale_price or original_cost above its IQR upper bound
+#               (q3 + 1.5 * IQR, computed once per run on the valid rows)
+#
+# Outliers stay in the table (premium TVs are real listings) so the
+# product endpoints keep them, while statistics can exclude them with
+# WHERE is_outlier = 0. The bounds of each run are stored in
+# tv_clean_bounds.
+
+CLEAN_TABLE = "tv_platform_latest_clean"
+BOUNDS_TABLE = "tv_clean_bounds"
+
+CLEAN_COLUMNS = [
+    "brand", "model_id", "product_id", "full_name", "platform",
+    "sale_price", "original_cost", "discount", "stock_status",
+    "scraped_at", "product_url", "rating", "display_type",
+    "image_url", "screen_resolution", "is_outlier",
+]
+
+# Columns whose IQR upper bound marks an outlier
+IQR_COLUMNS = ["sale_price", "original_cost"]
+
+# Fixed valid ranges; missing values are allowed
+RANGE_LIMITS = {
+    "discount": (0, 100),
+    "rating": (0, 5),
+}
+
+
+def valid_mask(df):
+    mask = (df["sale_price"] > 0) & (df["original_cost"] > 0)
+
+    for column, (low, high) in RANGE_LIMITS.items():
+        mask &= df[column].between(low, high) | df[column].isna()
+
+    return mask
+
+
+def robust_bounds(df):
+    """IQR bounds of IQR_COLUMNS, from their own quartiles"""
+    return summarize(df, IQR_COLUMNS)[["q1", "q3", "iqr", "lower_bound", "upper_bound"]]
+
+
+def outlier_mask(df, bounds):
+    """True where any IQR column is above its upper bound"""
+    upper = bounds["upper_bound"]
+    return df[IQR_COLUMNS].gt(upper[IQR_COLUMNS], axis=1).any(axis=1)
+
+
+def clean(latest):
+    valid = latest[valid_mask(latest)]
+
+    bounds = robust_bounds(valid)
+
+    valid = valid.assign(is_outlier=outlier_mask(valid, bounds))
+
+    return valid, bounds
+
+
+def publish_clean(df, engine):
+    """
+    Build the clean table with explicit column types and the indexes
+    the API pages through, and swap it in:
+      idx_price_key             /products keyset order
+    """
+    staging = staging_name(CLEAN_TABLE)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{staging}`"))
+        conn.execute(text(f"""
+            CREATE TABLE `{staging}` (
+                brand VARCHAR(100),
+                model_id VARCHAR(255) NOT NULL,
+                product_id VARCHAR(255),
+                full_name TEXT,
+                platform VARCHAR(50) NOT NULL,
+                sale_price DOUBLE NOT NULL,
+                original_cost DOUBLE NOT NULL,
+                discount DOUBLE,
+                stock_status VARCHAR(100),
+                scraped_at DATETIME,
+                product_url TEXT,
+                rating DOUBLE,
+                display_type VARCHAR(100),
+                image_url TEXT,
+                screen_resolution VARCHAR(100),
+                is_outlier TINYINT(1) NOT NULL DEFAULT 0,
+                INDEX idx_platform_model (platform, model_id),
+                INDEX idx_price_key (sale_price, platform, model_id),
+                INDEX idx_outlier (is_outlier)
+            )
+        """))
+
+    widen_floats(df[CLEAN_COLUMNS]).to_sql(
+        staging,
+        engine,
+        if_exists="append",
+        index=False,
+        chunksize=5000
+    )
+
+    swap_in(engine, CLEAN_TABLE)
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    latest = load_table(engine, "tv_platform_latest_master")
+
+    clean_rows, bounds = clean(latest)
+
+    publish_clean(clean_rows, engine)
+
+    publish_table(
+        bounds.rename_axis("column_name").reset_index().assign(computed_at=datetime.now()),
+        BOUNDS_TABLE,
+        engine
+    )
+
+    print(f"Rows in master: {len(latest)}")
+    print(f"Valid rows: {len(clean_rows)} ({len(latest) - len(clean_rows)} dropped)")
+    print(f"Outliers flagged: {int(clean_rows['is_outlier'].sum())}")
+    with pd.option_context("display.width", 200):
+        print(bounds)
+    print("Clean latest table published successfully")
@@ -0,0 +1,192 @@
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from db_connection import get_engine
+from table_publisher import publish_table
+from typed_loader import TABLE_SCHEMAS, load_table
+
+# --------------------------------------------------
+# Column statistics
+# --------------------------------------------------
+# Summary statistics for every numeric column of the master tables,
+# computed a whole frame at a time:
+#   describe()      count, mean, std, min, quartiles, max
+#   mode() / skew() per column, in the same pass over the frame
+#   np.corrcoef     correlation matrix, np.cov covariance matrix
+#
+# IQR outlier bounds use the column's own quartiles:
+#   lower_bound = max(0, q1 - 1.5 * IQR), upper_bound = q3 + 1.5 * IQR
+#
+# Results are published to column_statistics (one row per table and
+# column) and column_correlations (one row per column pair), which the
+# backend serves as they are.
+#
+# A run for some tables only replaces their rows; the rows of the
+# other tables are kept as they were.
+#
+# Usage: python column_statistics.py [table ...]   (default: all)
+
+STATISTICS_TABLE = "column_statistics"
+CORRELATIONS_TABLE = "column_correlations"
+
+IQR_FACTOR = 1.5
+
+MASTER_TABLES = [
+    "tv_platform_latest_master",
+    "tv_brand_master",
+    "tv_platform_master",
+]
+
+
+def numeric_columns(table_name):
+    """Numeric columns of a table according to its typed schema"""
+    schema = TABLE_SCHEMAS.get(table_name, {})
+    return [column for column, kind in schema.items() if kind in ("float", "int")]
+
+
+def summarize(df, columns=None):
+    """
+    Statistics for every numeric column of df in one pass.
+    Returns a DataFrame indexed by column name.
+    """
+    columns = columns or list(df.select_dtypes(include="number").columns)
+    values = df[columns].astype("float64")
+
+    summary = values.describe().T.rename(columns={
+        "25%": "q1",
+        "50%": "median",
+        "75%": "q3",
+    })
+
+    modes = values.mode()
+    summary["mode"] = modes.iloc[0] if not modes.empty else np.nan
+    summary["skew"] = values.skew()
+
+    summary["iqr"] = summary["q3"] - summary["q1"]
+    summary["lower_bound"] = (summary["q1"] - IQR_FACTOR * summary["iqr"]).clip(lower=0)
+    summary["upper_bound"] = summary["q3"] + IQR_FACTOR * summary["iqr"]
+
+    return summary[[
+        "count", "mean", "std", "min", "q1", "median", "q3", "max",
+        "mode", "skew", "iqr", "lower_bound", "upper_bound",
+    ]]
+
+
+def correlations(df, columns):
+    """
+    Correlation and covariance of every column pair.
+    Only rows where all columns are present are used.
+    """
+    values = df[columns].astype("float64").dropna().to_numpy()
+
+    if len(columns) < 2 or len(values) < 2:
+        return pd.DataFrame(columns=["column_x", "column_y", "correlation", "covariance"])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.corrcoef(values, rowvar=False)
+    cov = np.cov(values, rowvar=False)
+
+    x, y = np.triu_indices(len(columns), k=1)
+
+    return pd.DataFrame({
+        "column_x": np.array(columns)[x],
+        "column_y": np.array(columns)[y],
+        "correlation": corr[x, y],
+        "covariance": cov[x, y],
+    })
+
+
+def table_statistics(engine, table_name):
+    """Load only the numeric columns of a table and summarize them"""
+    columns = numeric_columns(table_name)
+    if not columns:
+        return None, None
+
+    df = load_table(engine, table_name, columns=columns)
+
+    stats = summarize(df, columns).rename_axis("column_name").reset_index()
+    stats.insert(0, "table_name", table_name)
+
+    corr = correlations(df, columns)
+    corr.insert(0, "table_name", table_name)
+
+    return stats, corr
+
+
+def compute(engine, tables=None):
+    tables = tables or MASTER_TABLES
+
+    stats_frames = []
+    corr_frames = []
+
+    for table_name in tables:
+        stats, corr = table_statistics(engine, table_name)
+        if stats is not None:
+            stats_frames.append(stats)
+            corr_frames.append(corr)
+
+    # None when no table has numeric columns
+    if not stats_frames:
+        return None, None
+
+    computed_at = datetime.now()
+
+    stats = pd.concat(stats_frames, ignore_index=True).assign(computed_at=computed_at)
+    corr = pd.concat(corr_frames, ignore_index=True).assign(computed_at=computed_at)
+
+    return stats, corr
+
+
+def keep_other_tables(engine, name, fresh, tables):
+    """Published rows of the tables not in `tables`, followed by fresh"""
+    if not inspect(engine).has_table(name):
+        return fresh
+
+    with engine.connect() as conn:
+        existing = pd.read_sql(text(f"SELECT * FROM `{name}`"), conn)
+
+    existing = existing[~existing["table_name"].isin(tables)]
+
+    return pd.concat([existing, fresh], ignore_index=True)
+
+
+def save(engine, stats, corr, tables=None):
+    """
+    Publish both result tables.
+    - tables: the tables that were recomputed, when not all of them
+    """
+    if tables:
+        stats = keep_other_tables(engine, STATISTICS_TABLE, stats, tables)
+        corr = keep_other_tables(engine, CORRELATIONS_TABLE, corr, tables)
+
+    publish_table(stats, STATISTICS_TABLE, engine)
+    publish_table(corr, CORRELATIONS_TABLE, engine)
+
+
+if __name__ == "__main__":
+    tables = sys.argv[1:]
+    unknown = [t for t in tables if t not in MASTER_TABLES]
+    if unknown:
+        print(f"Unknown table(s): {unknown}")
+        print(f"Usage: python column_statistics.py [table ...]   tables: {' '.join(MASTER_TABLES)}")
+        sys.exit(1)
+
+    engine = get_engine()
+
+    stats, corr = compute(engine, tables)
+    if stats is None:
+        print("No numeric columns to summarize, nothing published")
+        sys.exit(0)
+
+    save(engine, stats, corr, tables)
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(stats.drop(columns="computed_at").to_string(index=False))
+        print()
+        print(corr.drop(columns="computed_at").to_string(index=False))
+
+    print(f"\n{len(stats)} column statistics and {len(corr)} correlations saved")
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+from db_connection import get_engine
+
+# --------------------------------------------------
+# Data version
+# --------------------------------------------------
+# etl_data_version holds a single counter that is incremented every
+# time published data changes (a table swap, a rollback, the end of an
+# ETL run). The backend keys its response cache on this number, so
+# cached answers are dropped exactly when the data they came from is
+# replaced. published_at (UTC) is its Last-Modified time.
+
+DATA_VERSION_TABLE = "etl_data_version"
+
+
+def ensure_version_table(conn):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS `{DATA_VERSION_TABLE}` (
+            id TINYINT NOT NULL PRIMARY KEY,
+            version BIGINT NOT NULL,
+            published_at DATETIME NOT NULL
+        )
+    """))
+
+
+def bump(engine):
+    """Increment the data version and return the new value"""
+    with engine.begin() as conn:
+        ensure_version_table(conn)
+        conn.execute(text(f"""
+            INSERT INTO `{DATA_VERSION_TABLE}` (id, version, published_at)
+            VALUES (1, 1, UTC_TIMESTAMP())
+            ON DUPLICATE KEY UPDATE version = version + 1, published_at = UTC_TIMESTAMP()
+        """))
+        return conn.execute(
+            text(f"SELECT version FROM `{DATA_VERSION_TABLE}` WHERE id = 1")
+        ).scalar()
+
+
+if __name__ == "__main__":
+    print(f"Data version is now {bump(get_engine())}")
@@ -0,0 +1,29 @@
+import os
+
+from sqlalchemy.exc import SQLAlchemyError
+
+# --------------------------------------------------
+# ELT execution mode
+# --------------------------------------------------
+# ETL_MODE=elt    (default) run set-based steps as SQL inside MySQL
+# ETL_MODE=pandas always use the pandas implementation
+#
+# In ELT mode a failing SQL step falls back to pandas, so a server
+# without window functions or the needed privileges still completes.
+
+ETL_MODE = os.getenv("ETL_MODE", "elt").strip().lower()
+
+
+def run_elt(step_name, sql_step, pandas_step):
+    """Run sql_step in ELT mode, pandas_step otherwise or on failure"""
+    if ETL_MODE == "elt":
+        try:
+            result = sql_step()
+            print(f"{step_name}: built inside the database (ELT)")
+            return result
+        except SQLAlchemyError as e:
+            print(f"{step_name}: ELT failed, falling back to pandas ({e.__class__.__name__}: {e})")
+
+    result = pandas_step()
+    print(f"{step_name}: built with pandas")
+    return result
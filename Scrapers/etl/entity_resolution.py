@@ -0,0 +1,433 @@
+import re
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from db_connection import get_engine
+from table_publisher import publish_table
+from typed_loader import load_table
+
+# --------------------------------------------------
+# Cross-platform entity resolution
+# --------------------------------------------------
+# The same TV is listed under different model_ids on different
+# platforms (Amazon's model_id is guessed from the title). This stage
+# groups listings that describe the same product and publishes
+#
+#   canonical_models(platform, model_id, canonical_model_id,
+#                    match_score, match_method)
+#
+# Steps:
+#   1. normalize model codes (upper case, alphanumerics only, brand
+#      prefix and colour/variant text removed) and read the screen size
+#      from the title
+#   2. block: candidates are listings of one brand with the same code,
+#      a code that appears in the other's title, or the same screen
+#      size and 4 character code prefix
+#   3. long tail: listings still unmatched are grouped per brand with
+#      MinHash/LSH over title and code shingles
+#   4. score candidate pairs (code similarity + title token Jaccard)
+#      and merge pairs above MATCH_THRESHOLD, best first, into clusters
+#
+# Two listings never match when their codes name different models:
+# the screen size digits, series letters and model number of the code
+# (UA55CU7700 -> 55, CU, 7700) must be equal wherever both codes have
+# them, so a similar title can't lift 55CU8000 onto 55CU7700. A cluster
+# holds at most one listing per platform, and every merge is checked
+# against all members of both clusters, so matches don't chain
+# 55UQ7500 into 55UQ7590 through a listing between them.
+#
+# Every step is linear in the number of listings apart from the pairs
+# inside one block/bucket, which stay small.
+
+MATCH_THRESHOLD = 0.85
+
+CODE_PREFIX_LENGTH = 4
+
+# Shortest code trusted when one code contains the other
+MIN_CONTAINED_CODE = 8
+
+# Which platform's model_id names a cluster: real model numbers first
+PLATFORM_PRIORITY = ["croma", "flipkart", "amazon"]
+
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8
+
+VARIANT_WORDS = re.compile(r"\((?:[^)]*)\)|\b(?:BLACK|SILVER|GREY|GRAY|WHITE|BLUE)\b")
+INCH_PATTERN = re.compile(r"(\d{2,3}(?:\.\d)?)\s*(?:INCH|INCHES|IN\b|\"|”)", re.IGNORECASE)
+CM_PATTERN = re.compile(r"(\d{2,3}(?:\.\d+)?)\s*CM", re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# Optional letter prefix, size digits, series letters, model number
+CODE_CORE_PATTERN = re.compile(r"[A-Z]*(\d{2,3})([A-Z]+)(\d+)")
+
+# MinHash permutations are a * x + b mod this prime
+MERSENNE_PRIME = (1 << 61) - 1
+
+MAPPING_TABLE = "canonical_models"
+
+
+def ensure_mapping_table(engine):
+    """Keys and indexes for the compare lookup; builds clone this definition"""
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{MAPPING_TABLE}` (
+                platform VARCHAR(50) NOT NULL,
+                model_id VARCHAR(255) NOT NULL,
+                canonical_model_id VARCHAR(255) NOT NULL,
+                match_score DOUBLE NOT NULL,
+                match_method VARCHAR(20) NOT NULL,
+                PRIMARY KEY (platform, model_id),
+                INDEX idx_model (model_id),
+                INDEX idx_canonical (canonical_model_id)
+            )
+        """))
+
+
+def normalize_model_code(code, brand=None):
+    if code is None or pd.isna(code):
+        return ""
+
+    code = VARIANT_WORDS.sub(" ", str(code).upper())
+    code = re.sub(r"[^A-Z0-9]", "", code)
+
+    if brand and isinstance(brand, str):
+        prefix = re.sub(r"[^A-Z0-9]", "", brand.upper())
+        if prefix and code.startswith(prefix) and len(code) > len(prefix) + 3:
+            code = code[len(prefix):]
+
+    return "" if code == "UNKNOWN" else code
+
+
+def screen_size(title):
+    """Screen size in inches from a listing title, None if not found"""
+    if title is None or pd.isna(title):
+        return None
+
+    match = INCH_PATTERN.search(title)
+    if match:
+        return int(round(float(match.group(1))))
+
+    match = CM_PATTERN.search(title)
+    if match:
+        return int(round(float(match.group(1)) / 2.54))
+
+    return None
+
+
+def code_core(code):
+    """(size digits, series, number) of a normalized code, None if it has no such shape"""
+    match = CODE_CORE_PATTERN.match(code or "")
+    return match.groups() if match else None
+
+
+def title_tokens(title):
+    if title is None or pd.isna(title):
+        return frozenset()
+    return frozenset(TOKEN_PATTERN.findall(str(title).upper()))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+try:
+    from rapidfuzz.fuzz import ratio as _ratio
+
+    def code_similarity(a, b):
+        return _ratio(a, b) / 100
+except ImportError:
+    def code_similarity(a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+
+def code_in_title(code, tokens):
+    """A title token that is the code, or the code without its suffix"""
+    if len(code) < MIN_CONTAINED_CODE:
+        return False
+
+    return any(
+        len(token) >= MIN_CONTAINED_CODE and code.startswith(token)
+        for token in tokens
+    )
+
+
+def compatible(left, right):
+    """False when the listings are known to be different models"""
+    if left["size"] and right["size"] and left["size"] != right["size"]:
+        return False
+
+    if left["core"] and right["core"] and left["core"] != right["core"]:
+        return False
+
+    return True
+
+
+def score_pair(left, right):
+    """Similarity of two listings in [0, 1]"""
+    if not compatible(left, right):
+        return 0.0
+
+    if left["code"] and left["code"] == right["code"]:
+        return 1.0
+
+    # Region/variant suffixes (43UR7500PSC vs 43UR7500PSC.ATRZ), or a
+    # model code that appears in the other listing's title
+    shorter, longer = sorted((left["code"], right["code"]), key=len)
+    if len(shorter) >= MIN_CONTAINED_CODE and longer.startswith(shorter):
+        return 0.95
+    if code_in_title(left["code"], right["tokens"]) or code_in_title(right["code"], left["tokens"]):
+        return 0.95
+
+    code_score = code_similarity(left["code"], right["code"]) if left["code"] and right["code"] else 0.0
+    title_score = jaccard(left["tokens"], right["tokens"])
+
+    return 0.7 * code_score + 0.3 * title_score
+
+
+# --------------------------------------------------
+# MinHash / LSH
+# --------------------------------------------------
+
+def shingles(listing):
+    """Title tokens plus 3 character shingles of the model code"""
+    code = listing["code"]
+    grams = {code[i:i + 3] for i in range(max(len(code) - 2, 0))}
+    return listing["tokens"] | grams
+
+
+def minhash_signatures(shingle_sets, permutations=MINHASH_PERMUTATIONS, seed=42):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, permutations, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, permutations, dtype=np.uint64)
+
+    signatures = np.full((len(shingle_sets), permutations), np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    for row, items in enumerate(shingle_sets):
+        if not items:
+            continue
+        hashes = np.array([zlib.crc32(s.encode()) for s in items], dtype=np.uint64)
+        # uint64 arithmetic wraps, which is fine for hashing
+        permuted = (hashes[:, None] * a + b) % MERSENNE_PRIME
+        signatures[row] = permuted.min(axis=0)
+
+    return signatures
+
+
+def lsh_buckets(signatures, bands=LSH_BANDS):
+    rows_per_band = signatures.shape[1] // bands
+    buckets = defaultdict(list)
+
+    for row, signature in enumerate(signatures):
+        for band in range(bands):
+            chunk = signature[band * rows_per_band:(band + 1) * rows_per_band]
+            buckets[(band, chunk.tobytes())].append(row)
+
+    return [members for members in buckets.values() if len(members) > 1]
+
+
+# --------------------------------------------------
+# Clustering
+# --------------------------------------------------
+
+class Clusters:
+    """
+    Disjoint clusters of listings that only merge when the result keeps
+    one listing per platform and every pair of members is compatible.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.parent = list(range(len(records)))
+        self.members = {row: [row] for row in range(len(records))}
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def can_merge(self, root_x, root_y):
+        left, right = self.members[root_x], self.members[root_y]
+
+        platforms = {self.records[row]["platform"] for row in left}
+        if any(self.records[row]["platform"] in platforms for row in right):
+            return False
+
+        # Clusters hold one listing per platform, so this stays tiny
+        return all(
+            compatible(self.records[a], self.records[b])
+            for a in left for b in right
+        )
+
+    def merge(self, x, y):
+        """Merge the clusters of x and y; False if that is not allowed"""
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x == root_y:
+            return True
+        if not self.can_merge(root_x, root_y):
+            return False
+
+        root, other = min(root_x, root_y), max(root_x, root_y)
+        self.parent[other] = root
+        self.members[root] += self.members.pop(other)
+        return True
+
+
+def prepare_listings(latest):
+    listings = (
+        latest[["platform", "brand", "model_id", "full_name"]]
+        .astype({"platform": str, "brand": str})
+        .dropna(subset=["model_id"])
+        .drop_duplicates(subset=["platform", "model_id"])
+        .reset_index(drop=True)
+    )
+
+    listings["code"] = [
+        normalize_model_code(code, brand)
+        for code, brand in zip(listings["model_id"], listings["brand"])
+    ]
+    listings["core"] = [code_core(code) for code in listings["code"]]
+    listings["size"] = [screen_size(title) for title in listings["full_name"]]
+    listings["tokens"] = [title_tokens(title) for title in listings["full_name"]]
+
+    return listings
+
+
+def candidate_pairs(listings, blocks):
+    """Cross-platform pairs inside each block"""
+    platforms = listings["platform"].to_numpy()
+
+    for members in blocks:
+        for i, left in enumerate(members):
+            for right in members[i + 1:]:
+                if platforms[left] != platforms[right]:
+                    yield left, right
+
+
+def resolve(latest, threshold=MATCH_THRESHOLD):
+    """
+    Map every (platform, model_id) of `latest` to a canonical_model_id.
+    Returns a DataFrame ready to publish as canonical_models.
+    """
+    listings = prepare_listings(latest)
+    records = listings.to_dict("records")
+
+    clusters = Clusters(records)
+    best = np.zeros(len(listings))
+    method = np.array(["self"] * len(listings), dtype=object)
+
+    def link(pairs, label):
+        scored = []
+        for left, right in pairs:
+            score = score_pair(records[left], records[right])
+            if score >= threshold:
+                scored.append((score, left, right))
+
+        # Best matches claim their listings first; a weaker match that
+        # would put a second listing of a platform in the cluster is refused
+        for score, left, right in sorted(scored, key=lambda pair: -pair[0]):
+            if not clusters.merge(left, right):
+                continue
+            for row in (left, right):
+                if score > best[row]:
+                    best[row] = score
+                    method[row] = label
+
+    # Same brand and same normalized code
+    coded = listings[listings["code"] != ""]
+    exact = [
+        coded.index[rows].tolist()
+        for rows in coded.groupby(["brand", "code"]).indices.values()
+        if len(rows) > 1
+    ]
+    link(candidate_pairs(listings, exact), "exact")
+
+    # A model code written in another listing's title (Amazon guesses
+    # its model_id from the title, the real code is often still there)
+    by_prefix = defaultdict(list)
+    for row, record in enumerate(records):
+        if len(record["code"]) >= MIN_CONTAINED_CODE:
+            by_prefix[(record["brand"], record["code"][:MIN_CONTAINED_CODE])].append(row)
+
+    mentions = []
+    for row, record in enumerate(records):
+        found = {
+            other
+            for token in record["tokens"] if len(token) >= MIN_CONTAINED_CODE
+            for other in by_prefix.get((record["brand"], token[:MIN_CONTAINED_CODE]), [])
+            if other != row
+        }
+        if found:
+            mentions.append([row, *sorted(found)])
+    link(candidate_pairs(listings, mentions), "title_code")
+
+    # Blocking on brand, size and code prefix
+    block_key = (
+        listings["brand"] + "|"
+        + listings["size"].astype(str) + "|"
+        + listings["code"].str[:CODE_PREFIX_LENGTH]
+    )
+    blocks = [
+        rows.tolist() for key, rows in listings.groupby(block_key).indices.items()
+        if len(rows) > 1
+    ]
+    link(candidate_pairs(listings, blocks), "block")
+
+    # MinHash/LSH for whatever is still on its own, per brand
+    unmatched = np.flatnonzero(best == 0)
+    for _, rows in listings.iloc[unmatched].groupby("brand").indices.items():
+        rows = unmatched[rows]
+        if len(rows) < 2:
+            continue
+
+        signatures = minhash_signatures([shingles(records[r]) for r in rows])
+        buckets = [[rows[i] for i in bucket] for bucket in lsh_buckets(signatures)]
+        link(candidate_pairs(listings, buckets), "lsh")
+
+    # Name each cluster after its most trusted member
+    priority = {platform: rank for rank, platform in enumerate(PLATFORM_PRIORITY)}
+    listings["cluster"] = [clusters.find(row) for row in range(len(listings))]
+    listings["rank"] = listings["platform"].map(priority).fillna(len(priority))
+
+    canonical = (
+        listings.sort_values(["cluster", "rank", "model_id"])
+        .drop_duplicates("cluster")
+        .set_index("cluster")["model_id"]
+    )
+
+    return pd.DataFrame({
+        "platform": listings["platform"],
+        "model_id": listings["model_id"],
+        "canonical_model_id": listings["cluster"].map(canonical),
+        "match_score": np.where(best > 0, best, 1.0).round(3),
+        "match_method": method,
+    })
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    latest = load_table(
+        engine,
+        "tv_platform_latest_master",
+        columns=["platform", "brand", "model_id", "full_name"]
+    )
+
+    mapping = resolve(latest)
+
+    ensure_mapping_table(engine)
+    publish_table(mapping, MAPPING_TABLE, engine, keep_schema=True)
+
+    clusters = mapping["canonical_model_id"].nunique()
+    merged = int((mapping["model_id"] != mapping["canonical_model_id"]).sum())
+    print(f"{MAPPING_TABLE}: {len(mapping)} listings -> {clusters} products")
+    print(f"{MAPPING_TABLE}: {merged} listings mapped to another platform's model_id")
+    print(mapping["match_method"].value_counts().to_string())
+    print("Entity resolution completed successfully")
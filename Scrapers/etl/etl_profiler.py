@@ -0,0 +1,177 @@
+import glob
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# --------------------------------------------------
+# Stage profiler
+# --------------------------------------------------
+# run_etl.py starts every stage through this file:
+#
+#   python etl_profiler.py <stage_script.py> [args ...]
+#
+# which runs the stage unchanged while counting the bytes each pooled
+# SQLAlchemy connection sends to and receives from MySQL (the
+# session's Bytes_received / Bytes_sent status, read on checkout and
+# checkin). Counters are written to ETL_PROFILE_DIR, one file per
+# process, so worker processes started by a stage are included.
+#
+# ETL_TRACEMALLOC=1 also records the Python heap peak. It slows
+# allocation heavy stages down, so it is off by default; peak RSS and
+# CPU time are always taken from the finished process by run_etl.py.
+
+PROFILE_DIR_ENV = "ETL_PROFILE_DIR"
+TRACEMALLOC_ENV = "ETL_TRACEMALLOC"
+
+_counters = {"pid": None, "bytes_read": 0, "bytes_written": 0}
+
+
+def _reset_after_fork():
+    """A forked worker starts with its parent's totals; count from zero"""
+    if _counters["pid"] != os.getpid():
+        _counters.update(pid=os.getpid(), bytes_read=0, bytes_written=0)
+
+
+def _session_bytes(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(
+        "SHOW SESSION STATUS "
+        "WHERE Variable_name IN ('Bytes_sent', 'Bytes_received')"
+    )
+    values = {name: int(value) for name, value in cursor.fetchall()}
+    cursor.close()
+
+    # Server side names: what the server sent is what the stage read
+    return values.get("Bytes_sent", 0), values.get("Bytes_received", 0)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    try:
+        connection_record.info["profile_bytes"] = _session_bytes(dbapi_connection)
+    except Exception:
+        connection_record.info.pop("profile_bytes", None)
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    start = connection_record.info.pop("profile_bytes", None)
+    if start is None or dbapi_connection is None:
+        return
+
+    try:
+        read, written = _session_bytes(dbapi_connection)
+    except Exception:
+        return
+
+    _reset_after_fork()
+    _counters["bytes_read"] += read - start[0]
+    _counters["bytes_written"] += written - start[1]
+    flush()
+
+
+def install():
+    """Count MySQL traffic on every SQLAlchemy pool in this process"""
+    from sqlalchemy import event
+    from sqlalchemy.pool import Pool
+
+    _reset_after_fork()
+
+    event.listen(Pool, "checkout", _on_checkout)
+    event.listen(Pool, "checkin", _on_checkin)
+
+    if os.getenv(TRACEMALLOC_ENV) == "1":
+        tracemalloc.start()
+
+
+def flush():
+    """Write this process's counters to the profile directory"""
+    profile_dir = os.getenv(PROFILE_DIR_ENV)
+    if not profile_dir:
+        return
+
+    _reset_after_fork()
+
+    metrics = dict(_counters)
+    if tracemalloc.is_tracing():
+        metrics["python_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+
+    with open(os.path.join(profile_dir, f"{os.getpid()}.json"), "w") as f:
+        json.dump(metrics, f)
+
+
+def collect(profile_dir):
+    """Combine the per process files of one stage"""
+    totals = {"bytes_read": 0, "bytes_written": 0, "python_peak_mb": None}
+
+    for path in glob.glob(os.path.join(profile_dir, "*.json")):
+        with open(path) as f:
+            metrics = json.load(f)
+
+        totals["bytes_read"] += metrics.get("bytes_read", 0)
+        totals["bytes_written"] += metrics.get("bytes_written", 0)
+
+        if "python_peak_bytes" in metrics:
+            peak = metrics["python_peak_bytes"] / 1024 / 1024
+            totals["python_peak_mb"] = max(totals["python_peak_mb"] or 0, peak)
+
+    return totals
+
+
+def maxrss_mb(usage):
+    # Linux reports KB, macOS reports bytes
+    return usage.ru_maxrss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def run_profiled(command, cwd, env):
+    """
+    Run a command and measure it from outside.
+    Returns (returncode, output, metrics) where metrics holds wall time
+    and, where os.wait4 exists, CPU time and peak RSS of the process
+    (including workers it waited for).
+    """
+    started = time.perf_counter()
+
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env=env
+    )
+    output = process.stdout.read()
+    process.stdout.close()
+
+    metrics = {"cpu_seconds": None, "peak_rss_mb": None}
+
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        metrics["cpu_seconds"] = usage.ru_utime + usage.ru_stime
+        metrics["peak_rss_mb"] = maxrss_mb(usage)
+    else:
+        process.wait()
+
+    metrics["wall_seconds"] = time.perf_counter() - started
+
+    return process.returncode, output, metrics
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python etl_profiler.py <script.py> [args ...]")
+        sys.exit(1)
+
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+
+    install()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        flush()
@@ -0,0 +1,263 @@
+import os
+import shutil
+import sys
+from datetime import date
+
+import pandas as pd
+
+# --------------------------------------------------
+# Columnar price history store
+# --------------------------------------------------
+# The unified history is also kept as Parquet, partitioned by
+# scrape_date and platform (hive layout):
+#
+#   history/scrape_date=2025-01-31/platform=amazon/part-0-0.parquet
+#
+# Strings are dictionary encoded and rows are sorted by model_id inside
+# each file, so row group statistics let a model_id filter skip most
+# of the data. Analytics and backfills (price_daily, price_events) read
+# from here through load_history instead of pulling tvs_unified out of
+# MySQL.
+#
+# pyarrow is optional: without it the store is simply skipped and
+# load_history reads tvs_unified.
+#
+# Usage:
+#   python history_store.py backfill
+#   python history_store.py query <model_id> [start_date] [end_date]
+
+HISTORY_DIR = os.getenv(
+    "OFFERZONE_HISTORY_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+)
+
+def _arrow():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    return pa, ds, fs
+
+
+def _partitioning(pa, ds):
+    return ds.partitioning(
+        pa.schema([("scrape_date", pa.date32()), ("platform", pa.string())]),
+        flavor="hive"
+    )
+
+
+def write_history(df, root=HISTORY_DIR, replace=True, part=0):
+    """
+    Write history rows to the Parquet store.
+    - replace=True rewrites every partition present in df
+    - part names the files so chunked writes do not overwrite each other
+    """
+    pa, ds, _ = _arrow()
+
+    if df.empty:
+        return 0
+
+    df = df.assign(
+        scrape_date=pd.to_datetime(df["scraped_at"]).dt.date,
+        platform=df["platform"].astype(str)
+    ).sort_values(["scrape_date", "platform", "model_id"])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(pa, ds),
+        basename_template=f"part-{part}-{{i}}.parquet",
+        existing_data_behavior="delete_matching" if replace else "overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression="zstd",
+            use_dictionary=True
+        ),
+        max_rows_per_group=64 * 1024
+    )
+
+    return len(df)
+
+
+def _clear_staging(root):
+    staging = root + ".staging"
+
+    if os.path.isdir(staging):
+        shutil.rmtree(staging)
+
+    return staging
+
+
+def _swap_in(root):
+    """Replace root with root.staging by rename, like master tables"""
+    staging = root + ".staging"
+    previous = root + ".previous"
+
+    if os.path.isdir(previous):
+        shutil.rmtree(previous)
+    if os.path.isdir(root):
+        os.rename(root, previous)
+    if os.path.isdir(staging):
+        os.rename(staging, root)
+    if os.path.isdir(previous):
+        shutil.rmtree(previous)
+
+
+def rebuild_history(df, root=HISTORY_DIR):
+    """Replace the whole store with df"""
+    rows = write_history(df, _clear_staging(root))
+    _swap_in(root)
+
+    return rows
+
+
+def drop_history(root=HISTORY_DIR):
+    """Remove the store; load_history reads tvs_unified until it is rebuilt"""
+    if os.path.isdir(root):
+        shutil.rmtree(root)
+
+
+def open_history(root=HISTORY_DIR):
+    """Open the store as a memory mapped Arrow dataset"""
+    pa, ds, fs = _arrow()
+
+    return ds.dataset(
+        root,
+        format="parquet",
+        partitioning=_partitioning(pa, ds),
+        filesystem=fs.LocalFileSystem(use_mmap=True)
+    )
+
+
+def history_filter(model_ids=None, start=None, end=None, platforms=None):
+    """
+    Build a pushdown filter expression.
+    Date and platform prune partitions, model_id uses row group stats.
+    """
+    _, ds, _ = _arrow()
+
+    conditions = []
+
+    if model_ids is not None:
+        if isinstance(model_ids, str):
+            model_ids = [model_ids]
+        conditions.append(ds.field("model_id").isin(list(model_ids)))
+
+    if start is not None:
+        conditions.append(ds.field("scrape_date") >= pd.Timestamp(start).date())
+
+    if end is not None:
+        conditions.append(ds.field("scrape_date") <= pd.Timestamp(end).date())
+
+    if platforms is not None:
+        if isinstance(platforms, str):
+            platforms = [platforms]
+        conditions.append(ds.field("platform").isin(list(platforms)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    return expression
+
+
+def read_history(model_ids=None, start=None, end=None, platforms=None,
+                 columns=None, root=HISTORY_DIR, as_arrow=False):
+    """
+    Read price history from the Parquet store.
+    Returns a DataFrame (or an Arrow table with as_arrow=True).
+    """
+    if not os.path.isdir(root):
+        return None if as_arrow else pd.DataFrame(columns=columns)
+
+    dataset = open_history(root)
+    table = dataset.to_table(
+        columns=columns,
+        filter=history_filter(model_ids, start, end, platforms)
+    )
+
+    return table if as_arrow else table.to_pandas()
+
+
+def history_available(root=HISTORY_DIR):
+    """True when pyarrow is installed and the store has been written"""
+    try:
+        _arrow()
+    except ImportError:
+        return False
+
+    return os.path.isdir(root)
+
+
+def load_history(engine, columns, since=None, after=False, root=HISTORY_DIR):
+    """
+    History rows for analytics and backfills.
+    Read from the Parquet store, or from tvs_unified when the store
+    is not available.
+    - since: only rows scraped at or after it (strictly after with after=True)
+    """
+    if not history_available(root):
+        from typed_loader import load_table
+
+        if since is None:
+            return load_table(engine, "tvs_unified", columns=columns)
+
+        operator = ">" if after else ">="
+        return load_table(
+            engine,
+            "tvs_unified",
+            columns=columns,
+            where=f"scraped_at {operator} :since",
+            params={"since": since}
+        )
+
+    # scrape_date prunes partitions, scraped_at gives the exact cut
+    start = None if since is None else pd.Timestamp(since).date()
+    rows = read_history(start=start, columns=columns, root=root)
+
+    if since is not None:
+        scraped_at = pd.to_datetime(rows["scraped_at"])
+        since = pd.Timestamp(since)
+        rows = rows[scraped_at > since if after else scraped_at >= since]
+
+    return rows.reset_index(drop=True)
+
+
+def backfill(engine, root=HISTORY_DIR, chunksize=200000):
+    """Rebuild the whole store from tvs_unified, streaming in chunks"""
+    from typed_loader import load_table
+
+    staging = _clear_staging(root)
+
+    total = 0
+    for part, chunk in enumerate(load_table(engine, "tvs_unified", chunksize=chunksize)):
+        total += write_history(chunk, staging, replace=False, part=part)
+
+    _swap_in(root)
+
+    return total
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+
+    if command == "backfill":
+        from db_connection import get_engine
+
+        rows = backfill(get_engine())
+        print(f"History store rebuilt: {rows} rows in {HISTORY_DIR}")
+
+    elif command == "query" and len(sys.argv) > 2:
+        model_id = sys.argv[2]
+        start = sys.argv[3] if len(sys.argv) > 3 else None
+        end = sys.argv[4] if len(sys.argv) > 4 else date.today()
+
+        history = read_history(model_id, start, end)
+        print(history.sort_values("scraped_at").to_string(index=False))
+
+    else:
+        print("Usage: python history_store.py backfill")
+        print("       python history_store.py query <model_id> [start_date] [end_date]")
+        sys.exit(1)
@@ -0,0 +1,146 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from db_connection import get_engine
+from table_publisher import staging_name, swap_in, widen_floats
+from typed_loader import load_table
+
+# --------------------------------------------------
+# Model deals
+# --------------------------------------------------
+# One row per model_id with its prices across platforms, read by
+# /products/best-deals:
+#
+#   min_price / max_price / avg_price    over the platforms listing it
+#   price_difference                     max_price - min_price
+#   savings_percent                      price_difference / max_price * 100
+#   platforms                            JSON list of platforms
+#   platform_prices                      JSON object {platform: sale_price}
+#
+# Built from tv_platform_latest_clean, so the API reads precomputed rows
+# through indexes instead of grouping the latest prices per request.
+
+DEALS_TABLE = "model_deals"
+SOURCE_TABLE = "tv_platform_latest_clean"
+
+SOURCE_COLUMNS = [
+    "model_id", "platform", "full_name", "brand", "display_type", "image_url",
+    "sale_price", "original_cost", "discount", "rating", "stock_status",
+]
+
+DEALS_COLUMNS = [
+    "model_id", "full_name", "brand", "display_type", "image_url",
+    "platform_count", "min_price", "max_price", "avg_price",
+    "price_difference", "savings_percent", "original_cost",
+    "max_discount", "avg_rating", "stock_status",
+    "platforms", "platform_prices", "computed_at",
+]
+
+
+def build_deals(latest):
+    # MIN() of text needs plain strings rather than unordered categories,
+    # and widened prices keep 4.3 from reading 4.300000190734863 in JSON
+    latest = widen_floats(latest)
+    latest = latest.astype({
+        c: object for c in latest.columns if isinstance(latest[c].dtype, pd.CategoricalDtype)
+    })
+    latest = latest.sort_values(["model_id", "platform"])
+
+    deals = latest.groupby("model_id", sort=True).agg(
+        full_name=("full_name", "min"),
+        brand=("brand", "min"),
+        display_type=("display_type", "min"),
+        image_url=("image_url", "min"),
+        platform_count=("platform", "nunique"),
+        min_price=("sale_price", "min"),
+        max_price=("sale_price", "max"),
+        avg_price=("sale_price", "mean"),
+        original_cost=("original_cost", "max"),
+        max_discount=("discount", "max"),
+        avg_rating=("rating", "mean"),
+        stock_status=("stock_status", "min"),
+    ).reset_index()
+
+    deals["price_difference"] = deals["max_price"] - deals["min_price"]
+    deals["savings_percent"] = (deals["price_difference"] / deals["max_price"] * 100).round(1)
+
+    # {platform: sale_price} per model, platforms in name order
+    platform_prices = {}
+    for model_id, platform, price in zip(latest["model_id"], latest["platform"], latest["sale_price"]):
+        platform_prices.setdefault(model_id, {})[platform] = float(price)
+
+    prices = deals["model_id"].map(platform_prices)
+    deals["platforms"] = prices.map(lambda p: json.dumps(list(p)))
+    deals["platform_prices"] = prices.map(json.dumps)
+
+    deals["computed_at"] = datetime.now()
+
+    return deals[DEALS_COLUMNS]
+
+
+def publish_deals(deals, engine):
+    """
+    Build model_deals with explicit column types and an index for each
+    filter and sort order of /products/best-deals, and swap it in.
+    """
+    staging = staging_name(DEALS_TABLE)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{staging}`"))
+        conn.execute(text(f"""
+            CREATE TABLE `{staging}` (
+                model_id VARCHAR(255) NOT NULL,
+                full_name TEXT,
+                brand VARCHAR(100),
+                display_type VARCHAR(100),
+                image_url TEXT,
+                platform_count INT NOT NULL,
+                min_price DOUBLE NOT NULL,
+                max_price DOUBLE NOT NULL,
+                avg_price DOUBLE NOT NULL,
+                price_difference DOUBLE NOT NULL,
+                savings_percent DOUBLE NOT NULL,
+                original_cost DOUBLE,
+                max_discount DOUBLE,
+                avg_rating DOUBLE,
+                stock_status VARCHAR(100),
+                platforms JSON NOT NULL,
+                platform_prices JSON NOT NULL,
+                computed_at DATETIME,
+                PRIMARY KEY (model_id),
+                INDEX idx_brand_price (brand, min_price),
+                INDEX idx_min_price (min_price),
+                INDEX idx_price_difference (price_difference),
+                INDEX idx_savings_percent (savings_percent),
+                INDEX idx_max_discount (max_discount),
+                INDEX idx_avg_rating (avg_rating)
+            )
+        """))
+
+    widen_floats(deals).to_sql(
+        staging,
+        engine,
+        if_exists="append",
+        index=False,
+        chunksize=5000
+    )
+
+    swap_in(engine, DEALS_TABLE)
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    latest = load_table(engine, SOURCE_TABLE, columns=SOURCE_COLUMNS)
+
+    deals = build_deals(latest)
+
+    publish_deals(deals, engine)
+
+    print(f"Listings read: {len(latest)}")
+    print(f"Models published: {len(deals)}")
+    print(f"Models on 2+ platforms: {int((deals['platform_count'] > 1).sum())}")
+    print("Model deals table published successfully")
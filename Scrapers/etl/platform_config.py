@@ -0,0 +1,112 @@
+# --------------------------------------------------
+# Per-platform standardization rules
+# --------------------------------------------------
+# standardize.py applies the same pipeline to every platform below.
+# Adding a platform only needs a new entry here.
+#
+# source_table   raw scraper table
+# target_table   standardized table read by unify_tv.py
+# null_tokens    strings that mean "missing" in the raw table
+# rename         raw column name -> standard column name
+# stock_status   None      -> normalise the raw stock_status text
+#                {...}     -> build stock_status from another column
+# brand_rule     "validated" -> keep only VALID_TV_BRANDS, else UNKNOWN
+#                "open"      -> clean the raw brand but keep unlisted ones
+#                (both go through brand_normalizer.py)
+# fill           applied in order; a value fills with a constant,
+#                {"column": name} fills from another column
+# int_columns    cast to int after filling
+# upper_columns  upper/strip text columns
+# fill_unknown   text columns where missing values become "UNKNOWN"
+
+OUTPUT_COLUMNS = [
+    "platform",
+    "product_id",
+    "brand",
+    "model_id",
+    "full_name",
+    "sale_price",
+    "original_cost",
+    "discount",
+    "rating",
+    "stock_status",
+    "scraped_at",
+    "product_url",
+    "image_url",
+    "display_type",
+    "screen_resolution"
+]
+
+NUMERIC_COLUMNS = ["sale_price", "original_cost", "discount", "rating"]
+
+# Rows without these cannot be deduplicated or placed in history
+REQUIRED_COLUMNS = ["product_id", "scraped_at"]
+
+PLATFORMS = {
+    "amazon": {
+        "source_table": "amazon_tv",
+        "target_table": "amazon_tv_standardized",
+        "null_tokens": [],
+        "rename": {},
+        "stock_status": None,
+        "brand_rule": "validated",
+        "fill": [
+            ("rating", 0),
+            ("sale_price", 0),
+            ("original_cost", {"column": "sale_price"}),
+            ("discount", 0),
+        ],
+        "int_columns": ["sale_price", "original_cost", "discount"],
+        "upper_columns": ["model_id"],
+        "fill_unknown": ["model_id"],
+    },
+
+    "flipkart": {
+        "source_table": "flipkart_products_new",
+        "target_table": "flipkart_tv_standardized",
+        "null_tokens": ["NULL"],
+        "rename": {
+            "product_name": "full_name",
+            "selling_price": "sale_price",
+            "original_price": "original_cost",
+            "discount_percent": "discount",
+            "rating_value": "rating",
+            "platform_product_id": "product_id",
+            "screen_type": "display_type",
+            "panel_type": "screen_resolution",
+        },
+        "stock_status": {
+            "column": "product_is_unavailable",
+            "map": {"yes": "out_of_stock", "no": "in_stock"},
+        },
+        "brand_rule": "open",
+        "fill": [
+            ("original_cost", {"column": "sale_price"}),
+            ("sale_price", {"column": "original_cost"}),
+            ("discount", 0),
+            ("rating", 0),
+            ("sale_price", 0),
+            ("original_cost", 0),
+        ],
+        "int_columns": [],
+        "upper_columns": ["model_id"],
+        "fill_unknown": ["brand", "model_id"],
+    },
+
+    "croma": {
+        "source_table": "croma_tvsss",
+        "target_table": "croma_tv_standardized",
+        "null_tokens": [],
+        "rename": {
+            "model_number": "model_id",
+        },
+        "stock_status": None,
+        "brand_rule": "open",
+        "fill": [
+            ("sale_price", 0),
+        ],
+        "int_columns": [],
+        "upper_columns": ["model_id", "display_type"],
+        "fill_unknown": ["screen_resolution"],
+    },
+}
@@ -0,0 +1,133 @@
+import sys
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from db_connection import get_engine
+from history_store import load_history
+
+# --------------------------------------------------
+# Daily OHLC price rollup
+# --------------------------------------------------
+# price_daily holds one row per (model_id, platform, price_date):
+#   open_price / close_price   first / last positive price of the day
+#   min_price / max_price      lowest / highest positive price of the day
+#   observations               positive priced rows seen that day
+#
+# The chart and history endpoints read this table with a range scan on
+# the (model_id, price_date) primary key prefix instead of grouping raw
+# scrapes by DATE(scraped_at) on every request.
+#
+# Each run recomputes only the newest stored day (it may have been
+# partial) and everything after it; earlier days never change.
+#
+# Usage:
+#   python price_daily.py             incremental update
+#   python price_daily.py --rebuild   rebuild from the whole history
+
+DAILY_TABLE = "price_daily"
+
+DAILY_COLUMNS = [
+    "model_id",
+    "platform",
+    "price_date",
+    "open_price",
+    "close_price",
+    "min_price",
+    "max_price",
+    "observations",
+]
+
+SOURCE_COLUMNS = ["model_id", "platform", "sale_price", "scraped_at"]
+
+
+def ensure_daily_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{DAILY_TABLE}` (
+                model_id VARCHAR(255) NOT NULL,
+                platform VARCHAR(50) NOT NULL,
+                price_date DATE NOT NULL,
+                open_price DOUBLE NOT NULL,
+                close_price DOUBLE NOT NULL,
+                min_price DOUBLE NOT NULL,
+                max_price DOUBLE NOT NULL,
+                observations INT NOT NULL,
+                PRIMARY KEY (model_id, price_date, platform),
+                INDEX idx_price_date (price_date)
+            )
+        """))
+
+
+def rollup(rows):
+    """OHLC per (model_id, platform, day) from positive priced scrapes"""
+    rows = rows[(rows["sale_price"] > 0) & rows["scraped_at"].notna()]
+
+    if rows.empty:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    rows = rows.assign(
+        model_id=rows["model_id"].astype(str),
+        platform=rows["platform"].astype(str),
+        sale_price=rows["sale_price"].astype("float64"),
+        price_date=rows["scraped_at"].dt.date,
+    ).sort_values("scraped_at", kind="stable")
+
+    daily = (
+        rows.groupby(["model_id", "platform", "price_date"], sort=False)["sale_price"]
+        .agg(
+            open_price="first",
+            close_price="last",
+            min_price="min",
+            max_price="max",
+            observations="count",
+        )
+        .reset_index()
+    )
+
+    return daily[DAILY_COLUMNS]
+
+
+def newest_day(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT MAX(price_date) FROM `{DAILY_TABLE}`")).scalar()
+
+
+def build(engine, since=None):
+    """
+    Recompute every day from `since` (all days when None) and replace
+    those rows in one transaction.
+    """
+    rows = load_history(engine, SOURCE_COLUMNS, since=since)
+
+    daily = rollup(rows)
+
+    with engine.begin() as conn:
+        if since is None:
+            conn.execute(text(f"DELETE FROM `{DAILY_TABLE}`"))
+        else:
+            conn.execute(
+                text(f"DELETE FROM `{DAILY_TABLE}` WHERE price_date >= :since"),
+                {"since": since}
+            )
+
+        daily.to_sql(DAILY_TABLE, conn, if_exists="append", index=False, chunksize=5000)
+
+    return len(rows), len(daily)
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    if not inspect(engine).has_table("tvs_unified"):
+        print("tvs_unified not found, run unify_tv.py first")
+        sys.exit(1)
+
+    ensure_daily_table(engine)
+
+    since = None if "--rebuild" in sys.argv[1:] else newest_day(engine)
+    scraped, days = build(engine, since)
+
+    print(f"price_daily: {scraped} scraped rows read since {since or 'the beginning'}")
+    print(f"price_daily: {days} daily rows written")
+    print("Daily price rollup updated successfully")
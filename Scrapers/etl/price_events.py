@@ -0,0 +1,238 @@
+import sys
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from db_connection import get_engine
+from history_store import load_history
+
+# --------------------------------------------------
+# Price change events (SCD type 2)
+# --------------------------------------------------
+# tvs_unified keeps a row for every listing on every scrape. price_events
+# keeps one row per (platform, model_id) per *state*: a new row only
+# starts when the price or the stock status changes.
+#
+#   valid_from    first scrape that saw this state
+#   valid_to      first scrape that saw the next state (NULL = current)
+#   last_seen_at  latest scrape that confirmed this state
+#
+# Several listings of the same model on one platform are collapsed per
+# scrape to the lowest positive price, and in_stock wins over
+# out_of_stock, matching how the history endpoints read the data.
+#
+# Each run only reads history rows newer than MAX(last_seen_at) (from
+# the Parquet history store, see history_store.load_history) and
+# rewrites the open (valid_to IS NULL) events, inside one transaction.
+# Rows that arrive with an older scraped_at than that are only picked
+# up by --rebuild.
+#
+# Usage:
+#   python price_events.py             incremental update
+#   python price_events.py --rebuild   rebuild from the whole history
+
+EVENTS_TABLE = "price_events"
+
+EVENT_COLUMNS = [
+    "platform",
+    "model_id",
+    "valid_from",
+    "valid_to",
+    "last_seen_at",
+    "sale_price",
+    "stock_status",
+]
+
+SOURCE_COLUMNS = ["platform", "model_id", "sale_price", "stock_status", "scraped_at"]
+
+
+def ensure_events_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{EVENTS_TABLE}` (
+                platform VARCHAR(50) NOT NULL,
+                model_id VARCHAR(255) NOT NULL,
+                valid_from DATETIME NOT NULL,
+                valid_to DATETIME NULL,
+                last_seen_at DATETIME NOT NULL,
+                sale_price DOUBLE NULL,
+                stock_status VARCHAR(50) NULL,
+                PRIMARY KEY (platform, model_id, valid_from),
+                INDEX idx_model_valid (model_id, valid_from, valid_to),
+                INDEX idx_open (valid_to)
+            )
+        """))
+
+
+def collapse_scrapes(rows):
+    """One snapshot per (platform, model_id, scrape)"""
+    rows = rows.assign(
+        platform=rows["platform"].astype(str),
+        model_id=rows["model_id"].astype(str),
+        sale_price=rows["sale_price"].where(rows["sale_price"] > 0).astype("float64"),
+        stock_status=rows["stock_status"].astype(object),
+    )
+
+    return (
+        rows.groupby(["platform", "model_id", "scraped_at"], sort=False)
+        .agg(sale_price=("sale_price", "min"), stock_status=("stock_status", "min"))
+        .reset_index()
+        .assign(seen_at=lambda df: df["scraped_at"])
+    )
+
+
+def to_events(snapshots):
+    """
+    Compress snapshots into events.
+    snapshots: platform, model_id, scraped_at, seen_at, sale_price, stock_status
+    """
+    if snapshots.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    snapshots = snapshots.sort_values(
+        ["platform", "model_id", "scraped_at"], kind="stable"
+    ).reset_index(drop=True)
+
+    key = snapshots["platform"] + "\x1f" + snapshots["model_id"]
+    price = snapshots["sale_price"].round(2).fillna(-1)
+    stock = snapshots["stock_status"].fillna("")
+
+    new_key = key.ne(key.shift())
+    changed = new_key | price.ne(price.shift()) | stock.ne(stock.shift())
+    event_id = changed.cumsum()
+
+    events = snapshots.groupby(event_id, sort=False).agg(
+        platform=("platform", "first"),
+        model_id=("model_id", "first"),
+        valid_from=("scraped_at", "min"),
+        last_seen_at=("seen_at", "max"),
+        sale_price=("sale_price", "first"),
+        stock_status=("stock_status", "first"),
+    ).reset_index(drop=True)
+
+    # The next event of the same listing closes this one
+    next_from = events["valid_from"].shift(-1)
+    same_key = (
+        events["platform"].eq(events["platform"].shift(-1))
+        & events["model_id"].eq(events["model_id"].shift(-1))
+    )
+    events["valid_to"] = next_from.where(same_key)
+
+    return events[EVENT_COLUMNS]
+
+
+def open_events_as_snapshots(engine):
+    """Current events, shaped like snapshots so they can be extended"""
+    with engine.connect() as conn:
+        current = pd.read_sql(text(f"""
+            SELECT platform, model_id, valid_from, last_seen_at, sale_price, stock_status
+            FROM `{EVENTS_TABLE}`
+            WHERE valid_to IS NULL
+        """), conn, parse_dates=["valid_from", "last_seen_at"])
+
+    return current.rename(columns={
+        "valid_from": "scraped_at",
+        "last_seen_at": "seen_at",
+    })
+
+
+def last_seen(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT MAX(last_seen_at) FROM `{EVENTS_TABLE}`")).scalar()
+
+
+def write_events(engine, events, replace_all=False):
+    """Replace the open events (or everything) with events, atomically"""
+    with engine.begin() as conn:
+        if replace_all:
+            conn.execute(text(f"DELETE FROM `{EVENTS_TABLE}`"))
+        else:
+            conn.execute(text(f"DELETE FROM `{EVENTS_TABLE}` WHERE valid_to IS NULL"))
+
+        events.to_sql(EVENTS_TABLE, conn, if_exists="append", index=False, chunksize=5000)
+
+
+def rebuild(engine):
+    rows = load_history(engine, SOURCE_COLUMNS)
+    rows = rows[rows["scraped_at"].notna()]
+
+    events = to_events(collapse_scrapes(rows))
+    write_events(engine, events, replace_all=True)
+
+    return len(rows), len(events)
+
+
+def update(engine):
+    since = last_seen(engine)
+    if since is None:
+        return rebuild(engine)
+
+    rows = load_history(engine, SOURCE_COLUMNS, since=since, after=True)
+    if rows.empty:
+        return 0, 0
+
+    # Open events are re-derived together with the new scrapes:
+    # unchanged ones only move last_seen_at, changed ones get closed
+    snapshots = pd.concat(
+        [open_events_as_snapshots(engine), collapse_scrapes(rows)],
+        ignore_index=True
+    )
+
+    events = to_events(snapshots)
+    write_events(engine, events)
+
+    return len(rows), len(events)
+
+
+def price_as_of(engine, model_id, at, platform=None):
+    """Price and stock of every listing of model_id at time `at`"""
+    sql = f"""
+        SELECT platform, sale_price, stock_status, valid_from, valid_to
+        FROM `{EVENTS_TABLE}`
+        WHERE model_id = :model_id
+            AND valid_from <= :at
+            AND (valid_to IS NULL OR valid_to > :at)
+    """
+    params = {"model_id": model_id, "at": at}
+
+    if platform:
+        sql += " AND platform = :platform"
+        params["platform"] = platform
+
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+def price_intervals(engine, model_id, start, end):
+    """Events of model_id that overlap [start, end]"""
+    with engine.connect() as conn:
+        return pd.read_sql(text(f"""
+            SELECT platform, valid_from, valid_to, sale_price, stock_status
+            FROM `{EVENTS_TABLE}`
+            WHERE model_id = :model_id
+                AND valid_from <= :end
+                AND (valid_to IS NULL OR valid_to > :start)
+            ORDER BY platform, valid_from
+        """), conn, params={"model_id": model_id, "start": start, "end": end})
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+
+    if not inspect(engine).has_table("tvs_unified"):
+        print("tvs_unified not found, run unify_tv.py first")
+        sys.exit(1)
+
+    ensure_events_table(engine)
+
+    if "--rebuild" in sys.argv[1:]:
+        scraped, written = rebuild(engine)
+    else:
+        scraped, written = update(engine)
+
+    with engine.connect() as conn:
+        total = conn.execute(text(f"SELECT COUNT(*) FROM `{EVENTS_TABLE}`")).scalar()
+
+    print(f"price_events: {scraped} scraped rows read, {written} events written")
+    print(f"price_events: {total} events stored in total")
+    print("Price events updated successfully")
@@ -1,33 +1,329 @@
-import subprocess
+import argparse
+import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-files = [
-    "db_connection.py",
+from sqlalchemy.exc import SQLAlchemyError
 
-    "croma_std.py",
-    "flipkart_std.py",
-    "amazon_std.py",
-    "unify_tv.py",
+from db_connection import get_engine
+from elt import ETL_MODE
+from etl_profiler import run_profiled, collect, PROFILE_DIR_ENV
+from platform_config import PLATFORMS
+import data_version
+import run_log
+import stage_cache
+from tv_analytics import ANALYTICS_TABLES, REGISTRY_TABLE as ANALYTICS_REGISTRY
 
-    "tv_brand_master.py",
-    "tv_platform_master.py",
-    "tv_product_master.py",
-    "tv_price_master.py",
+# --------------------------------------------------
+# ETL stage graph
+# --------------------------------------------------
+# Every stage runs as its own Python process. A stage starts as soon
+# as all stages in "deps" have finished, so independent stages run
+# side by side (up to --workers at a time) while stages that read
+# another stage's output still wait for it.
+#
+# "inputs" and "outputs" name the tables a stage reads and writes.
+# Before a stage runs its inputs and code are fingerprinted
+# (stage_cache.py); if nothing changed since its last successful run
+# the stage is skipped, so a Croma-only rescrape re-standardizes only
+# Croma. --force runs every stage regardless.
+#
+# Stages that swap tables in bump the data version as they publish.
+# Stages marked "in_place" update their tables without a swap, so the
+# run bumps the version once at the end if any of them completed.
+#
+# Each stage is started through etl_profiler.py and its wall time,
+# CPU time, rows in/out, MySQL bytes and peak memory are stored in
+# etl_runs / etl_stage_runs (run_log.py).
+#
+# Usage: python run_etl.py [--workers N] [--only stage ...] [--force]
 
-    
-    "tv_analytics.py"
+ETL_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    
+DEFAULT_WORKERS = int(os.getenv("ETL_WORKERS", "4"))
+
+STANDARDIZE_STAGES = [
+    {
+        "name": f"standardize_{platform}",
+        "script": "standardize.py",
+        "args": [platform],
+        "deps": [],
+        "inputs": [config["source_table"]],
+        "outputs": [config["target_table"]],
+    }
+    for platform, config in PLATFORMS.items()
+]
+
+STAGES = STANDARDIZE_STAGES + [
+    {
+        "name": "unify",
+        "script": "unify_tv.py",
+        "deps": [stage["name"] for stage in STANDARDIZE_STAGES],
+        "inputs": [config["target_table"] for config in PLATFORMS.values()],
+        "outputs": ["tvs_unified"],
+    },
+    {
+        "name": "product_master",
+        "script": "tv_product_master.py",
+        "deps": ["unify"],
+        "inputs": ["tvs_unified"],
+        "outputs": ["tv_product_master"],
+    },
+    {
+        "name": "price_master",
+        "script": "tv_price_master.py",
+        "deps": ["unify"],
+        "inputs": ["tvs_unified"],
+        "outputs": ["tv_platform_latest_master"],
+    },
+    {
+        "name": "price_events",
+        "script": "price_events.py",
+        "deps": ["unify"],
+        "inputs": ["tvs_unified"],
+        "outputs": ["price_events"],
+        "in_place": True,
+    },
+    {
+        "name": "price_daily",
+        "script": "price_daily.py",
+        "deps": ["unify"],
+        "inputs": ["tvs_unified"],
+        "outputs": ["price_daily"],
+        "in_place": True,
+    },
+    {
+        "name": "entity_resolution",
+        "script": "entity_resolution.py",
+        "deps": ["price_master"],
+        "inputs": ["tv_platform_latest_master"],
+        "outputs": ["canonical_models"],
+    },
+    {
+        "name": "brand_master",
+        "script": "tv_brand_master.py",
+        "deps": ["price_master"],
+        "inputs": ["tv_platform_latest_master"],
+        "outputs": ["tv_brand_master"],
+    },
+    {
+        "name": "platform_master",
+        "script": "tv_platform_master.py",
+        "deps": ["price_master"],
+        "inputs": ["tv_platform_latest_master"],
+        "outputs": ["tv_platform_master"],
+    },
+    {
+        "name": "clean_latest",
+        "script": "clean_latest.py",
+        "deps": ["price_master"],
+        "inputs": ["tv_platform_latest_master"],
+        "outputs": ["tv_platform_latest_clean", "tv_clean_bounds"],
+    },
+    {
+        "name": "column_statistics",
+        "script": "column_statistics.py",
+        "deps": ["price_master", "brand_master", "platform_master"],
+        "inputs": ["tv_platform_latest_master", "tv_brand_master", "tv_platform_master"],
+        "outputs": ["column_statistics", "column_correlations"],
+    },
+    {
+        "name": "model_deals",
+        "script": "model_deals.py",
+        "deps": ["clean_latest"],
+        "inputs": ["tv_platform_latest_clean"],
+        "outputs": ["model_deals"],
+    },
+    {
+        "name": "analytics",
+        "script": "tv_analytics.py",
+        "deps": ["product_master", "clean_latest"],
+        "inputs": ["tv_product_master", "tv_platform_latest_clean"],
+        "outputs": ANALYTICS_TABLES + [ANALYTICS_REGISTRY],
+    },
 ]
 
-for f in files:
-    print(f"\n Running {f}")
-    result = subprocess.run([sys.executable, f])
 
-    if result.returncode != 0:
-        print(f" Failed at {f}. Stopping pipeline.")
-        break
-    else:
-        print(f" {f} completed")
+def select_stages(stages, only=None):
+    """Keep only the requested stages (and everything they depend on)"""
+    if not only:
+        return stages
+
+    by_name = {stage["name"]: stage for stage in stages}
+    missing = [name for name in only if name not in by_name]
+    if missing:
+        raise ValueError(f"Unknown stage(s): {missing}. Choose from: {list(by_name)}")
+
+    needed = set()
+    pending = list(only)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(by_name[name]["deps"])
+
+    return [stage for stage in stages if stage["name"] in needed]
+
+
+def run_stage(stage):
+    """
+    Run one stage script in its own process through the profiler.
+    Returns (returncode, output, metrics).
+    """
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+
+    with tempfile.TemporaryDirectory(prefix="etl_profile_") as profile_dir:
+        env[PROFILE_DIR_ENV] = profile_dir
+
+        returncode, output, metrics = run_profiled(
+            [sys.executable, "etl_profiler.py", stage["script"], *stage.get("args", [])],
+            cwd=ETL_DIR,
+            env=env
+        )
+        metrics.update(collect(profile_dir))
+
+    return returncode, output, metrics
+
+
+def run_cached_stage(stage, engine, force=False):
+    """
+    Skip the stage when its fingerprint matches its last successful run,
+    otherwise run it and remember the fingerprint if it succeeds.
+    Returns (returncode, output, skipped, metrics).
+    """
+    states = None
+    fingerprint = None
+
+    try:
+        states = stage_cache.input_states(engine, stage)
+        fingerprint = stage_cache.stage_fingerprint(engine, stage, states)
+        if not force and stage_cache.is_up_to_date(engine, stage, fingerprint):
+            return 0, " inputs and code unchanged, skipped", True, {}
+    except SQLAlchemyError as e:
+        print(f" Could not fingerprint {stage['name']}, running it: {e}")
+
+    returncode, output, metrics = run_stage(stage)
+
+    if states is not None:
+        metrics["rows_in"] = sum(state.get("rows", 0) for state in states.values())
+
+    try:
+        metrics["rows_out"] = run_log.count_rows(engine, stage.get("outputs", []))
+        if returncode == 0 and fingerprint is not None:
+            stage_cache.record_fingerprint(engine, stage["name"], fingerprint)
+    except SQLAlchemyError as e:
+        print(f" Could not record {stage['name']} results: {e}")
+
+    return returncode, output, False, metrics
+
+
+def record_stage(engine, run_id, stage, status, metrics):
+    try:
+        run_log.record_stage(engine, run_id, stage["name"], status, metrics)
+    except SQLAlchemyError as e:
+        print(f" Could not log {stage['name']}: {e}")
+
+
+def format_metrics(metrics):
+    parts = [f"{metrics['wall_seconds']:.1f}s wall"]
+
+    if metrics.get("cpu_seconds") is not None:
+        parts.append(f"{metrics['cpu_seconds']:.1f}s cpu")
+    if metrics.get("peak_rss_mb") is not None:
+        parts.append(f"{metrics['peak_rss_mb']:.0f} MB peak")
+
+    parts.append(f"{metrics.get('rows_in') or 0} rows in")
+    parts.append(f"{metrics.get('rows_out') or 0} rows out")
+
+    return ", ".join(parts)
+
+
+def run_pipeline(stages, workers=DEFAULT_WORKERS, force=False):
+    """
+    Run stages in dependency order, independent stages concurrently.
+    Unchanged stages are skipped unless force=True.
+    Returns the names of stages that failed.
+    """
+    engine = get_engine()
+    stage_cache.ensure_fingerprint_table(engine)
+    run_log.ensure_run_tables(engine)
+    run_id = run_log.start_run(engine, len(stages), ETL_MODE)
+
+    done = set()
+    updated_in_place = False
+    failed = []
+    started = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            if not failed:
+                for stage in stages:
+                    if stage["name"] in started:
+                        continue
+                    if all(dep in done for dep in stage["deps"]):
+                        print(f"\n Running {stage['name']} ({stage['script']})")
+                        started.add(stage["name"])
+                        running[pool.submit(run_cached_stage, stage, engine, force)] = stage
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                stage = running.pop(future)
+                returncode, output, skipped, metrics = future.result()
+
+                if skipped:
+                    print(f"\n {stage['name']}:{output}")
+                else:
+                    print(f"\n----- {stage['name']} output -----")
+                    print(output.rstrip())
+
+                if returncode != 0:
+                    print(f" Failed at {stage['name']}. No new stages will start.")
+                    failed.append(stage["name"])
+                    record_stage(engine, run_id, stage, "failed", metrics)
+                elif skipped:
+                    done.add(stage["name"])
+                    record_stage(engine, run_id, stage, "skipped", metrics)
+                else:
+                    print(f" {stage['name']} completed ({format_metrics(metrics)})")
+                    done.add(stage["name"])
+                    updated_in_place |= stage.get("in_place", False)
+                    record_stage(engine, run_id, stage, "completed", metrics)
+
+    run_log.finish_run(engine, run_id, "failed" if failed else "completed")
+
+    # Swapped tables already bumped the version; tables updated in
+    # place only count as published here, and only if they changed
+    if updated_in_place:
+        data_version.bump(engine)
+
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the OfferZone ETL pipeline")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="maximum number of stages running at the same time")
+    parser.add_argument("--only", nargs="*",
+                        help="run only these stages and their dependencies")
+    parser.add_argument("--force", action="store_true",
+                        help="run every stage even if its inputs are unchanged")
+    options = parser.parse_args()
+
+    failed = run_pipeline(
+        select_stages(STAGES, options.only),
+        options.workers,
+        options.force
+    )
+
+    if failed:
+        print(f"\n ETL Pipeline Failed: {', '.join(failed)}")
+        sys.exit(1)
 
-print("\n ETL Pipeline Finished")
+    print("\n ETL Pipeline Finished")
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+# --------------------------------------------------
+# ETL run log
+# --------------------------------------------------
+# etl_runs        one row per run_etl.py invocation
+# etl_stage_runs  one row per stage of a run: status (completed,
+#                 failed, skipped), wall/CPU time, rows in/out, bytes
+#                 read/written to MySQL and peak memory
+#
+# The admin dashboard reads these tables to plot stage trends and
+# flag stages that got slower than their rolling median.
+
+RUNS_TABLE = "etl_runs"
+STAGE_RUNS_TABLE = "etl_stage_runs"
+
+
+def ensure_run_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{RUNS_TABLE}` (
+                run_id INT AUTO_INCREMENT PRIMARY KEY,
+                started_at DATETIME NOT NULL,
+                finished_at DATETIME NULL,
+                status VARCHAR(20) NOT NULL,
+                stage_count INT NOT NULL,
+                etl_mode VARCHAR(20) NULL
+            )
+        """))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{STAGE_RUNS_TABLE}` (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                run_id INT NOT NULL,
+                stage VARCHAR(100) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                finished_at DATETIME NOT NULL,
+                wall_seconds DOUBLE NULL,
+                cpu_seconds DOUBLE NULL,
+                rows_in BIGINT NULL,
+                rows_out BIGINT NULL,
+                bytes_read BIGINT NULL,
+                bytes_written BIGINT NULL,
+                peak_rss_mb DOUBLE NULL,
+                python_peak_mb DOUBLE NULL,
+                INDEX idx_stage_finished (stage, finished_at),
+                INDEX idx_run (run_id)
+            )
+        """))
+
+
+def start_run(engine, stage_count, etl_mode=None):
+    with engine.begin() as conn:
+        result = conn.execute(text(f"""
+            INSERT INTO `{RUNS_TABLE}` (started_at, status, stage_count, etl_mode)
+            VALUES (:started_at, 'running', :stage_count, :etl_mode)
+        """), {
+            "started_at": datetime.now(),
+            "stage_count": stage_count,
+            "etl_mode": etl_mode,
+        })
+
+    return result.lastrowid
+
+
+def finish_run(engine, run_id, status):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            UPDATE `{RUNS_TABLE}`
+            SET finished_at = :finished_at, status = :status
+            WHERE run_id = :run_id
+        """), {"finished_at": datetime.now(), "status": status, "run_id": run_id})
+
+
+def record_stage(engine, run_id, stage_name, status, metrics):
+    row = {
+        "run_id": run_id,
+        "stage": stage_name,
+        "status": status,
+        "finished_at": datetime.now(),
+    }
+    for column in ("wall_seconds", "cpu_seconds", "rows_in", "rows_out",
+                   "bytes_read", "bytes_written", "peak_rss_mb", "python_peak_mb"):
+        row[column] = metrics.get(column)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO `{STAGE_RUNS_TABLE}`
+                (run_id, stage, status, finished_at, wall_seconds, cpu_seconds,
+                 rows_in, rows_out, bytes_read, bytes_written, peak_rss_mb, python_peak_mb)
+            VALUES
+                (:run_id, :stage, :status, :finished_at, :wall_seconds, :cpu_seconds,
+                 :rows_in, :rows_out, :bytes_read, :bytes_written, :peak_rss_mb, :python_peak_mb)
+        """), row)
+
+
+def count_rows(engine, tables):
+    """Total rows of the tables that exist"""
+    inspector = inspect(engine)
+
+    with engine.connect() as conn:
+        return sum(
+            conn.execute(text(f"SELECT COUNT(*) FROM `{table}`")).scalar()
+            for table in tables
+            if inspector.has_table(table)
+        )
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+# --------------------------------------------------
+# Stage fingerprints
+# --------------------------------------------------
+# A stage's fingerprint covers
+#   - every input table: row count, MAX(scraped_at) when the table has
+#     that column, and CHECKSUM TABLE
+#   - its code: the stage script plus every local module it imports
+#   - its arguments
+# run_etl.py skips a stage when the fingerprint equals the one stored
+# after its last successful run and its output tables still exist.
+
+FINGERPRINT_TABLE = "etl_stage_fingerprints"
+
+ETL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_PATTERN = re.compile(r"^\s*(?:from|import)\s+([A-Za-z_][A-Za-z0-9_]*)", re.MULTILINE)
+
+
+def ensure_fingerprint_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS `{FINGERPRINT_TABLE}` (
+                stage VARCHAR(100) PRIMARY KEY,
+                fingerprint CHAR(64) NOT NULL,
+                recorded_at DATETIME NOT NULL
+            )
+        """))
+
+
+def code_files(script, seen=None):
+    """The script and every module from this directory it imports"""
+    seen = seen if seen is not None else set()
+
+    path = os.path.join(ETL_DIR, script)
+    if script in seen or not os.path.exists(path):
+        return seen
+
+    seen.add(script)
+
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    for module in IMPORT_PATTERN.findall(source):
+        code_files(f"{module}.py", seen)
+
+    return seen
+
+
+def code_version(script):
+    digest = hashlib.sha256()
+
+    for name in sorted(code_files(script)):
+        digest.update(name.encode())
+        with open(os.path.join(ETL_DIR, name), "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def table_state(conn, inspector, table):
+    """Row count, latest scrape and checksum of one table"""
+    if not inspector.has_table(table):
+        return {"missing": True}
+
+    columns = {c["name"] for c in inspector.get_columns(table)}
+
+    state = {
+        "rows": conn.execute(text(f"SELECT COUNT(*) FROM `{table}`")).scalar(),
+        "checksum": conn.execute(text(f"CHECKSUM TABLE `{table}`")).fetchone()[1],
+    }
+
+    if "scraped_at" in columns:
+        latest = conn.execute(text(f"SELECT MAX(scraped_at) FROM `{table}`")).scalar()
+        state["max_scraped_at"] = str(latest)
+
+    return state
+
+
+def input_states(engine, stage):
+    inspector = inspect(engine)
+
+    with engine.connect() as conn:
+        return {
+            table: table_state(conn, inspector, table)
+            for table in sorted(stage.get("inputs", []))
+        }
+
+
+def stage_fingerprint(engine, stage, states=None):
+    payload = {
+        "inputs": states if states is not None else input_states(engine, stage),
+        "code": code_version(stage["script"]),
+        "args": stage.get("args", []),
+    }
+
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def stored_fingerprint(engine, stage_name):
+    with engine.connect() as conn:
+        return conn.execute(
+            text(f"SELECT fingerprint FROM `{FINGERPRINT_TABLE}` WHERE stage = :stage"),
+            {"stage": stage_name}
+        ).scalar()
+
+
+def outputs_exist(engine, stage):
+    inspector = inspect(engine)
+    return all(inspector.has_table(table) for table in stage.get("outputs", []))
+
+
+def is_up_to_date(engine, stage, fingerprint):
+    return (
+        stored_fingerprint(engine, stage["name"]) == fingerprint
+        and outputs_exist(engine, stage)
+    )
+
+
+def record_fingerprint(engine, stage_name, fingerprint):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO `{FINGERPRINT_TABLE}` (stage, fingerprint, recorded_at)
+            VALUES (:stage, :fingerprint, :recorded_at)
+            ON DUPLICATE KEY UPDATE
+                fingerprint = VALUES(fingerprint),
+                recorded_at = VALUES(recorded_at)
+        """), {
+            "stage": stage_name,
+            "fingerprint": fingerprint,
+            "recorded_at": datetime.now(),
+        })
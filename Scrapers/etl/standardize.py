@@ -0,0 +1,206 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from db_connection import get_engine
+from platform_config import (
+    PLATFORMS,
+    OUTPUT_COLUMNS,
+    NUMERIC_COLUMNS,
+    REQUIRED_COLUMNS,
+)
+from brand_normalizer import normalize_brands, VALID_TV_BRANDS
+from table_publisher import publish_table
+from typed_loader import load_table
+
+# --------------------------------------------------
+# Standardization engine
+# --------------------------------------------------
+# One vectorized pipeline for every platform in platform_config.py.
+# Each platform runs in its own worker process and returns a report
+# of unknown brands and rejected rows, which is stored in
+# etl_standardization_report. Rows missing product_id or scraped_at
+# are rejected: they cannot be deduplicated or placed in history.
+#
+# Usage: python standardize.py [platform ...]   (default: all)
+
+REPORT_TABLE = "etl_standardization_report"
+
+
+def standardize_frame(data, config):
+    """Apply one platform's rules to a raw DataFrame"""
+
+    # Strings that mean missing
+    if config["null_tokens"]:
+        data = data.replace(config["null_tokens"], pd.NA)
+
+    # Standard column names, then platform specific renames
+    data.columns = (
+        data.columns
+        .str.strip()
+        .str.lower()
+        .str.replace(" ", "_")
+    )
+    data = data.rename(columns=config["rename"])
+
+    # Numeric coercion
+    for column in NUMERIC_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors="coerce")
+
+    # Missing value rules, in order
+    for column, fill in config["fill"]:
+        if isinstance(fill, dict):
+            data[column] = data[column].fillna(data[fill["column"]])
+        else:
+            data[column] = data[column].fillna(fill)
+
+    for column in config["int_columns"]:
+        data[column] = data[column].astype(int)
+
+    # Text columns
+    for column in config["fill_unknown"]:
+        data[column] = data[column].fillna("UNKNOWN")
+
+    for column in config["upper_columns"]:
+        data[column] = data[column].str.upper().str.strip()
+
+    data["platform"] = data["platform"].str.lower().str.strip()
+
+    # Stock status
+    stock = config["stock_status"]
+    if stock:
+        data["stock_status"] = (
+            data[stock["column"]]
+            .str.lower()
+            .str.strip()
+            .map(stock["map"])
+        )
+    else:
+        data["stock_status"] = (
+            data["stock_status"]
+            .str.lower()
+            .str.strip()
+            .str.replace(" ", "_")
+        )
+
+    # Brand
+    raw_brand = data["brand"]
+    data["brand"] = normalize_brands(
+        raw_brand,
+        validate=config["brand_rule"] == "validated"
+    )
+
+    unknown = raw_brand[~data["brand"].isin(VALID_TV_BRANDS)]
+
+    # Datetime
+    data["scraped_at"] = pd.to_datetime(data["scraped_at"], errors="coerce")
+
+    # Rejects: rows that cannot be deduplicated or placed in history
+    reject_mask = data[REQUIRED_COLUMNS].isna().any(axis=1)
+    rejects = data.loc[reject_mask, REQUIRED_COLUMNS]
+    data = data[~reject_mask]
+
+    # Keep latest record per product per scrape time
+    data = (
+        data.sort_values("scraped_at", ascending=False)
+        .drop_duplicates(subset=["product_id", "scraped_at"], keep="first")
+    )
+
+    return data[OUTPUT_COLUMNS], unknown, rejects
+
+
+def build_report(platform, unknown, rejects):
+    rows = []
+
+    counts = unknown.fillna("<missing>").astype(str).value_counts()
+    for value, count in counts.items():
+        rows.append({"platform": platform, "kind": "unknown_brand", "value": value, "row_count": int(count)})
+
+    for column in REQUIRED_COLUMNS:
+        count = int(rejects[column].isna().sum())
+        if count:
+            rows.append({"platform": platform, "kind": "reject", "value": f"missing {column}", "row_count": count})
+
+    return rows
+
+
+def standardize_platform(platform):
+    """Worker: read, standardize and publish one platform"""
+    config = PLATFORMS[platform]
+    engine = get_engine()
+
+    raw = load_table(engine, config["source_table"])
+    data, unknown, rejects = standardize_frame(raw, config)
+
+    publish_table(data, config["target_table"], engine)
+    engine.dispose()
+
+    return {
+        "platform": platform,
+        "rows_in": len(raw),
+        "rows_out": len(data),
+        "rows_rejected": len(rejects),
+        "report": build_report(platform, unknown, rejects),
+    }
+
+
+def ensure_report_table(conn):
+    # Created explicitly: the per-platform stages run concurrently, and
+    # two to_sql calls creating the same table at once would collide
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS `{REPORT_TABLE}` (
+            run_at DATETIME NOT NULL,
+            platform VARCHAR(50) NOT NULL,
+            kind VARCHAR(50) NOT NULL,
+            value TEXT,
+            row_count BIGINT NOT NULL
+        )
+    """))
+
+
+def save_report(results, engine):
+    rows = [row for result in results for row in result["report"]]
+    if not rows:
+        return
+
+    report = pd.DataFrame(rows)
+    report.insert(0, "run_at", datetime.now())
+
+    with engine.begin() as conn:
+        ensure_report_table(conn)
+        report.to_sql(REPORT_TABLE, conn, if_exists="append", index=False)
+
+
+def run(platforms=None):
+    platforms = platforms or list(PLATFORMS)
+
+    unknown = [p for p in platforms if p not in PLATFORMS]
+    if unknown:
+        raise ValueError(f"Unknown platform(s): {unknown}. Choose from: {list(PLATFORMS)}")
+
+    workers = min(len(platforms), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(standardize_platform, platforms))
+
+    save_report(results, get_engine())
+
+    for result in results:
+        print(
+            f"{result['platform']}: {result['rows_in']} raw rows -> "
+            f"{result['rows_out']} standardized, "
+            f"{result['rows_rejected']} rejected (missing {' / '.join(REQUIRED_COLUMNS)})"
+        )
+        for row in result["report"]:
+            print(f"   {row['kind']}: {row['value']} ({row['row_count']} rows)")
+
+    return results
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
+    print("\nStandardization completed successfully")
@@ -0,0 +1,156 @@
+import sys
+
+from sqlalchemy import inspect, text
+
+import data_version
+from db_connection import get_engine
+
+# --------------------------------------------------
+# Shadow table publishing
+# --------------------------------------------------
+# Master tables are never written in place. Each build goes into
+# "<table>_staging" and is then published with one RENAME TABLE
+# statement, which MySQL executes atomically. The version that was
+# live before the swap is kept as "<table>_previous" so it can be
+# restored instantly with rollback_table().
+#
+# Every swap and rollback bumps the data version (data_version.py)
+# that the backend response cache is keyed on.
+
+STAGING_SUFFIX = "_staging"
+PREVIOUS_SUFFIX = "_previous"
+
+
+def staging_name(table_name):
+    return f"{table_name}{STAGING_SUFFIX}"
+
+
+def previous_name(table_name):
+    return f"{table_name}{PREVIOUS_SUFFIX}"
+
+
+def table_exists(engine, table_name):
+    return inspect(engine).has_table(table_name)
+
+
+def swap_in(engine, table_name):
+    """
+    Publish <table>_staging as <table>.
+    - Current live table becomes <table>_previous
+    - Both renames happen in a single statement
+    """
+    staging = staging_name(table_name)
+    previous = previous_name(table_name)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{previous}`"))
+
+        if table_exists(engine, table_name):
+            conn.execute(text(
+                f"RENAME TABLE `{table_name}` TO `{previous}`, "
+                f"`{staging}` TO `{table_name}`"
+            ))
+        else:
+            conn.execute(text(f"RENAME TABLE `{staging}` TO `{table_name}`"))
+
+    data_version.bump(engine)
+
+
+def widen_floats(df):
+    """
+    Convert float32 columns back to float64 before writing.
+    Going through the shortest string form keeps 4.3 as 4.3 instead
+    of storing the float32 approximation 4.300000190734863.
+    """
+    narrow = [c for c in df.columns if df[c].dtype == "float32"]
+
+    if not narrow:
+        return df
+
+    return df.assign(**{
+        c: df[c].astype(str).astype("float64") for c in narrow
+    })
+
+
+def publish_table(df, table_name, engine, keep_schema=False):
+    """
+    Build table_name from df in a shadow table and swap it in.
+
+    keep_schema=True clones the live table definition (keys, indexes,
+    column types) for the shadow table instead of letting pandas
+    derive one from the DataFrame.
+    """
+    staging = staging_name(table_name)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{staging}`"))
+
+        if keep_schema and table_exists(engine, table_name):
+            conn.execute(text(f"CREATE TABLE `{staging}` LIKE `{table_name}`"))
+
+    widen_floats(df).to_sql(
+        staging,
+        engine,
+        if_exists="append",
+        index=False,
+        chunksize=5000
+    )
+
+    swap_in(engine, table_name)
+
+
+def publish_query(select_sql, table_name, engine, keep_schema=False, params=None):
+    """
+    Build table_name from a SELECT that runs inside MySQL and swap it in.
+    Used by ELT mode so aggregation results never leave the server.
+    """
+    staging = staging_name(table_name)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{staging}`"))
+
+        if keep_schema and table_exists(engine, table_name):
+            conn.execute(text(f"CREATE TABLE `{staging}` LIKE `{table_name}`"))
+            conn.execute(text(f"INSERT INTO `{staging}` {select_sql}"), params or {})
+        else:
+            conn.execute(text(f"CREATE TABLE `{staging}` AS {select_sql}"), params or {})
+
+    swap_in(engine, table_name)
+
+
+def rollback_table(table_name, engine):
+    """
+    Swap <table>_previous back in place of <table>.
+    The rolled back version becomes <table>_previous, so running
+    rollback twice restores the original state.
+    """
+    staging = staging_name(table_name)
+    previous = previous_name(table_name)
+
+    if not table_exists(engine, previous):
+        raise RuntimeError(f"No previous version of {table_name} to roll back to")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{staging}`"))
+        conn.execute(text(
+            f"RENAME TABLE `{table_name}` TO `{staging}`, "
+            f"`{previous}` TO `{table_name}`, "
+            f"`{staging}` TO `{previous}`"
+        ))
+
+    data_version.bump(engine)
+
+
+# --------------------------------------------------
+# Manual rollback: python table_publisher.py <table> [<table> ...]
+# --------------------------------------------------
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python table_publisher.py <table_name> [<table_name> ...]")
+        sys.exit(1)
+
+    engine = get_engine()
+
+    for name in sys.argv[1:]:
+        rollback_table(name, engine)
+        print(f"{name} rolled back to previous version")
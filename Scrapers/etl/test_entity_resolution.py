@@ -0,0 +1,63 @@
+import pandas as pd
+
+from entity_resolution import code_core, resolve
+
+# --------------------------------------------------
+# Entity resolution regressions
+# --------------------------------------------------
+# Different TVs with near-identical codes and titles must stay apart.
+#
+# Usage: python -m pytest test_entity_resolution.py
+
+SAMSUNG_TITLE = "Samsung 138 cm (55 inch) Crystal 4K Ultra HD Smart LED TV"
+LG_TITLE = "LG 139 cm (55 inch) 4K Ultra HD Smart LED TV"
+
+
+def canonical(listings):
+    latest = pd.DataFrame(listings, columns=["platform", "brand", "model_id", "full_name"])
+    mapping = resolve(latest)
+    return dict(zip(zip(mapping["platform"], mapping["model_id"]), mapping["canonical_model_id"]))
+
+
+def test_code_core():
+    assert code_core("UA55CU7700") == ("55", "CU", "7700")
+    assert code_core("55UQ7500PSF") == ("55", "UQ", "7500")
+    assert code_core("SMARTTV") is None
+
+
+def test_same_title_different_model_number_is_not_merged():
+    result = canonical([
+        ("croma", "SAMSUNG", "UA55CU7700", SAMSUNG_TITLE),
+        ("amazon", "SAMSUNG", "UA55CU8000", SAMSUNG_TITLE),
+        ("flipkart", "SAMSUNG", "UA55CU7700AKLXL", SAMSUNG_TITLE),
+    ])
+
+    assert result[("amazon", "UA55CU8000")] == "UA55CU8000"
+    assert result[("croma", "UA55CU7700")] == "UA55CU7700"
+    assert result[("flipkart", "UA55CU7700AKLXL")] == "UA55CU7700"
+
+
+def test_neighbouring_models_do_not_chain():
+    result = canonical([
+        ("croma", "LG", "55UQ7500PSF", f"{LG_TITLE} 55UQ7500PSF"),
+        ("croma", "LG", "55UQ7590PSF", f"{LG_TITLE} 55UQ7590PSF"),
+        ("amazon", "LG", "55UQ7500PS", LG_TITLE),
+        ("flipkart", "LG", "55UQ7590PS", LG_TITLE),
+    ])
+
+    assert result[("croma", "55UQ7500PSF")] != result[("croma", "55UQ7590PSF")]
+    assert result[("amazon", "55UQ7500PS")] == "55UQ7500PSF"
+    assert result[("flipkart", "55UQ7590PS")] == "55UQ7590PSF"
+
+
+def test_cluster_keeps_one_listing_per_platform():
+    # Codes without a size/series/number shape fall back to similarity;
+    # amazon matches both croma listings but may only join one of them
+    result = canonical([
+        ("croma", "VU", "VUPREMIUMA", "Vu 108 cm (43 inch) Premium Smart TV"),
+        ("croma", "VU", "VUPREMIUMB", "Vu 108 cm (43 inch) Premium Smart TV"),
+        ("amazon", "VU", "VUPREMIUM", "Vu 108 cm (43 inch) Premium Smart TV"),
+    ])
+
+    assert result[("croma", "VUPREMIUMA")] != result[("croma", "VUPREMIUMB")]
+    assert result[("amazon", "VUPREMIUM")] in {"VUPREMIUMA", "VUPREMIUMB"}
@@ -0,0 +1,166 @@
+import pandas as pd
+from sqlalchemy import text
+
+# --------------------------------------------------
+# Typed table loading
+# --------------------------------------------------
+# pd.read_sql("select * ...") gives object columns for every string
+# and float64/object for every number. The schemas below describe how
+# each ETL table should look in memory:
+#   category - low cardinality text (brand, platform, stock_status ...)
+#   float    - numbers downcast to the smallest float type
+#   int      - numbers downcast to the smallest integer type
+#   datetime - parsed timestamps
+#   text     - free text, kept as object
+
+LISTING_SCHEMA = {
+    "platform": "category",
+    "product_id": "text",
+    "brand": "category",
+    "model_id": "text",
+    "full_name": "text",
+    "sale_price": "float",
+    "original_cost": "float",
+    "discount": "float",
+    "rating": "float",
+    "stock_status": "category",
+    "scraped_at": "datetime",
+    "product_url": "text",
+    "image_url": "text",
+    "display_type": "category",
+    "screen_resolution": "category",
+}
+
+TABLE_SCHEMAS = {
+    "tvs_unified": LISTING_SCHEMA,
+    "amazon_tv_standardized": LISTING_SCHEMA,
+    "flipkart_tv_standardized": LISTING_SCHEMA,
+    "croma_tv_standardized": LISTING_SCHEMA,
+    "tv_platform_latest_master": LISTING_SCHEMA,
+    "tv_platform_latest_clean": {**LISTING_SCHEMA, "is_outlier": "int"},
+
+    "tv_product_master": {
+        "brand": "category",
+        "model_id": "text",
+        "full_name": "text",
+        "display_type": "category",
+    },
+
+    "tv_brand_master": {
+        "brand": "category",
+        "total_models": "int",
+        "total_listings": "int",
+        "in_stock_count": "int",
+    },
+
+    "tv_platform_master": {
+        "platform": "category",
+        "total_listings": "int",
+        "unique_models": "int",
+        "in_stock_count": "int",
+    },
+}
+
+# Rows fetched per round trip when a whole table is loaded.
+# Each chunk is typed before the next one is read, so the untyped
+# object representation never exists for the full table at once.
+DEFAULT_CHUNKSIZE = 50000
+
+
+def apply_schema(df, schema):
+    """Convert df columns in place to the dtypes described by schema"""
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+
+        if kind == "category":
+            df[column] = df[column].astype("category")
+        elif kind == "float":
+            df[column] = pd.to_numeric(df[column], errors="coerce", downcast="float")
+        elif kind == "int":
+            values = pd.to_numeric(df[column], errors="coerce")
+            if values.isna().any():
+                df[column] = pd.to_numeric(values, downcast="float")
+            else:
+                df[column] = pd.to_numeric(values, downcast="integer")
+        elif kind == "datetime":
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+
+    return df
+
+
+def concat_typed(frames):
+    """
+    pd.concat for typed frames.
+    Plain concat turns categoricals with different categories back
+    into object columns, so every frame is recoded to one shared
+    category set first.
+    """
+    frames = [f for f in frames if f is not None]
+
+    if not frames:
+        return pd.DataFrame()
+
+    if len(frames) == 1:
+        return frames[0]
+
+    categorical_cols = [
+        col for col in frames[0].columns
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype)
+        and all(col in f.columns for f in frames)
+    ]
+
+    for col in categorical_cols:
+        seen = []
+        for f in frames:
+            seen.extend(f[col].astype("category").cat.categories.tolist())
+        categories = pd.Index(list(dict.fromkeys(seen)), dtype=object)
+
+        for f in frames:
+            f[col] = f[col].astype("category").cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _select_sql(table_name, columns, where):
+    column_sql = ", ".join(f"`{c}`" for c in columns) if columns else "*"
+    sql = f"SELECT {column_sql} FROM `{table_name}`"
+    if where:
+        sql += f" WHERE {where}"
+    return text(sql)
+
+
+def iter_table(engine, table_name, columns=None, where=None, params=None,
+               chunksize=DEFAULT_CHUNKSIZE):
+    """Yield typed chunks of a table so a stage can stream through it"""
+    schema = TABLE_SCHEMAS.get(table_name, {})
+
+    # stream_results uses a server side cursor, otherwise the driver
+    # buffers the whole result set before the first chunk is returned
+    with engine.connect().execution_options(stream_results=True) as conn:
+        chunks = pd.read_sql(
+            _select_sql(table_name, columns, where),
+            conn,
+            params=params,
+            chunksize=chunksize
+        )
+        for chunk in chunks:
+            yield apply_schema(chunk, schema)
+
+
+def load_table(engine, table_name, columns=None, where=None, params=None,
+               chunksize=None):
+    """
+    Load a table with its typed schema.
+    - columns: read only these columns
+    - chunksize: return an iterator of typed chunks instead of one frame
+    """
+    if chunksize:
+        return iter_table(engine, table_name, columns, where, params, chunksize)
+
+    frames = list(iter_table(engine, table_name, columns, where, params))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    return concat_typed(frames)
@@ -2,10 +2,12 @@
 Admin Dashboard API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import text, func
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, func, inspect, select, case, distinct, and_
 from datetime import datetime, timedelta, timezone
+from statistics import median
 from typing import Dict
 import subprocess
 import sys
@@ -13,7 +15,7 @@ import os
 import threading
 import time
 
-from db import get_db
+from db import get_async_db, run_concurrently
 from models import User, Wishlist, PriceAlert, AlertNotification, UserRole
 from auth.dependencies import require_admin
 
@@ -165,7 +167,7 @@ async def debug_scraper_paths(
 
 @router.get("/dashboard")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get comprehensive admin dashboard stats"""
@@ -174,48 +176,68 @@ async def get_dashboard_stats(
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
-    # User Stats
-    total_users = db.query(User).count()
-    verified_users = db.query(User).filter(User.is_verified == True).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    admin_users = db.query(User).filter(User.role == UserRole.ADMIN).count()
-    
-    users_today = db.query(User).filter(
-        func.date(User.created_at) == today
-    ).count()
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
     
-    users_this_week = db.query(User).filter(
-        func.date(User.created_at) >= week_ago
-    ).count()
+    # User Stats
+    async def user_stats(session):
+        return (await session.execute(select(
+            func.count(),
+            count_where(User.is_verified == True),
+            count_where(User.is_active == True),
+            count_where(User.role == UserRole.ADMIN),
+            count_where(func.date(User.created_at) == today),
+            count_where(func.date(User.created_at) >= week_ago)
+        ).select_from(User))).one()
     
     # Wishlist Stats
-    total_wishlists = db.query(Wishlist).count()
-    users_with_wishlists = db.query(Wishlist.user_id).distinct().count()
+    async def wishlist_stats(session):
+        return (await session.execute(select(
+            func.count(),
+            func.count(distinct(Wishlist.user_id))
+        ).select_from(Wishlist))).one()
     
     # Alert Stats
-    total_alerts = db.query(PriceAlert).count()
-    active_alerts = db.query(PriceAlert).filter(PriceAlert.is_active == True).count()
-    triggered_alerts = db.query(PriceAlert).filter(PriceAlert.is_triggered == True).count()
-    
-    alerts_triggered_today = db.query(AlertNotification).filter(
-        func.date(AlertNotification.created_at) == today
-    ).count()
-    
-    emails_sent_today = db.query(AlertNotification).filter(
-        func.date(AlertNotification.email_sent_at) == today,
-        AlertNotification.email_sent == True
-    ).count()
+    async def alert_stats(session):
+        return (await session.execute(select(
+            func.count(),
+            count_where(PriceAlert.is_active == True),
+            count_where(PriceAlert.is_triggered == True)
+        ).select_from(PriceAlert))).one()
+    
+    async def notification_stats(session):
+        return (await session.execute(select(
+            count_where(func.date(AlertNotification.created_at) == today),
+            count_where(and_(
+                func.date(AlertNotification.email_sent_at) == today,
+                AlertNotification.email_sent == True
+            ))
+        ).select_from(AlertNotification))).one()
     
     # Product Stats (from existing tables)
-    product_stats = db.execute(text("""
-        SELECT 
-            COUNT(DISTINCT model_id) as total_products,
-            COUNT(DISTINCT brand) as total_brands,
-            COUNT(DISTINCT platform) as total_platforms,
-            ROUND(AVG(sale_price), 2) as avg_price
-        FROM tv_platform_latest_master
-        WHERE sale_price > 0
-    """)).fetchone()
+    async def product_stats_query(session):
+        result = await session.execute(text("""
+            SELECT 
+                COUNT(DISTINCT model_id) as total_products,
+                COUNT(DISTINCT brand) as total_brands,
+                COUNT(DISTINCT platform) as total_platforms,
+                ROUND(AVG(sale_price), 2) as avg_price
+            FROM tv_platform_latest_master
+            WHERE sale_price > 0
+        """))
+        return result.fetchone()
+    
+    # The five groups of stats are independent, so they run together
+    users, wishlists, alerts, notifications, product_stats = await run_concurrently(
+        user_stats, wishlist_stats, alert_stats, notification_stats, product_stats_query
+    )
+    
+    total_users, verified_users, active_users, admin_users, users_today, users_this_week = (
+        int(value) for value in users
+    )
+    total_wishlists, users_with_wishlists = wishlists
+    total_alerts, active_alerts, triggered_alerts = (int(value) for value in alerts)
+    alerts_triggered_today, emails_sent_today = (int(value) for value in notifications)
     
     return {
         "user_metrics": {
@@ -262,30 +284,55 @@ async def get_users(
     search: str = None,
     role: str = None,
     verified: bool = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get paginated list of users"""
     
-    query = db.query(User)
+    conditions = []
     
     if search:
-        query = query.filter(
+        conditions.append(
             (User.name.ilike(f"%{search}%")) |
             (User.email.ilike(f"%{search}%"))
         )
     
     if role:
-        query = query.filter(User.role == role)
+        conditions.append(User.role == role)
     
     if verified is not None:
-        query = query.filter(User.is_verified == verified)
+        conditions.append(User.is_verified == verified)
+    
+    async def count_users(session):
+        return await session.scalar(
+            select(func.count()).select_from(User).where(*conditions)
+        )
+    
+    async def fetch_page(session):
+        return (await session.scalars(
+            select(User).where(*conditions).order_by(User.created_at.desc()).offset(
+                (page - 1) * page_size
+            ).limit(page_size)
+        )).all()
     
-    total = query.count()
+    total, users = await run_concurrently(count_users, fetch_page)
+    
+    # Wishlist and alert counts of the whole page, one grouped query each
+    user_ids = [u.id for u in users]
+    
+    def counts_by_user(model):
+        async def query(session):
+            result = await session.execute(
+                select(model.user_id, func.count()).where(
+                    model.user_id.in_(user_ids)
+                ).group_by(model.user_id)
+            )
+            return dict(result.all())
+        return query
     
-    users = query.order_by(User.created_at.desc()).offset(
-        (page - 1) * page_size
-    ).limit(page_size).all()
+    wishlist_counts, alert_counts = await run_concurrently(
+        counts_by_user(Wishlist), counts_by_user(PriceAlert)
+    )
     
     return {
         "users": [
@@ -297,8 +344,8 @@ async def get_users(
                 "is_active": u.is_active,
                 "is_verified": u.is_verified,
                 "created_at": u.created_at.isoformat() if u.created_at else None,
-                "wishlist_count": db.query(Wishlist).filter(Wishlist.user_id == u.id).count(),
-                "alert_count": db.query(PriceAlert).filter(PriceAlert.user_id == u.id).count()
+                "wishlist_count": wishlist_counts.get(u.id, 0),
+                "alert_count": alert_counts.get(u.id, 0)
             }
             for u in users
         ],
@@ -315,12 +362,12 @@ async def update_user(
     is_active: bool = None,
     is_verified: bool = None,
     role: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Update user status"""
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -339,7 +386,7 @@ async def update_user(
     if role:
         user.role = UserRole(role)
     
-    db.commit()
+    await db.commit()
     
     return {"success": True, "message": "User updated"}
 
@@ -347,7 +394,7 @@ async def update_user(
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Delete a user"""
@@ -355,12 +402,12 @@ async def delete_user(
     if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     
     return {"success": True, "message": "User deleted"}
 
@@ -372,12 +419,12 @@ async def delete_user(
 @router.get("/analytics/most-wishlisted")
 async def get_most_wishlisted(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get most wishlisted products"""
     
-    result = db.execute(text("""
+    result = await db.execute(text("""
         SELECT 
             w.model_id,
             COUNT(*) as wishlist_count,
@@ -412,12 +459,12 @@ async def get_most_wishlisted(
 @router.get("/analytics/most-alerted")
 async def get_most_alerted(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get products with most price alerts"""
     
-    result = db.execute(text("""
+    result = await db.execute(text("""
         SELECT 
             a.model_id,
             COUNT(*) as alert_count,
@@ -456,12 +503,12 @@ async def get_most_alerted(
 @router.get("/analytics/recent-notifications")
 async def get_recent_notifications(
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get recent alert notifications"""
     
-    result = db.execute(text("""
+    result = await db.execute(text("""
         SELECT 
             n.id,
             n.model_id,
@@ -506,12 +553,12 @@ async def get_recent_notifications(
 @router.get("/analytics/user-growth")
 async def get_user_growth(
     days: int = 30,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get user registration data for chart"""
     
-    result = db.execute(text("""
+    result = await db.execute(text("""
         SELECT 
             DATE(created_at) as date,
             COUNT(*) as new_users,
@@ -539,12 +586,12 @@ async def get_user_growth(
 @router.get("/analytics/alerts-activity")
 async def get_alerts_activity(
     days: int = 30,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Get alerts activity data for chart"""
     
-    result = db.execute(text("""
+    result = await db.execute(text("""
         SELECT 
             DATE(created_at) as date,
             COUNT(*) as notifications_sent,
@@ -571,7 +618,7 @@ async def get_alerts_activity(
 
 @router.post("/run-alert-engine")
 async def run_alert_engine_manual(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """Manually trigger alert engine run"""
@@ -580,7 +627,8 @@ async def run_alert_engine_manual(
     
     try:
         engine = AlertEngine()
-        engine.run()
+        # The engine uses the sync session and sends emails; keep it off the event loop
+        await run_in_threadpool(engine.run)
         
         return {
             "success": True,
@@ -595,6 +643,125 @@ async def run_alert_engine_manual(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================
+# ETL PROFILE (etl_runs / etl_stage_runs)
+# ============================================
+
+@router.get("/etl/profile")
+async def get_etl_profile(
+    runs: int = Query(20, ge=1, le=500),
+    window: int = Query(7, ge=1, le=100),
+    threshold_pct: float = 25.0,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Per-stage trends of the last `runs` ETL runs.
+    A stage is flagged when its latest wall time is more than
+    threshold_pct slower than the median of its previous `window` runs.
+    """
+    empty = {"runs": [], "stages": {}, "regressions": []}
+
+    def has_profile_tables(session):
+        inspector = inspect(session.connection())
+        return inspector.has_table("etl_runs") and inspector.has_table("etl_stage_runs")
+
+    if not await db.run_sync(has_profile_tables):
+        return empty
+
+    run_rows = (await db.execute(text("""
+        SELECT run_id, started_at, finished_at, status, stage_count, etl_mode
+        FROM etl_runs
+        ORDER BY run_id DESC
+        LIMIT :runs
+    """), {"runs": runs})).fetchall()
+
+    if not run_rows:
+        return empty
+
+    # Runs before the oldest shown one still feed the rolling median
+    first_run = (await db.execute(text("""
+        SELECT COALESCE(MIN(run_id), :oldest_run) FROM (
+            SELECT run_id FROM etl_runs
+            WHERE run_id < :oldest_run
+            ORDER BY run_id DESC
+            LIMIT :window
+        ) earlier
+    """), {"oldest_run": run_rows[-1].run_id, "window": window})).scalar()
+
+    stage_rows = (await db.execute(text("""
+        SELECT run_id, stage, status, finished_at, wall_seconds, cpu_seconds,
+               rows_in, rows_out, bytes_read, bytes_written, peak_rss_mb, python_peak_mb
+        FROM etl_stage_runs
+        WHERE run_id >= :first_run
+        ORDER BY run_id, id
+    """), {"first_run": first_run})).fetchall()
+
+    stages = {}
+    for row in stage_rows:
+        stages.setdefault(row.stage, []).append({
+            "run_id": row.run_id,
+            "status": row.status,
+            "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+            "wall_seconds": row.wall_seconds,
+            "cpu_seconds": row.cpu_seconds,
+            "rows_in": row.rows_in,
+            "rows_out": row.rows_out,
+            "bytes_read": row.bytes_read,
+            "bytes_written": row.bytes_written,
+            "peak_rss_mb": row.peak_rss_mb,
+            "python_peak_mb": row.python_peak_mb
+        })
+
+    regressions = []
+    for stage, history in stages.items():
+        timed = [h for h in history if h["status"] == "completed" and h["wall_seconds"] is not None]
+        if len(timed) < 2:
+            continue
+
+        latest = timed[-1]
+        baseline = median(h["wall_seconds"] for h in timed[-window - 1:-1])
+        if baseline <= 0:
+            continue
+
+        slower_pct = (latest["wall_seconds"] - baseline) / baseline * 100
+        if slower_pct > threshold_pct:
+            regressions.append({
+                "stage": stage,
+                "run_id": latest["run_id"],
+                "wall_seconds": round(latest["wall_seconds"], 2),
+                "rolling_median": round(baseline, 2),
+                "slower_pct": round(slower_pct, 1)
+            })
+
+    # Trends only cover the requested runs, oldest first for charting
+    shown = {row.run_id for row in run_rows}
+    stages = {
+        stage: [h for h in history if h["run_id"] in shown]
+        for stage, history in stages.items()
+    }
+
+    return {
+        "runs": [
+            {
+                "run_id": row.run_id,
+                "started_at": row.started_at.isoformat() if row.started_at else None,
+                "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+                "status": row.status,
+                "stage_count": row.stage_count,
+                "etl_mode": row.etl_mode,
+                "wall_seconds": (row.finished_at - row.started_at).total_seconds()
+                if row.finished_at and row.started_at else None
+            }
+            for row in run_rows
+        ],
+        "stages": stages,
+        "regressions": sorted(regressions, key=lambda r: r["slower_pct"], reverse=True),
+        "threshold_pct": threshold_pct,
+        "window": window
+    }
+
+
 # ============================================
 # SCRAPER & ETL CONTROL
 # ============================================
@@ -3,12 +3,12 @@ Price Alert API Routes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import text, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, and_, select, func, case, bindparam
 from datetime import datetime, timezone
 from typing import List
 
-from db import get_db
+from db import get_async_db, run_concurrently
 from models import PriceAlert, AlertNotification, User
 from auth.dependencies import get_current_verified_user, get_current_active_user
 from .schemas import (
@@ -19,30 +19,53 @@ from .schemas import (
 router = APIRouter(prefix="/alerts", tags=["Price Alerts"])
 
 
-def get_product_details(db: Session, model_id: str) -> dict:
-    """Get product details for an alert"""
-    result = db.execute(text("""
-        SELECT 
-            MIN(full_name) as product_name,
-            MIN(brand) as brand,
-            MIN(image_url) as image_url,
-            MIN(sale_price) as min_price,
-            (SELECT platform FROM tv_platform_latest_master 
-             WHERE model_id = :model_id AND sale_price > 0 
-             ORDER BY sale_price ASC LIMIT 1) as best_platform
-        FROM tv_platform_latest_master
-        WHERE model_id = :model_id AND sale_price > 0
-    """), {"model_id": model_id}).fetchone()
-    
-    if result:
-        return {
-            "product_name": result.product_name,
-            "brand": result.brand,
-            "image_url": result.image_url,
-            "min_price": float(result.min_price) if result.min_price else None,
-            "best_platform": result.best_platform
+async def get_products_details(model_ids: List[str]) -> dict:
+    """Get product details for alerts, {model_id: details}"""
+    if not model_ids:
+        return {}
+    
+    params = {"model_ids": list(set(model_ids))}
+    
+    async def fetch_summaries(session):
+        result = await session.execute(text("""
+            SELECT 
+                model_id,
+                MIN(full_name) as product_name,
+                MIN(brand) as brand,
+                MIN(image_url) as image_url,
+                MIN(sale_price) as min_price
+            FROM tv_platform_latest_master
+            WHERE model_id IN :model_ids AND sale_price > 0
+            GROUP BY model_id
+        """).bindparams(bindparam("model_ids", expanding=True)), params)
+        return result.fetchall()
+    
+    async def fetch_prices(session):
+        result = await session.execute(text("""
+            SELECT model_id, platform
+            FROM tv_platform_latest_master
+            WHERE model_id IN :model_ids AND sale_price > 0
+            ORDER BY model_id, sale_price ASC
+        """).bindparams(bindparam("model_ids", expanding=True)), params)
+        return result.fetchall()
+    
+    summaries, prices = await run_concurrently(fetch_summaries, fetch_prices)
+    
+    # Cheapest platform per model: the first row of each model
+    best_platforms = {}
+    for row in prices:
+        best_platforms.setdefault(row.model_id, row.platform)
+    
+    return {
+        row.model_id: {
+            "product_name": row.product_name,
+            "brand": row.brand,
+            "image_url": row.image_url,
+            "min_price": float(row.min_price) if row.min_price else None,
+            "best_platform": best_platforms.get(row.model_id)
         }
-    return {}
+        for row in summaries
+    }
 
 
 # ============================================
@@ -51,21 +74,26 @@ def get_product_details(db: Session, model_id: str) -> dict:
 
 @router.get("", response_model=AlertListResponse)
 async def get_alerts(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all price alerts for current user"""
     
-    alerts = db.query(PriceAlert).filter(
-        PriceAlert.user_id == current_user.id
-    ).order_by(PriceAlert.created_at.desc()).all()
+    alerts = (await db.scalars(
+        select(PriceAlert).where(
+            PriceAlert.user_id == current_user.id
+        ).order_by(PriceAlert.created_at.desc())
+    )).all()
+    
+    # One lookup for every alerted product instead of one per alert
+    products = await get_products_details([alert.model_id for alert in alerts])
     
     alert_responses = []
     active_count = 0
     triggered_count = 0
     
     for alert in alerts:
-        product_details = get_product_details(db, alert.model_id)
+        product_details = products.get(alert.model_id, {})
         
         alert_responses.append(AlertResponse(
             id=alert.id,
@@ -100,18 +128,31 @@ async def get_alerts(
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_alert(
     alert_data: AlertCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_verified_user)
 ):
     """Create a new price alert (requires verified email)"""
     
-    # Check if alert already exists
-    existing = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.user_id == current_user.id,
-            PriceAlert.model_id == alert_data.model_id
+    async def find_existing(session):
+        return await session.scalar(
+            select(PriceAlert.id).where(
+                and_(
+                    PriceAlert.user_id == current_user.id,
+                    PriceAlert.model_id == alert_data.model_id
+                )
+            ).limit(1)
         )
-    ).first()
+    
+    async def find_price(session):
+        result = await session.execute(text("""
+            SELECT MIN(sale_price) as min_price
+            FROM tv_platform_latest_master
+            WHERE model_id = :model_id AND sale_price > 0
+        """), {"model_id": alert_data.model_id})
+        return result.fetchone()
+    
+    # Check if alert already exists and get current price, together
+    existing, price_result = await run_concurrently(find_existing, find_price)
     
     if existing:
         raise HTTPException(
@@ -119,13 +160,6 @@ async def create_alert(
             detail="Alert already exists for this product. Update the existing alert instead."
         )
     
-    # Get current price
-    price_result = db.execute(text("""
-        SELECT MIN(sale_price) as min_price
-        FROM tv_platform_latest_master
-        WHERE model_id = :model_id AND sale_price > 0
-    """), {"model_id": alert_data.model_id}).fetchone()
-    
     if not price_result or not price_result.min_price:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,8 +187,8 @@ async def create_alert(
     )
     
     db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    await db.commit()
+    await db.refresh(alert)
     
     return {
         "success": True,
@@ -174,17 +208,19 @@ async def create_alert(
 async def update_alert(
     alert_id: int,
     update_data: AlertUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update a price alert"""
     
-    alert = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.id == alert_id,
-            PriceAlert.user_id == current_user.id
-        )
-    ).first()
+    alert = await db.scalar(
+        select(PriceAlert).where(
+            and_(
+                PriceAlert.id == alert_id,
+                PriceAlert.user_id == current_user.id
+            )
+        ).limit(1)
+    )
     
     if not alert:
         raise HTTPException(
@@ -201,7 +237,7 @@ async def update_alert(
     if update_data.is_active is not None:
         alert.is_active = update_data.is_active
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -217,17 +253,19 @@ async def update_alert(
 @router.delete("/{alert_id}")
 async def delete_alert(
     alert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete a price alert"""
     
-    alert = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.id == alert_id,
-            PriceAlert.user_id == current_user.id
-        )
-    ).first()
+    alert = await db.scalar(
+        select(PriceAlert).where(
+            and_(
+                PriceAlert.id == alert_id,
+                PriceAlert.user_id == current_user.id
+            )
+        ).limit(1)
+    )
     
     if not alert:
         raise HTTPException(
@@ -235,8 +273,8 @@ async def delete_alert(
             detail="Alert not found"
         )
     
-    db.delete(alert)
-    db.commit()
+    await db.delete(alert)
+    await db.commit()
     
     return {
         "success": True,
@@ -251,17 +289,19 @@ async def delete_alert(
 @router.get("/check/{model_id}", response_model=AlertStatusResponse)
 async def check_alert_status(
     model_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Check if user has alert for this product"""
     
-    alert = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.user_id == current_user.id,
-            PriceAlert.model_id == model_id
-        )
-    ).first()
+    alert = await db.scalar(
+        select(PriceAlert).where(
+            and_(
+                PriceAlert.user_id == current_user.id,
+                PriceAlert.model_id == model_id
+            )
+        ).limit(1)
+    )
     
     if alert:
         return AlertStatusResponse(
@@ -281,17 +321,19 @@ async def check_alert_status(
 @router.post("/toggle/{alert_id}")
 async def toggle_alert(
     alert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Toggle alert active status"""
     
-    alert = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.id == alert_id,
-            PriceAlert.user_id == current_user.id
-        )
-    ).first()
+    alert = await db.scalar(
+        select(PriceAlert).where(
+            and_(
+                PriceAlert.id == alert_id,
+                PriceAlert.user_id == current_user.id
+            )
+        ).limit(1)
+    )
     
     if not alert:
         raise HTTPException(
@@ -300,7 +342,7 @@ async def toggle_alert(
         )
     
     alert.is_active = not alert.is_active
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -316,7 +358,7 @@ async def toggle_alert(
 @router.get("/notifications", response_model=List[AlertNotificationResponse])
 async def get_notifications(
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get alert notification history"""
@@ -338,7 +380,7 @@ async def get_notifications(
         LIMIT :limit
     """)
     
-    result = db.execute(query, {"user_id": current_user.id, "limit": limit})
+    result = await db.execute(query, {"user_id": current_user.id, "limit": limit})
     
     notifications = []
     for row in result:
@@ -361,31 +403,22 @@ async def get_notifications(
 
 @router.get("/count")
 async def get_alert_count(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get alert counts"""
     
-    total = db.query(PriceAlert).filter(
-        PriceAlert.user_id == current_user.id
-    ).count()
-    
-    active = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.user_id == current_user.id,
-            PriceAlert.is_active == True
-        )
-    ).count()
-    
-    triggered = db.query(PriceAlert).filter(
-        and_(
-            PriceAlert.user_id == current_user.id,
-            PriceAlert.is_triggered == True
-        )
-    ).count()
+    # All three counts in one pass over the user's alerts
+    counts = (await db.execute(
+        select(
+            func.count(),
+            func.sum(case((PriceAlert.is_active == True, 1), else_=0)),
+            func.sum(case((PriceAlert.is_triggered == True, 1), else_=0))
+        ).where(PriceAlert.user_id == current_user.id)
+    )).one()
     
     return {
-        "total": total,
-        "active": active,
-        "triggered": triggered
+        "total": counts[0],
+        "active": int(counts[1] or 0),
+        "triggered": int(counts[2] or 0)
     }
\ No newline at end of file
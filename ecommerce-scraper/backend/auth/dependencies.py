@@ -3,9 +3,9 @@ FastAPI Dependencies for Authentication
 """
 
 from fastapi import Depends, HTTPException, status, Request, Cookie
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from db import get_db
+from db import get_async_db
 from models import User, UserRole
 from .security import SecurityUtils
 
@@ -31,7 +31,7 @@ async def get_token_from_cookie(
 
 async def get_current_user(
     token: str = Depends(get_token_from_cookie),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current user from token"""
     payload = SecurityUtils.decode_access_token(token)
@@ -43,7 +43,7 @@ async def get_current_user(
     if not user_id:
         raise AuthError("Invalid token")
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.get(User, int(user_id))
     if not user:
         raise AuthError("User not found")
     
@@ -4,11 +4,11 @@ Authentication API Routes
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, BackgroundTasks
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, update
 from datetime import datetime, timezone
 
-from db import get_db
+from db import get_async_db
 from models import User, RefreshSession, UserRole, EmailVerificationToken
 from .schemas import (
     UserRegisterRequest, UserLoginRequest, UserResponse,
@@ -48,15 +48,17 @@ def clear_auth_cookies(response: Response):
     response.delete_cookie(key="refresh_token", path="/auth")
 
 
-def create_verification_token(db: Session, user: User) -> str:
+async def create_verification_token(db: AsyncSession, user: User) -> str:
     """Create and store a verification token for a user"""
     # Invalidate any existing unused tokens
-    db.query(EmailVerificationToken).filter(
-        and_(
-            EmailVerificationToken.user_id == user.id,
-            EmailVerificationToken.is_used == False
-        )
-    ).update({"is_used": True})
+    await db.execute(
+        update(EmailVerificationToken).where(
+            and_(
+                EmailVerificationToken.user_id == user.id,
+                EmailVerificationToken.is_used == False
+            )
+        ).values(is_used=True)
+    )
     
     # Create new token
     token = SecurityUtils.generate_verification_token()
@@ -66,7 +68,7 @@ def create_verification_token(db: Session, user: User) -> str:
         expires_at=SecurityUtils.get_verification_token_expiry()
     )
     db.add(verification_token)
-    db.commit()
+    await db.commit()
     
     return token
 
@@ -80,12 +82,12 @@ async def register(
     request: Request,
     user_data: UserRegisterRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(register_rate_limiter.check)
 ):
     """Register new user with email verification"""
     # Check existing email
-    existing = db.query(User).filter(User.email == user_data.email.lower()).first()
+    existing = await db.scalar(select(User).where(User.email == user_data.email.lower()).limit(1))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -96,18 +98,18 @@ async def register(
     new_user = User(
         name=user_data.name,
         email=user_data.email.lower(),
-        hashed_password=SecurityUtils.hash_password(user_data.password),
+        hashed_password=await SecurityUtils.hash_password_async(user_data.password),
         role=UserRole.USER,
         is_active=True,
         is_verified=False  # NEW: Start unverified
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create verification token and send email
-    verification_token = create_verification_token(db, new_user)
+    verification_token = await create_verification_token(db, new_user)
     
     # Send verification email in background
     background_tasks.add_task(
@@ -141,7 +143,7 @@ async def register(
         ip_address=client_ip
     )
     db.add(refresh_session)
-    db.commit()
+    await db.commit()
     
     # Response
     response_data = AuthResponse(
@@ -167,13 +169,15 @@ async def register(
 async def verify_email(
     request: VerifyEmailRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Verify email with token"""
     # Find token
-    token_record = db.query(EmailVerificationToken).filter(
-        EmailVerificationToken.token == request.token
-    ).first()
+    token_record = await db.scalar(
+        select(EmailVerificationToken).where(
+            EmailVerificationToken.token == request.token
+        ).limit(1)
+    )
     
     if not token_record:
         raise HTTPException(
@@ -182,7 +186,7 @@ async def verify_email(
         )
     
     # Get user first
-    user = db.query(User).filter(User.id == token_record.user_id).first()
+    user = await db.get(User, token_record.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,7 +228,7 @@ async def verify_email(
     token_record.is_used = True
     token_record.used_at = datetime.now(timezone.utc)
     
-    db.commit()
+    await db.commit()
     
     # Send success email in background
     background_tasks.add_task(
@@ -241,11 +245,11 @@ async def resend_verification(
     request: Request,
     data: ResendVerificationRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(verification_rate_limiter.check)
 ):
     """Resend verification email"""
-    user = db.query(User).filter(User.email == data.email.lower()).first()
+    user = await db.scalar(select(User).where(User.email == data.email.lower()).limit(1))
     
     # Always return success to prevent email enumeration
     if not user:
@@ -261,7 +265,7 @@ async def resend_verification(
         )
     
     # Create new verification token
-    verification_token = create_verification_token(db, user)
+    verification_token = await create_verification_token(db, user)
     
     # Send email in background
     background_tasks.add_task(
@@ -286,11 +290,11 @@ async def forgot_password(
     request: Request,
     data: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(password_reset_rate_limiter.check)
 ):
     """Request password reset"""
-    user = db.query(User).filter(User.email == data.email.lower()).first()
+    user = await db.scalar(select(User).where(User.email == data.email.lower()).limit(1))
     
     # Always return success to prevent email enumeration
     if not user:
@@ -309,7 +313,7 @@ async def forgot_password(
     reset_token = SecurityUtils.generate_password_reset_token()
     user.password_reset_token = SecurityUtils.hash_token(reset_token)
     user.password_reset_expires = SecurityUtils.get_password_reset_token_expiry()
-    db.commit()
+    await db.commit()
     
     # Send email in background
     background_tasks.add_task(
@@ -329,14 +333,16 @@ async def forgot_password(
 async def reset_password(
     data: ResetPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reset password with token"""
     hashed_token = SecurityUtils.hash_token(data.token)
     
-    user = db.query(User).filter(
-        User.password_reset_token == hashed_token
-    ).first()
+    user = await db.scalar(
+        select(User).where(
+            User.password_reset_token == hashed_token
+        ).limit(1)
+    )
     
     if not user:
         raise HTTPException(
@@ -354,23 +360,25 @@ async def reset_password(
         # Clear expired token
         user.password_reset_token = None
         user.password_reset_expires = None
-        db.commit()
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Reset token has expired. Please request a new one."
         )
     
     # Update password
-    user.hashed_password = SecurityUtils.hash_password(data.password)
+    user.hashed_password = await SecurityUtils.hash_password_async(data.password)
     user.password_reset_token = None
     user.password_reset_expires = None
     
     # Revoke all refresh sessions for security
-    db.query(RefreshSession).filter(
-        RefreshSession.user_id == user.id
-    ).update({"is_revoked": True})
+    await db.execute(
+        update(RefreshSession).where(
+            RefreshSession.user_id == user.id
+        ).values(is_revoked=True)
+    )
     
-    db.commit()
+    await db.commit()
     
     # Send confirmation email
     background_tasks.add_task(
@@ -393,13 +401,13 @@ async def reset_password(
 async def login(
     request: Request,
     credentials: UserLoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(login_rate_limiter.check)
 ):
     """Login user"""
-    user = db.query(User).filter(User.email == credentials.email.lower()).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email.lower()).limit(1))
     
-    if not user or not SecurityUtils.verify_password(credentials.password, user.hashed_password):
+    if not user or not await SecurityUtils.verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -435,7 +443,7 @@ async def login(
         ip_address=client_ip
     )
     db.add(refresh_session)
-    db.commit()
+    await db.commit()
     
     # Response with verification status
     response_data = AuthResponse(
@@ -456,7 +464,7 @@ async def login(
 # ============================================
 
 @router.post("/refresh")
-async def refresh_tokens(request: Request, db: Session = Depends(get_db)):
+async def refresh_tokens(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Refresh tokens with rotation"""
     refresh_token = request.cookies.get("refresh_token")
     
@@ -471,39 +479,45 @@ async def refresh_tokens(request: Request, db: Session = Depends(get_db)):
     hashed_token = SecurityUtils.hash_token(refresh_token)
     
     # Find session
-    session = db.query(RefreshSession).filter(
-        and_(
-            RefreshSession.hashed_refresh_token == hashed_token,
-            RefreshSession.user_id == user_id
-        )
-    ).first()
+    session = await db.scalar(
+        select(RefreshSession).where(
+            and_(
+                RefreshSession.hashed_refresh_token == hashed_token,
+                RefreshSession.user_id == user_id
+            )
+        ).limit(1)
+    )
     
     if not session:
         # Potential reuse attack - revoke all sessions
-        db.query(RefreshSession).filter(
-            RefreshSession.user_id == user_id
-        ).update({"is_revoked": True})
-        db.commit()
+        await db.execute(
+            update(RefreshSession).where(
+                RefreshSession.user_id == user_id
+            ).values(is_revoked=True)
+        )
+        await db.commit()
         raise HTTPException(status_code=401, detail="Invalid token - sessions revoked")
     
     if session.is_revoked:
         # Token reuse detected
-        db.query(RefreshSession).filter(
-            RefreshSession.user_id == user_id
-        ).update({"is_revoked": True})
-        db.commit()
+        await db.execute(
+            update(RefreshSession).where(
+                RefreshSession.user_id == user_id
+            ).values(is_revoked=True)
+        )
+        await db.commit()
         raise HTTPException(status_code=401, detail="Token reuse detected")
     
     if session.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
         session.is_revoked = True
-        db.commit()
+        await db.commit()
         raise HTTPException(status_code=401, detail="Token expired")
     
     # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user or not user.is_active:
         session.is_revoked = True
-        db.commit()
+        await db.commit()
         raise HTTPException(status_code=401, detail="User not found")
     
     # Revoke old token
@@ -529,7 +543,7 @@ async def refresh_tokens(request: Request, db: Session = Depends(get_db)):
         ip_address=client_ip
     )
     db.add(new_session)
-    db.commit()
+    await db.commit()
     
     response = JSONResponse(content={"success": True, "message": "Tokens refreshed"})
     set_auth_cookies(response, new_access_token, new_refresh_token)
@@ -544,7 +558,7 @@ async def refresh_tokens(request: Request, db: Session = Depends(get_db)):
 @router.post("/logout")
 async def logout(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Logout current session"""
@@ -552,16 +566,18 @@ async def logout(
     
     if refresh_token:
         hashed_token = SecurityUtils.hash_token(refresh_token)
-        session = db.query(RefreshSession).filter(
-            and_(
-                RefreshSession.hashed_refresh_token == hashed_token,
-                RefreshSession.user_id == current_user.id
-            )
-        ).first()
+        session = await db.scalar(
+            select(RefreshSession).where(
+                and_(
+                    RefreshSession.hashed_refresh_token == hashed_token,
+                    RefreshSession.user_id == current_user.id
+                )
+            ).limit(1)
+        )
         
         if session:
             session.is_revoked = True
-            db.commit()
+            await db.commit()
     
     response = JSONResponse(content={"success": True, "message": "Logged out"})
     clear_auth_cookies(response)
@@ -571,14 +587,16 @@ async def logout(
 
 @router.post("/logout-all")
 async def logout_all(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Logout all sessions"""
-    db.query(RefreshSession).filter(
-        RefreshSession.user_id == current_user.id
-    ).update({"is_revoked": True})
-    db.commit()
+    await db.execute(
+        update(RefreshSession).where(
+            RefreshSession.user_id == current_user.id
+        ).values(is_revoked=True)
+    )
+    await db.commit()
     
     response = JSONResponse(content={"success": True, "message": "All sessions logged out"})
     clear_auth_cookies(response)
@@ -598,17 +616,19 @@ async def get_me(current_user: User = Depends(get_current_active_user)):
 
 @router.get("/sessions")
 async def get_sessions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get active sessions"""
-    sessions = db.query(RefreshSession).filter(
-        and_(
-            RefreshSession.user_id == current_user.id,
-            RefreshSession.is_revoked == False,
-            RefreshSession.expires_at > datetime.now(timezone.utc)
+    sessions = (await db.scalars(
+        select(RefreshSession).where(
+            and_(
+                RefreshSession.user_id == current_user.id,
+                RefreshSession.is_revoked == False,
+                RefreshSession.expires_at > datetime.now(timezone.utc)
+            )
         )
-    ).all()
+    )).all()
     
     return {
         "sessions": [
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -46,6 +47,19 @@ class SecurityUtils:
         except Exception:
             return False
 
+    # bcrypt takes ~100-300ms of CPU per call; async routes run it on the
+    # threadpool so the event loop keeps serving other requests
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """Hash a password off the event loop"""
+        return await run_in_threadpool(cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, hashed_password: str) -> bool:
+        """Verify password off the event loop"""
+        return await run_in_threadpool(cls.verify_password, plain_password, hashed_password)
+
     @staticmethod
     def generate_token_id() -> str:
         """Generate unique token ID"""
@@ -0,0 +1,379 @@
+"""
+In-memory columnar snapshot of the product catalog
+
+tv_platform_latest_clean (tv_platform_latest_master until the clean
+stage has run, see listing_source.py) has a few thousand rows and only
+changes when the ETL publishes, so the catalog endpoints answer from a snapshot of
+it held in NumPy arrays instead of querying MySQL:
+
+    filters   boolean masks over the column arrays
+    search    BM25 inverted index built with the snapshot (search_index.py),
+              with typo correction (fuzzy_index.py)
+    suggest   sorted-array prefix index for autocomplete (suggest_index.py)
+    facets    per-value bitmaps combined with bitwise AND/OR (facet_index.py)
+    sorting   one precomputed lexsort for the keyset order
+              (sale_price, platform, model_id); argsort for other columns
+    top-N     argpartition before sorting when only a few rows are needed
+    paging    slices of the sorted positions, cursor compatible with
+              pagination.py
+
+The snapshot is loaded at startup and reloaded when the ETL data
+version changes. If it cannot be loaded, get_snapshot() returns None
+and the endpoints fall back to their database queries.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import engine
+from facet_index import FacetIndex, FACET_DIMENSIONS
+from listing_source import listings_source
+from pagination import decode_cursor, encode_key
+from response_cache import get_data_version
+from search_index import SearchIndex
+from suggest_index import SuggestIndex
+
+SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "true").lower() == "true"
+
+# Fields returned for each product (TVProductOut)
+PRODUCT_FIELDS = [
+    "platform", "brand", "model_id", "full_name", "display_type",
+    "sale_price", "original_cost", "discount", "rating",
+    "stock_status", "scraped_at", "image_url",
+]
+
+TEXT_COLUMNS = [
+    "platform", "brand", "model_id", "full_name", "display_type", "stock_status",
+    "screen_resolution",
+]
+NUMERIC_COLUMNS = ["sale_price", "original_cost", "discount", "rating"]
+
+# Columns searched by /products/search
+SEARCH_COLUMNS = ["brand", "full_name", "display_type", "model_id"]
+
+
+class CatalogSnapshot:
+
+    def __init__(self, df, version, canonical=None, wishlist_counts=None):
+        self.version = version
+        self.size = len(df)
+
+        self.text = {
+            column: df[column].fillna("").astype(str).to_numpy(dtype=str)
+            for column in TEXT_COLUMNS
+        }
+        # MySQL compares these case-insensitively (column collation), so
+        # the snapshot filters on lower-cased copies to give the same rows
+        self.lower = {
+            column: np.char.lower(self.text[column])
+            for column in ("brand", "platform", "display_type", "stock_status")
+        }
+        self.numeric = {
+            column: pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64")
+            for column in NUMERIC_COLUMNS
+        }
+        self.scraped_at = pd.to_datetime(df["scraped_at"], errors="coerce").to_numpy()
+
+        self.search_index = SearchIndex(
+            {column: self.text[column] for column in SEARCH_COLUMNS},
+            self.numeric["sale_price"]
+        )
+        self.suggest_index = SuggestIndex(
+            self.text["brand"], self.text["model_id"], self.text["full_name"], wishlist_counts
+        )
+        self.facet_index = FacetIndex(
+            {d: self.text[d] for d in FACET_DIMENSIONS if d in self.text},
+            self.numeric["sale_price"]
+        )
+
+        # Keyset order, computed once: sale_price, then platform, then model_id
+        self.keyset_order = np.lexsort((
+            self.text["model_id"],
+            self.text["platform"],
+            self.numeric["sale_price"],
+        ))
+
+        # "platform\x1fmodel_id" of every row, for matched listing lookups
+        self.listing_keys = np.char.add(
+            np.char.add(self.text["platform"], "\x1f"), self.text["model_id"]
+        )
+
+        # canonical_models (entity resolution) for /products/compare
+        self.canonical = None
+        if canonical is not None:
+            self.canonical = {
+                "model_id": canonical["model_id"].astype(str).to_numpy(dtype=str),
+                "canonical_model_id": canonical["canonical_model_id"].astype(str).to_numpy(dtype=str),
+                "listing_key": (
+                    canonical["platform"].astype(str) + "\x1f" + canonical["model_id"].astype(str)
+                ).to_numpy(dtype=str),
+            }
+
+        # Product dicts are built once; pages only pick from them
+        records = df[PRODUCT_FIELDS].astype(object)
+        records = records.where(records.notna(), None)
+        self.records = records.to_dict("records")
+        for record in self.records:
+            if record["scraped_at"] is not None:
+                record["scraped_at"] = record["scraped_at"].to_pydatetime()
+
+    # ------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------
+
+    def all_rows(self):
+        return np.ones(self.size, dtype=bool)
+
+    def rows(self, positions):
+        return [self.records[i] for i in positions]
+
+    def column(self, name):
+        if name in self.numeric:
+            return self.numeric[name]
+        if name == "scraped_at":
+            return self.scraped_at
+        return self.text.get(name)
+
+    def after_key(self, positions, order, key):
+        """Mask over positions (in keyset order) of rows after a cursor key"""
+        sale_price, platform, model_id = key
+
+        price = self.numeric["sale_price"][positions]
+        plat = self.text["platform"][positions]
+        model = self.text["model_id"][positions]
+
+        if order == "desc":
+            return (price < sale_price) | ((price == sale_price) & (
+                (plat < platform) | ((plat == platform) & (model < model_id))
+            ))
+
+        return (price > sale_price) | ((price == sale_price) & (
+            (plat > platform) | ((plat == platform) & (model > model_id))
+        ))
+
+    def keyset_page(self, mask, order, page_size, cursor=None):
+        """Same contract as pagination.keyset_page: (rows, next_cursor)"""
+        positions = self.keyset_order[mask[self.keyset_order]]
+        if order == "desc":
+            positions = positions[::-1]
+
+        if cursor:
+            positions = positions[self.after_key(positions, order, decode_cursor(cursor, order))]
+
+        page = positions[:page_size]
+        next_cursor = None
+
+        if len(positions) > page_size:
+            last = page[-1]
+            next_cursor = encode_key(
+                order,
+                float(self.numeric["sale_price"][last]),
+                str(self.text["platform"][last]),
+                str(self.text["model_id"][last])
+            )
+
+        return self.rows(page), next_cursor
+
+    def sorted_positions(self, mask, sort_by, order):
+        """Positions of mask rows sorted by one column, stable on the keyset order"""
+        positions = self.keyset_order[mask[self.keyset_order]]
+        values = self.column(sort_by)
+
+        if values is None:
+            return positions
+
+        key = values[positions]
+        if order == "desc":
+            # Reverse the sort key rather than the result, so ties stay in keyset order
+            key = _descending_key(key)
+
+        return positions[np.argsort(key, kind="stable")]
+
+    # ------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------
+
+    def products(self, page, page_size, sort_by, order):
+        positions = self.sorted_positions(self.all_rows(), sort_by, order)
+        start = (page - 1) * page_size
+        return self.rows(positions[start:start + page_size])
+
+    def filter_mask(self, brand=None, min_price=None, max_price=None,
+                    display_type=None, in_stock_only=False, platform=None):
+        mask = self.all_rows()
+        price = self.numeric["sale_price"]
+
+        if platform:
+            mask &= self.lower["platform"] == platform.lower()
+        if brand:
+            mask &= np.char.find(self.lower["brand"], brand.lower()) >= 0
+        if min_price is not None:
+            mask &= price >= min_price
+        if max_price is not None:
+            mask &= price <= max_price
+        if display_type:
+            mask &= self.lower["display_type"] == display_type.lower()
+        if in_stock_only:
+            mask &= self.lower["stock_status"] == "in_stock"
+
+        return mask
+
+    def filter(self, **filters):
+        return self.rows(np.flatnonzero(self.filter_mask(**filters)))
+
+    def search(self, q, limit=50, **filters):
+        """
+        Best `limit` matches for q by relevance (search_index.py).
+        Returns (rows, corrected query): when q matches nothing, its
+        misspelled terms are corrected and the corrected query is
+        searched instead; corrected is None otherwise.
+        """
+        mask = self.filter_mask(**filters) if any(filters.values()) else None
+        positions = self.search_index.search(q, limit=limit, mask=mask)
+
+        corrected = None
+        if len(positions) == 0:
+            corrected = self.search_index.correct(q)
+            if corrected is not None:
+                positions = self.search_index.search(corrected, limit=limit, mask=mask)
+
+        return self.rows(positions), corrected
+
+    def did_you_mean(self, q, limit=5):
+        """Corrected query and per-term corrections for q (fuzzy_index.py)"""
+        return self.search_index.correct(q), self.search_index.corrections(q, limit=limit)
+
+    def suggest(self, q, limit=8):
+        """Autocomplete completions for q (suggest_index.py)"""
+        return self.suggest_index.suggest(q, limit=limit)
+
+    def facets(self, selections, order="asc", page_size=20, cursor=None,
+               min_price=None, max_price=None):
+        """
+        One keyset page of the listings matching selections plus facet
+        counts for every dimension (facet_index.py).
+        Returns (rows, next_cursor, total, facets).
+        """
+        base = None
+        if min_price is not None or max_price is not None:
+            base = self.filter_mask(min_price=min_price, max_price=max_price)
+
+        mask, facets = self.facet_index.facets(selections, base)
+        rows, next_cursor = self.keyset_page(mask, order, page_size, cursor)
+
+        return rows, next_cursor, int(mask.sum()), facets
+
+    def compare(self, model_id):
+        """Listings of model_id and of every listing resolved to the same product"""
+        mask = self.text["model_id"] == model_id
+
+        if self.canonical is not None:
+            canonical = self.canonical
+            ids = canonical["canonical_model_id"][canonical["model_id"] == model_id]
+            matched = canonical["listing_key"][np.isin(canonical["canonical_model_id"], ids)]
+            mask |= np.isin(self.listing_keys, matched)
+
+        positions = self.keyset_order[mask[self.keyset_order]]
+        return self.rows(positions)
+
+
+def _descending_key(values):
+    """Sort key that orders values descending with a stable ascending sort"""
+    if values.dtype.kind in "fiu":
+        # NaN (NULL) rows still sort last
+        return -values.astype("float64")
+    if values.dtype.kind == "M":
+        # NaT is the smallest int64 and stays negative when negated;
+        # give it the largest key so NULL rows still sort last
+        key = -values.astype("int64")
+        key[np.isnat(values)] = np.iinfo("int64").max
+        return key
+    # Text: rank the unique values, then negate the rank
+    _, inverse = np.unique(values, return_inverse=True)
+    return -inverse
+
+
+# ======================================================
+# LOADING
+# ======================================================
+
+_snapshot = None
+_load_lock = threading.Lock()
+
+# A version that failed to load is retried at most this often
+RETRY_SECONDS = 30
+_last_failure = {"version": None, "at": 0.0}
+
+
+def load_snapshot(version=None):
+    """Read the listings into a new snapshot, None if they cannot be read"""
+    version = get_data_version() if version is None else version
+
+    try:
+        table, listing_rows = listings_source()
+        df = pd.read_sql(f"SELECT * FROM {table} WHERE {listing_rows}", engine)
+    except (SQLAlchemyError, ValueError) as e:
+        print(f"Catalog snapshot not loaded, using the database: {e}")
+        return None
+
+    try:
+        canonical = pd.read_sql(
+            "SELECT platform, model_id, canonical_model_id FROM canonical_models", engine
+        )
+    except (SQLAlchemyError, ValueError):
+        # Entity resolution has not run yet; compare matches model_id only
+        canonical = None
+
+    try:
+        wishlists = pd.read_sql(
+            "SELECT model_id, COUNT(*) AS wishlists FROM wishlists GROUP BY model_id", engine
+        )
+        wishlist_counts = dict(zip(wishlists["model_id"], wishlists["wishlists"].astype(int)))
+    except (SQLAlchemyError, ValueError):
+        # Suggestions are then ranked by listing count only
+        wishlist_counts = None
+
+    return CatalogSnapshot(df, version, canonical, wishlist_counts)
+
+
+def get_snapshot():
+    """
+    The snapshot for the current data version, reloading it first if
+    the ETL published since it was built.
+
+    While one request reloads, the others keep using the previous
+    snapshot. Returns None when disabled or when no snapshot could be
+    loaded yet; callers then query the database.
+    """
+    global _snapshot
+
+    if not SNAPSHOT_ENABLED:
+        return None
+
+    version = get_data_version()
+    snapshot = _snapshot
+
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    if _last_failure["version"] == version and time.monotonic() - _last_failure["at"] < RETRY_SECONDS:
+        return snapshot
+
+    if not _load_lock.acquire(blocking=False):
+        return snapshot
+
+    try:
+        if _snapshot is None or _snapshot.version != version:
+            loaded = load_snapshot(version)
+            if loaded is None:
+                _last_failure.update(version=version, at=time.monotonic())
+            else:
+                _snapshot = loaded
+        return _snapshot
+    finally:
+        _load_lock.release()
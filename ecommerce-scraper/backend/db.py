@@ -4,6 +4,8 @@ Database Configuration and Session Management
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -18,6 +20,12 @@ DB_NAME = os.getenv("DB_NAME", "offerzone_project")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Same database through an asyncio driver, used by the account routers
+# (auth, wishlist, alerts, settings, admin)
+ASYNC_DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "10"))
+ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "20"))
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
@@ -32,6 +40,25 @@ SessionLocal = sessionmaker(
 )
 
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=ASYNC_POOL_SIZE,
+    max_overflow=ASYNC_MAX_OVERFLOW,
+    echo=False
+)
+
+# Objects stay readable after commit; with an async session an expired
+# attribute can't be lazily reloaded
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db():
     """Dependency that provides a database session"""
     db = SessionLocal()
@@ -41,8 +68,29 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency that provides an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_concurrently(*queries):
+    """
+    Run independent read queries at the same time.
+
+    A session runs one statement at a time, so each query gets its own
+    session (and pooled connection). Every query is a coroutine function
+    taking the session; results are returned in the order given.
+    """
+    async def run(query):
+        async with AsyncSessionLocal() as db:
+            return await query(db)
+
+    return await asyncio.gather(*(run(query) for query in queries))
+
+
 def init_database():
     """Initialize database tables"""
-    from models import Base
-    Base.metadata.create_all(bind=engine)
+    from models import Base, api_tables
+    Base.metadata.create_all(bind=engine, tables=api_tables())
     print("✅ Database tables initialized")
\ No newline at end of file
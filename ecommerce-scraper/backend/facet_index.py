@@ -0,0 +1,134 @@
+"""
+Faceted filtering with bitmap indexes
+
+Built from the catalog snapshot each time it is (re)loaded. For every
+facet dimension, each distinct value keeps a bitmap of the listings
+that have it, packed 8 listings per byte:
+
+    brand / platform / display_type / screen_resolution / stock_status
+    price_bucket    sale_price bucketed by PRICE_BUCKETS
+
+A selection is evaluated with bitwise operations only:
+
+    OR  of the selected values within a dimension
+    AND across dimensions
+
+Facet counts are disjunctive: the counts of a dimension apply every
+selection except its own, so the other values of a dimension the user
+already filtered on still show how many listings they would add.
+Counting is a byte-wise popcount of (selection AND value bitmap).
+"""
+
+import numpy as np
+
+FACET_DIMENSIONS = [
+    "brand", "platform", "display_type", "screen_resolution", "price_bucket", "stock_status",
+]
+
+# (label, lower bound inclusive, upper bound exclusive), same ranges as
+# the Filters page
+PRICE_BUCKETS = [
+    ("0-20000", 0, 20000),
+    ("20000-35000", 20000, 35000),
+    ("35000-50000", 35000, 50000),
+    ("50000-75000", 50000, 75000),
+    ("75000-100000", 75000, 100000),
+    ("100000+", 100000, float("inf")),
+]
+
+# Set bits per byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def price_bucket_labels(prices):
+    labels = np.full(len(prices), "", dtype=object)
+    for label, low, high in PRICE_BUCKETS:
+        labels[(prices >= low) & (prices < high)] = label
+    return labels
+
+
+class FacetIndex:
+
+    def __init__(self, columns, prices):
+        """
+        columns: {dimension: array of strings} for every dimension but
+                 price_bucket, one entry per listing
+        prices:  sale_price array, bucketed into price_bucket
+        """
+        self.size = len(prices)
+        self.bytes = (self.size + 7) // 8
+
+        values = dict(columns)
+        values["price_bucket"] = price_bucket_labels(prices)
+
+        self.bitmaps = {}
+        for dimension in FACET_DIMENSIONS:
+            column = np.asarray(values[dimension], dtype=object)
+            unique, inverse = np.unique(column.astype(str), return_inverse=True)
+
+            self.bitmaps[dimension] = {
+                str(value): np.packbits(inverse == i)
+                for i, value in enumerate(unique)
+                if value
+            }
+
+        # Price buckets are listed in price order, the others by value
+        order = [label for label, _, _ in PRICE_BUCKETS]
+        self.bitmaps["price_bucket"] = {
+            label: self.bitmaps["price_bucket"][label]
+            for label in order if label in self.bitmaps["price_bucket"]
+        }
+
+        # Selected values match case-insensitively, like the MySQL fallback
+        self.lookup = {
+            dimension: {}
+            for dimension in FACET_DIMENSIONS
+        }
+        for dimension, bitmaps in self.bitmaps.items():
+            for value in bitmaps:
+                self.lookup[dimension].setdefault(value.lower(), []).append(value)
+
+        self.everything = np.packbits(np.ones(self.size, dtype=bool))
+
+    def count(self, bitmap):
+        return int(POPCOUNT[bitmap].sum())
+
+    def dimension_bitmap(self, dimension, selected):
+        """Listings having any of the selected values of one dimension"""
+        bitmap = np.zeros(self.bytes, dtype=np.uint8)
+        for value in selected:
+            for match in self.lookup[dimension].get(value.lower(), []):
+                bitmap |= self.bitmaps[dimension][match]
+        return bitmap
+
+    def facets(self, selections, base=None):
+        """
+        (matching listings mask, {dimension: [{"value", "count"}]})
+        """
+        active = {d: s for d, s in selections.items() if s}
+        by_dimension = {d: self.dimension_bitmap(d, s) for d, s in active.items()}
+
+        start = self.everything.copy() if base is None else np.packbits(base)
+
+        selected = start.copy()
+        for bitmap in by_dimension.values():
+            selected &= bitmap
+
+        facets = {}
+        for dimension in FACET_DIMENSIONS:
+            if dimension in by_dimension:
+                # Every selection except this dimension's own
+                others = start.copy()
+                for other, bitmap in by_dimension.items():
+                    if other != dimension:
+                        others &= bitmap
+            else:
+                others = selected
+
+            facets[dimension] = [
+                {"value": value, "count": self.count(others & bitmap)}
+                for value, bitmap in self.bitmaps[dimension].items()
+            ]
+
+        mask = np.unpackbits(selected, count=self.size).astype(bool)
+        return mask, facets
@@ -0,0 +1,188 @@
+"""
+Typo-tolerant term lookup (SymSpell-style deletion dictionary)
+
+Built with the search index, from its vocabulary. Every term is stored
+under each string obtained by deleting up to MAX_EDIT_DISTANCE
+characters from its first PREFIX_LENGTH characters:
+
+    "samsung" -> samsung, amsung, smsung, ..., msung, ssung, ...
+
+A misspelled query term generates its own deletions the same way. Any
+vocabulary term sharing one of them is a candidate, and candidates are
+verified with a bounded Damerau-Levenshtein distance. A lookup touches
+a few dozen dictionary keys instead of comparing against every term.
+
+Model codes are matched on their prefix: "55uq75oo" is compared with
+the first 8 characters of 55uq7500psc, so a partially typed code with
+a typo is corrected to the partial code "55uq7500".
+"""
+
+from collections import defaultdict
+from itertools import combinations
+
+MAX_EDIT_DISTANCE = 2
+
+# Terms are indexed by the deletions of this many leading characters;
+# longer terms are told apart by the distance check
+PREFIX_LENGTH = 7
+
+# Shorter terms allow fewer edits, or none
+MIN_LENGTH_FOR_EDITS = {1: 3, 2: 6}
+
+
+def max_distance_for(term):
+    allowed = 0
+    for distance, min_length in MIN_LENGTH_FOR_EDITS.items():
+        if len(term) >= min_length:
+            allowed = distance
+    return min(allowed, MAX_EDIT_DISTANCE)
+
+
+def deletes_at(prefix, distance):
+    """Strings made by deleting exactly distance characters from prefix"""
+    return {
+        "".join(c for i, c in enumerate(prefix) if i not in removed)
+        for removed in combinations(range(len(prefix)), distance)
+    }
+
+
+def deletes(term, max_distance):
+    """term's prefix and every string made by deleting up to max_distance characters"""
+    prefix = term[:PREFIX_LENGTH]
+    variants = {prefix}
+
+    for distance in range(1, min(max_distance, len(prefix) - 1) + 1):
+        variants |= deletes_at(prefix, distance)
+
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance between a and b, or limit + 1 as
+    soon as it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    # Shared prefix and suffix cost nothing; similar codes share most
+    # of their characters, so the table left is usually tiny
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+
+    # Only cells within `limit` of the diagonal can stay within limit;
+    # anything above it is capped at limit + 1
+    over = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        row_min = current[0]
+        char = a[i - 1]
+
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            # Transposition of two adjacent characters
+            if i > 1 and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < cost:
+                cost = previous2[j - 2] + 1
+
+            current[j] = min(cost, over)
+            if cost < row_min:
+                row_min = cost
+
+        if row_min > limit:
+            return over
+
+        previous2, previous = previous, current
+
+    return previous[-1]
+
+
+class FuzzyIndex:
+
+    def __init__(self, terms, codes=()):
+        """
+        terms: {term: document count} of words matched whole
+        codes: {code: document count} of model codes, matched on their prefix
+        """
+        self.counts = {}
+        self.is_code = {}
+        self.dictionary = defaultdict(list)
+
+        for entries, is_code in ((terms, False), (dict(codes), True)):
+            for term, count in entries.items():
+                if term in self.counts:
+                    self.counts[term] = max(self.counts[term], count)
+                    self.is_code[term] = self.is_code[term] or is_code
+                    continue
+
+                self.counts[term] = count
+                self.is_code[term] = is_code
+                for variant in deletes(term, MAX_EDIT_DISTANCE):
+                    self.dictionary[variant].append(term)
+
+    def lookup(self, term, limit=5):
+        """
+        Vocabulary terms within the allowed edit distance of term, as
+        (term, distance, document count), closest and most common first.
+        Code candidates are returned cut to the length of term.
+        """
+        max_distance = max_distance_for(term)
+        if max_distance == 0:
+            return []
+
+        prefix = term[:PREFIX_LENGTH]
+        seen = set()
+        counts = defaultdict(int)
+        matches = {}
+
+        for level in range(min(max_distance, len(prefix) - 1) + 1):
+            new_targets = set()
+
+            for variant in deletes_at(prefix, level):
+                for candidate in self.dictionary.get(variant, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+
+                    # Codes cut to the same prefix are one target, counted together
+                    target = candidate
+                    if self.is_code[candidate] and len(candidate) > len(term):
+                        target = candidate[:len(term)]
+
+                    if target not in counts:
+                        new_targets.add(target)
+                    counts[target] += self.counts[candidate]
+
+            for target in new_targets:
+                distance = edit_distance(term, target, max_distance)
+                if 0 < distance <= max_distance:
+                    matches[target] = distance
+
+            # A term within `level` edits is reachable with at most `level`
+            # deletions from the query, so later levels only add matches
+            # further away than the ones already found
+            if sum(1 for distance in matches.values() if distance <= level) >= limit:
+                break
+
+        ranked = sorted(matches, key=lambda target: (matches[target], -counts[target], target))
+        return [(target, matches[target], counts[target]) for target in ranked[:limit]]
+
+    def correct(self, term):
+        """Closest, most common correction of term, None if there is none"""
+        matches = self.lookup(term, limit=1)
+        return matches[0][0] if matches else None
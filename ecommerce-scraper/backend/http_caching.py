@@ -0,0 +1,200 @@
+"""
+HTTP conditional requests for GET endpoints
+
+Catalog routes (ROUTE_POLICIES) only change when the ETL publishes, so
+their ETag is derived before the handler runs:
+
+    ETag = hash(data version + path + normalized query string)
+
+A matching If-None-Match (or an If-Modified-Since not older than the
+data version's publish time) is answered with 304 straight away, so
+neither the handler nor the database is touched. These responses also
+get the route's public Cache-Control with stale-while-revalidate.
+
+Every other JSON GET response gets an ETag hashed from its body and
+"private, no-cache": the handler still runs, but a client that already
+holds the same body receives an empty 304 instead of the payload.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from response_cache import get_data_version, get_data_published_at
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    max_age: int
+    stale_while_revalidate: int
+
+    @property
+    def header(self):
+        return (
+            f"public, max-age={self.max_age}, "
+            f"stale-while-revalidate={self.stale_while_revalidate}"
+        )
+
+
+# Routes whose responses depend only on ETL published data
+ROUTE_POLICIES = [
+    (re.compile(r"^/analytics/"), CachePolicy(max_age=300, stale_while_revalidate=3600)),
+    (re.compile(r"^/filters/"), CachePolicy(max_age=300, stale_while_revalidate=3600)),
+    (re.compile(r"^/platforms/"), CachePolicy(max_age=300, stale_while_revalidate=3600)),
+    (re.compile(r"^/products(/filter|/facets|/search|/suggest|/did-you-mean|/compare|/best-deals)?$"),
+     CachePolicy(max_age=60, stale_while_revalidate=600)),
+    (re.compile(r"^/products/[^/]+/(charts/|price-history-data|price-events)"),
+     CachePolicy(max_age=300, stale_while_revalidate=3600)),
+]
+
+# Bodies larger than this are passed through without a body ETag
+MAX_HASHED_BODY_BYTES = 5 * 1024 * 1024
+
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def route_policy(path):
+    for pattern, policy in ROUTE_POLICIES:
+        if pattern.search(path):
+            return policy
+    return None
+
+
+def versioned_etag(version, request):
+    query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    raw = f"{version}|{request.url.path}|{query}"
+    return '"v{}-{}"'.format(version, hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+
+def body_etag(body):
+    return '"b-{}"'.format(hashlib.sha256(body).hexdigest()[:32])
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" matches "x" (compressing proxies add W/)
+    return "*" in candidates or any(
+        tag == etag or tag == f"W/{etag}" for tag in candidates
+    )
+
+
+def not_modified_since(if_modified_since, published_at):
+    if not if_modified_since or published_at is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    # published_at is naive UTC; HTTP dates have second precision
+    return published_at.replace(microsecond=0) <= since
+
+
+def http_date(value):
+    """HTTP date of a naive UTC datetime"""
+    return value.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+def not_modified(headers):
+    return Response(status_code=304, headers=headers)
+
+
+class HTTPCachingMiddleware(BaseHTTPMiddleware):
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+
+        policy = route_policy(request.url.path)
+
+        if policy is not None:
+            return await self._versioned(request, call_next, policy)
+
+        return await self._hashed(request, call_next)
+
+    async def _versioned(self, request, call_next, policy):
+        version, published_at = await run_in_threadpool(
+            lambda: (get_data_version(), get_data_published_at())
+        )
+
+        headers = {
+            "ETag": versioned_etag(version, request),
+            "Cache-Control": policy.header,
+        }
+        if published_at is not None:
+            headers["Last-Modified"] = http_date(published_at)
+
+        if_none_match = request.headers.get("if-none-match")
+
+        if etag_matches(if_none_match, headers["ETag"]) or (
+            if_none_match is None
+            and not_modified_since(request.headers.get("if-modified-since"), published_at)
+        ):
+            return not_modified(headers)
+
+        response = await call_next(request)
+
+        if response.status_code == 200:
+            response.headers.update(headers)
+
+        return response
+
+    async def _hashed(self, request, call_next):
+        response = await call_next(request)
+
+        if (
+            response.status_code != 200
+            or "etag" in response.headers
+            or "set-cookie" in response.headers
+            or not response.headers.get("content-type", "").startswith("application/json")
+        ):
+            return response
+
+        body = b""
+        async for chunk in response.body_iterator:
+            body += chunk
+            if len(body) > MAX_HASHED_BODY_BYTES:
+                break
+        else:
+            etag = body_etag(body)
+            headers = {
+                "etag": etag,
+                "cache-control": response.headers.get("cache-control", PRIVATE_CACHE_CONTROL),
+            }
+
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(headers)
+
+            response_headers = dict(response.headers)
+            response_headers.update(headers)
+            response_headers.pop("content-length", None)
+
+            return Response(
+                content=body,
+                status_code=response.status_code,
+                headers=response_headers,
+                media_type=response.media_type,
+            )
+
+        # Too large to hash: send what was read plus the rest unchanged
+        async def remaining():
+            yield body
+            async for chunk in response.body_iterator:
+                yield chunk
+
+        response.body_iterator = remaining()
+        return response
@@ -3,13 +3,13 @@ Database Initialization Script
 """
 
 from db import engine, SessionLocal
-from models import Base, User, UserRole
+from models import Base, User, UserRole, api_tables
 from auth.security import SecurityUtils
 
 
 def create_tables():
     """Create all tables"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=engine, tables=api_tables())
     print("✅ Tables created")
 
 
@@ -0,0 +1,87 @@
+"""
+Table the catalog endpoints read the latest listings from
+
+tv_platform_latest_clean is published by the ETL clean_latest stage.
+Until that stage has run (the table is missing or still empty) the
+endpoints read tv_platform_latest_master with the filters they used
+before the clean table existed (valid_listings, listings_source),
+so a fresh deployment serves data
+before its first full ETL run instead of empty lists.
+
+Which table is used is decided once per data version: publishing the
+clean table bumps the version, and the next request switches over.
+"""
+
+import threading
+
+from sqlalchemy import and_, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import engine
+from models import TVPlatformLatest, TVPlatformLatestClean
+from response_cache import get_data_version
+
+CLEAN_TABLE = TVPlatformLatestClean.__tablename__
+MASTER_TABLE = TVPlatformLatest.__tablename__
+
+# Listings the endpoints serve. The master table needs a price and an
+# original cost; every clean row has both, so the clean table only
+# repeats the price condition.
+CLEAN_LISTING_ROWS = "sale_price > 0"
+MASTER_LISTING_ROWS = "sale_price > 0 AND original_cost > 0"
+
+# Rows the statistics aggregate over: the clean table flags price
+# outliers, the master table only has the validity filter
+CLEAN_STATISTICS_ROWS = "is_outlier = 0"
+MASTER_STATISTICS_ROWS = MASTER_LISTING_ROWS
+
+_state = {"version": None, "clean": False}
+_lock = threading.Lock()
+
+
+def clean_table_ready():
+    """True once the ETL has published rows into tv_platform_latest_clean"""
+    version = get_data_version()
+    if _state["version"] == version:
+        return _state["clean"]
+
+    with _lock:
+        if _state["version"] != version:
+            try:
+                with engine.connect() as conn:
+                    row = conn.execute(text(f"SELECT 1 FROM {CLEAN_TABLE} LIMIT 1")).first()
+            except SQLAlchemyError:
+                # Missing table, or the database is unreachable: use the
+                # master table and check again on the next request
+                return False
+
+            _state.update(version=version, clean=row is not None)
+
+        return _state["clean"]
+
+
+def listings_model():
+    """ORM model of the listings; filter it with valid_listings(Listing)"""
+    return TVPlatformLatestClean if clean_table_ready() else TVPlatformLatest
+
+
+def valid_listings(Listing):
+    """ORM condition of the listings served from Listing's table"""
+    condition = Listing.sale_price > 0
+    if Listing is TVPlatformLatest:
+        condition = and_(condition, Listing.original_cost > 0)
+    return condition
+
+
+def listings_source():
+    """(table, WHERE condition) of the listings served"""
+    if clean_table_ready():
+        return CLEAN_TABLE, CLEAN_LISTING_ROWS
+    return MASTER_TABLE, MASTER_LISTING_ROWS
+
+
+def statistics_source():
+    """(table, WHERE condition) of the rows statistics are computed on"""
+    if clean_table_ready():
+        return CLEAN_TABLE, CLEAN_STATISTICS_ROWS
+    return MASTER_TABLE, MASTER_STATISTICS_ROWS
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+# --------------------------------------------------
+# Load test for the account endpoints
+# --------------------------------------------------
+# Logs in once, then keeps `concurrency` clients requesting the
+# wishlist / alerts / settings / auth endpoints for `duration` seconds
+# against a running server, and reports throughput and latency
+# percentiles per endpoint. Needs httpx (requirements.txt).
+#
+# To compare before and after a change, run it against each build and
+# keep the first result:
+#
+#   python load_test.py --email a@b.c --password ... --save before.json
+#   python load_test.py --email a@b.c --password ... --baseline before.json
+#
+# The server should run the way it does in production (several uvicorn
+# workers or one, but the same for both runs) against the same data.
+
+ENDPOINTS = [
+    "/auth/me",
+    "/wishlist",
+    "/wishlist/count",
+    "/alerts",
+    "/alerts/count",
+    "/settings/profile",
+    "/settings/alert-preferences",
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def login(client, email, password):
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+
+
+async def worker(client, endpoints, offset, deadline, samples):
+    i = offset
+    while time.perf_counter() < deadline:
+        path = endpoints[i % len(endpoints)]
+        i += 1
+
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        samples.append((path, time.perf_counter() - started, ok))
+
+
+async def run(base_url, email, password, concurrency, duration, endpoints):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await login(client, email, password)
+
+        # Warm up connections, caches and the database pools
+        for path in endpoints:
+            await client.get(path)
+
+        samples = []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, endpoints, offset, deadline, samples)
+            for offset in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed, concurrency)
+
+
+def summarize(samples, elapsed, concurrency):
+    def stats(rows):
+        latencies = sorted(seconds * 1000 for _, seconds, ok in rows if ok)
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for _, _, ok in rows if not ok),
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+        }
+
+    by_path = {}
+    for row in samples:
+        by_path.setdefault(row[0], []).append(row)
+
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 1),
+        "total": stats(samples),
+        "endpoints": {path: stats(rows) for path, rows in sorted(by_path.items())},
+    }
+
+
+def print_result(result, baseline=None):
+    print(f"Concurrency {result['concurrency']}, {result['seconds']} s\n")
+    print(f"{'endpoint':<30}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for path, stats in rows:
+        line = (
+            f"{path:<30}{stats['rps']:>9}{str(stats['p50_ms']):>9}"
+            f"{str(stats['p95_ms']):>9}{str(stats['p99_ms']):>9}{stats['errors']:>8}"
+        )
+        before = baseline["endpoints"].get(path) if baseline and path != "TOTAL" else None
+        if baseline and path == "TOTAL":
+            before = baseline["total"]
+        if before and before["rps"]:
+            line += f"   {stats['rps'] / before['rps']:.2f}x req/s vs baseline"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the account endpoints")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--endpoint", action="append", help="endpoint to request, repeatable (default: all)")
+    parser.add_argument("--save", help="write the result to this JSON file")
+    parser.add_argument("--baseline", help="JSON result of an earlier run to compare with")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(
+        args.url, args.email, args.password,
+        args.concurrency, args.duration, args.endpoint or ENDPOINTS
+    ))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_result(result, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved to {args.save}")
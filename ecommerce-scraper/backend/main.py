@@ -2,14 +2,16 @@
 Main FastAPI Application - OfferZone TV Price Intelligence
 """
 
-from fastapi import FastAPI, Depends, Query, HTTPException
+from fastapi import FastAPI, Depends, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, text
+from sqlalchemy import and_, or_, bindparam, case, func, select, text, tuple_
+from sqlalchemy.exc import ProgrammingError
 from typing import List, Optional
 from contextlib import asynccontextmanager
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+import json
 import os
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
@@ -24,7 +26,7 @@ scheduler = AsyncIOScheduler()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - start scheduler on startup"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=engine, tables=api_tables())
     print("Database tables ready")
     
     # Start alert scheduler (every 30 minutes)
@@ -40,9 +42,10 @@ async def lifespan(app: FastAPI):
 
 
 # ================= DB & MODELS =================
-from db import get_db, engine
+from db import get_db, run_concurrently, engine, async_engine
 from models import (
     Base,
+    api_tables,
     TVPlatformLatest,
     TVBrandMaster,
     TVPlatformMaster,
@@ -52,8 +55,22 @@ from models import (
 from schemas import (
     TVProductOut,
     BrandAnalyticsOut,
-    PlatformAnalyticsOut
+    PlatformAnalyticsOut,
+    SuggestionOut,
+    DidYouMeanOut,
+    FacetedProductsOut
 )
+from response_cache import cached_response, cached_value, cache_stats
+from catalog_snapshot import get_snapshot
+from listing_source import listings_model, listings_source, statistics_source, valid_listings
+from facet_index import FACET_DIMENSIONS, PRICE_BUCKETS
+from pagination import (
+    keyset_page,
+    keyset_order,
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER
+)
+from http_caching import HTTPCachingMiddleware
 
 # ================= AUTH =================
 from auth import auth_router, get_current_active_user, require_admin
@@ -64,9 +81,12 @@ from alerts import alerts_router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - create tables on startup"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=engine, tables=api_tables())
     print(" Database tables ready")
+    if get_snapshot() is not None:
+        print(" Catalog snapshot loaded")
     yield
+    await async_engine.dispose()
     print(" Shutting down")
 
 
@@ -80,11 +100,21 @@ app = FastAPI(
 if os.path.exists("images"):
     app.mount("/images", StaticFiles(directory="images"), name="images")
 
+# ======================================================
+# HTTP CACHING (ETAG / 304)
+# ======================================================
+# Added before CORS so CORS stays the outer layer and 304 responses
+# carry the CORS headers too
+app.add_middleware(HTTPCachingMiddleware)
+
 # ======================================================
 # CORS (REACT + CREDENTIALS SUPPORT)
 # ======================================================
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+# Query actually searched when /products/search corrected a typo
+DID_YOU_MEAN_HEADER = "X-Did-You-Mean"
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -97,6 +127,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, DID_YOU_MEAN_HEADER],
 )
 
 # ======================================================
@@ -126,21 +157,64 @@ def health():
 
 @app.get("/products", response_model=List[TVProductOut])
 def get_products(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("sale_price"),
     order: str = Query("asc"),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
-    query = db.query(TVPlatformLatest).filter(
-        TVPlatformLatest.sale_price > 0,
-        TVPlatformLatest.original_cost > 0
-    )
+    """
+    Products in sort_by order.
+
+    Sorted by sale_price (the default), pages are read with keyset
+    pagination: pass the X-Next-Cursor header of a response as cursor
+    to get the next page. page > 1 without a cursor and other sort
+    columns still use OFFSET. include_total=true adds X-Total-Count
+    (cached per data version).
+
+    Served from the in-memory catalog snapshot when it is loaded.
+    """
+    order = "desc" if order == "desc" else "asc"
+
+    if cursor and sort_by != "sale_price":
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort_by=sale_price")
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        if include_total:
+            response.headers[TOTAL_COUNT_HEADER] = str(snapshot.size)
+
+        if sort_by == "sale_price" and (cursor or page == 1):
+            rows, next_cursor = snapshot.keyset_page(snapshot.all_rows(), order, page_size, cursor)
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            return rows
+
+        return snapshot.products(page, page_size, sort_by, order)
+
+    Listing = listings_model()
+    query = db.query(Listing).filter(valid_listings(Listing))
+
+    if include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(
+            cached_value("products_total", {}, query.count)
+        )
+
+    if sort_by == "sale_price" and (cursor or page == 1):
+        rows, next_cursor = keyset_page(query, Listing, order, page_size, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return rows
 
-    if hasattr(TVPlatformLatest, sort_by):
-        column = getattr(TVPlatformLatest, sort_by)
+    if hasattr(Listing, sort_by):
+        column = getattr(Listing, sort_by)
         query = query.order_by(
-            column.desc() if order == "desc" else column.asc()
+            column.desc() if order == "desc" else column.asc(),
+            Listing.platform,
+            Listing.model_id
         )
 
     return (
@@ -160,35 +234,179 @@ def filter_products(
     in_stock_only: bool = False,
     db: Session = Depends(get_db)
 ):
-    query = db.query(TVPlatformLatest).filter(
-        TVPlatformLatest.sale_price > 0,
-        TVPlatformLatest.original_cost > 0
-    )
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.filter(
+            brand=brand,
+            min_price=min_price,
+            max_price=max_price,
+            display_type=display_type,
+            in_stock_only=in_stock_only
+        )
+
+    Listing = listings_model()
+    query = db.query(Listing).filter(valid_listings(Listing))
 
     if brand:
-        query = query.filter(TVPlatformLatest.brand.ilike(f"%{brand}%"))
+        query = query.filter(Listing.brand.ilike(f"%{brand}%"))
     if min_price is not None:
-        query = query.filter(TVPlatformLatest.sale_price >= min_price)
+        query = query.filter(Listing.sale_price >= min_price)
     if max_price is not None:
-        query = query.filter(TVPlatformLatest.sale_price <= max_price)
+        query = query.filter(Listing.sale_price <= max_price)
     if display_type:
-        query = query.filter(TVPlatformLatest.display_type == display_type)
+        query = query.filter(Listing.display_type == display_type)
     if in_stock_only:
-        query = query.filter(TVPlatformLatest.stock_status == "in_stock")
+        query = query.filter(Listing.stock_status == "in_stock")
 
     return query.all()
 
 
+def get_matched_listings(db: Session, model_id: str):
+    """
+    (platform, model_id) of every listing resolved to the same product
+    as model_id by the ETL entity resolution stage (canonical_models).
+    """
+    try:
+        rows = db.execute(text("""
+            SELECT c.platform, c.model_id
+            FROM canonical_models c
+            JOIN canonical_models m
+                ON m.canonical_model_id = c.canonical_model_id
+            WHERE m.model_id = :model_id
+        """), {"model_id": model_id}).fetchall()
+    except ProgrammingError:
+        # canonical_models not built yet
+        db.rollback()
+        return []
+
+    return [(row.platform, row.model_id) for row in rows]
+
+
+def _facet_column(Listing, dimension):
+    """Column (or price bucket expression) a facet dimension groups on"""
+    if dimension == "price_bucket":
+        return case(
+            *[
+                (and_(Listing.sale_price >= low, Listing.sale_price < high), label)
+                for label, low, high in PRICE_BUCKETS[:-1]
+            ],
+            else_=PRICE_BUCKETS[-1][0]
+        )
+    return getattr(Listing, dimension)
+
+
+@app.get("/products/facets", response_model=FacetedProductsOut)
+def faceted_products(
+    brand: List[str] = Query([]),
+    platform: List[str] = Query([]),
+    display_type: List[str] = Query([]),
+    screen_resolution: List[str] = Query([]),
+    price_bucket: List[str] = Query([]),
+    stock_status: List[str] = Query([]),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    order: str = Query("asc"),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Products matching a facet selection, one page at a time, with the
+    listing count of every value of every facet dimension.
+
+    Repeat a parameter to select several values (brand=LG&brand=Sony):
+    values of one dimension are OR-ed, dimensions are AND-ed. Counts
+    of a dimension ignore its own selection. Items are sorted by
+    sale_price; pass next_cursor as cursor for the following page.
+
+    Served from the bitmap indexes of the catalog snapshot
+    (facet_index.py), with a GROUP BY per dimension as fallback.
+    """
+    order = "desc" if order == "desc" else "asc"
+
+    selections = {
+        "brand": brand,
+        "platform": platform,
+        "display_type": display_type,
+        "screen_resolution": screen_resolution,
+        "price_bucket": price_bucket,
+        "stock_status": stock_status,
+    }
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        items, next_cursor, total, facets = snapshot.facets(
+            selections, order, page_size, cursor, min_price, max_price
+        )
+        return {"items": items, "total": total, "next_cursor": next_cursor, "facets": facets}
+
+    Listing = listings_model()
+
+    base = [valid_listings(Listing)]
+    if min_price is not None:
+        base.append(Listing.sale_price >= min_price)
+    if max_price is not None:
+        base.append(Listing.sale_price <= max_price)
+
+    conditions = {
+        dimension: _facet_column(Listing, dimension).in_(selected)
+        for dimension, selected in selections.items()
+        if selected
+    }
+
+    query = db.query(Listing).filter(*base, *conditions.values())
+    items, next_cursor = keyset_page(query, Listing, order, page_size, cursor)
+
+    facets = {}
+    for dimension in FACET_DIMENSIONS:
+        column = _facet_column(Listing, dimension)
+        others = [c for d, c in conditions.items() if d != dimension]
+
+        counts = dict(
+            db.query(column, func.count())
+            .filter(*base, *others, column.isnot(None), column != "")
+            .group_by(column)
+            .all()
+        )
+
+        values = (
+            [label for label, _, _ in PRICE_BUCKETS if label in counts]
+            if dimension == "price_bucket" else sorted(counts)
+        )
+        facets[dimension] = [{"value": value, "count": counts[value]} for value in values]
+
+    return {
+        "items": items,
+        "total": query.count(),
+        "next_cursor": next_cursor,
+        "facets": facets,
+    }
+
+
 @app.get("/products/compare", response_model=List[TVProductOut])
 def compare_products(model_id: str, db: Session = Depends(get_db)):
-    results = (
-        db.query(TVPlatformLatest)
-        .filter(
-            TVPlatformLatest.model_id == model_id,
-            TVPlatformLatest.sale_price > 0,
-            TVPlatformLatest.original_cost > 0
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        results = snapshot.compare(model_id)
+        if not results:
+            raise HTTPException(status_code=404, detail="No valid priced products found")
+        return results
+
+    matched = get_matched_listings(db, model_id)
+    Listing = listings_model()
+
+    same_product = (
+        or_(
+            Listing.model_id == model_id,
+            tuple_(Listing.platform, Listing.model_id).in_(matched)
         )
-        .order_by(TVPlatformLatest.sale_price.asc())
+        if matched else Listing.model_id == model_id
+    )
+
+    results = (
+        db.query(Listing)
+        .filter(same_product, valid_listings(Listing))
+        .order_by(Listing.sale_price.asc())
         .all()
     )
 
@@ -199,28 +417,161 @@ def compare_products(model_id: str, db: Session = Depends(get_db)):
 
 
 @app.get("/products/search", response_model=List[TVProductOut])
-def search_products(q: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    brand: Optional[str] = None,
+    platform: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    display_type: Optional[str] = None,
+    in_stock_only: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Up to 50 products ranked by relevance (BM25 over model code, brand,
+    display type and title, see search_index.py). Without the catalog
+    snapshot, falls back to substring matching ordered by price.
+
+    When q matches nothing, its misspelled terms are corrected and the
+    corrected query is searched instead; it is returned in the
+    X-Did-You-Mean header.
+    """
+    filters = {
+        "brand": brand,
+        "platform": platform,
+        "min_price": min_price,
+        "max_price": max_price,
+        "display_type": display_type,
+        "in_stock_only": in_stock_only,
+    }
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        rows, corrected = snapshot.search(q, limit=50, **filters)
+        if corrected is not None:
+            response.headers[DID_YOU_MEAN_HEADER] = corrected
+        return rows
+
     keyword = f"%{q.strip().lower()}%"
+    Listing = listings_model()
+
+    query = db.query(Listing).filter(
+        valid_listings(Listing),
+        or_(
+            func.lower(Listing.brand).like(keyword),
+            func.lower(Listing.full_name).like(keyword),
+            func.lower(Listing.display_type).like(keyword),
+            func.lower(Listing.model_id).like(keyword),
+        )
+    )
+
+    if brand:
+        query = query.filter(Listing.brand.ilike(f"%{brand}%"))
+    if platform:
+        query = query.filter(Listing.platform == platform)
+    if min_price is not None:
+        query = query.filter(Listing.sale_price >= min_price)
+    if max_price is not None:
+        query = query.filter(Listing.sale_price <= max_price)
+    if display_type:
+        query = query.filter(Listing.display_type == display_type)
+    if in_stock_only:
+        query = query.filter(Listing.stock_status == "in_stock")
 
     return (
-        db.query(TVPlatformLatest)
-        .filter(
-            TVPlatformLatest.sale_price > 0,
-            TVPlatformLatest.original_cost > 0,
-            or_(
-                func.lower(TVPlatformLatest.brand).like(keyword),
-                func.lower(TVPlatformLatest.full_name).like(keyword),
-                func.lower(TVPlatformLatest.display_type).like(keyword),
-                func.lower(TVPlatformLatest.model_id).like(keyword),
-            )
-        )
-        .order_by(TVPlatformLatest.sale_price.asc())
+        query
+        .order_by(Listing.sale_price.asc())
         .limit(50)
         .all()
     )
 
 
+@app.get("/products/did-you-mean", response_model=DidYouMeanOut)
+def did_you_mean(q: str = Query(..., min_length=1, max_length=100)):
+    """
+    Spelling corrections for the terms of q that match no product:
+    vocabulary words and model codes within 1-2 edits, closest and
+    most common first (fuzzy_index.py). corrected is q with each such
+    term replaced by its best correction, null if none applies.
+
+    Needs the catalog snapshot; without it nothing is suggested.
+    """
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return {"query": q, "corrected": None, "suggestions": {}}
+
+    corrected, corrections = snapshot.did_you_mean(q)
+
+    return {
+        "query": q,
+        "corrected": corrected,
+        "suggestions": {
+            term: [
+                {"term": match, "distance": distance, "count": count}
+                for match, distance, count in matches
+            ]
+            for term, matches in corrections.items()
+        },
+    }
+
+
+@app.get("/products/suggest", response_model=List[SuggestionOut])
+def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Search bar autocomplete: brands, model codes and title words that
+    complete q, most listed and most wishlisted first (suggest_index.py).
+    Without the catalog snapshot, completes brands and model codes with
+    prefix queries.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.suggest(q, limit=limit)
+
+    prefix = q.strip().lower() + "%"
+    table, listing_rows = listings_source()
+
+    rows = db.execute(
+        text(f"""
+            SELECT text, kind, listings, 0 AS wishlists
+            FROM (
+                SELECT brand AS text, 'brand' AS kind, COUNT(*) AS listings
+                FROM {table}
+                WHERE LOWER(brand) LIKE :prefix AND {listing_rows}
+                GROUP BY brand
+
+                UNION ALL
+
+                SELECT model_id AS text, 'model' AS kind, COUNT(*) AS listings
+                FROM {table}
+                WHERE LOWER(model_id) LIKE :prefix AND {listing_rows}
+                GROUP BY model_id
+            ) completions
+            ORDER BY listings DESC, text
+            LIMIT :limit
+        """),
+        {"prefix": prefix, "limit": limit}
+    ).fetchall()
+
+    return [dict(row._mapping) for row in rows]
+
+
+# Sort orders of /products/best-deals, each backed by an index of model_deals
+BEST_DEALS_SORT_COLUMNS = {
+    "savings": "price_difference",
+    "savings_percent": "savings_percent",
+    "price": "min_price",
+    "discount": "max_discount",
+    "rating": "avg_rating",
+}
+
+
 @app.get("/products/best-deals")
+@cached_response()
 def get_best_deals(
     search: Optional[str] = None,
     brands: Optional[str] = None,
@@ -234,92 +585,113 @@ def get_best_deals(
     page_size: int = Query(24, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    try:
-        #  FIX: Build price filter correctly
-        price_filter_parts = []
-        if min_price is not None:
-            price_filter_parts.append(f"AND min_price >= {min_price}")
-        if max_price is not None:
-            price_filter_parts.append(f"AND min_price <= {max_price}")
-        price_filter = " ".join(price_filter_parts)
-
-        query = text("""
-            WITH price_stats AS (
-                SELECT 
-                    model_id,
-                    MIN(full_name) as full_name,
-                    MIN(brand) as brand,
-                    MIN(display_type) as display_type,
-                    MIN(image_url) as image_url,
-                    COUNT(DISTINCT platform) as platform_count,
-                    MIN(sale_price) as min_price,
-                    MAX(sale_price) as max_price,
-                    AVG(sale_price) as avg_price,
-                    MAX(sale_price) - MIN(sale_price) as price_difference,
-                    MAX(original_cost) as original_cost,
-                    MAX(discount) as max_discount,
-                    AVG(rating) as avg_rating,
-                    GROUP_CONCAT(DISTINCT platform) as platforms,
-                    GROUP_CONCAT(DISTINCT CONCAT(platform, ':', sale_price)) as platform_prices,
-                    MIN(stock_status) as stock_status
-                FROM tv_platform_latest_master
-                WHERE sale_price > 0 AND original_cost > 0
-                GROUP BY model_id
-                HAVING COUNT(DISTINCT platform) >= 1
-            )
-            SELECT 
+    """
+    Models ranked by price spread across platforms, read from the
+    model_deals table the ETL materializes (Scrapers/etl/model_deals.py).
+    Until that table exists, the same rows are aggregated from the
+    listings on each request. Every filter is a bound parameter; sort
+    columns come from BEST_DEALS_SORT_COLUMNS only.
+    """
+    conditions = []
+    params = {"limit": page_size, "offset": (page - 1) * page_size}
+
+    brand_list = [b.strip() for b in brands.split(",") if b.strip()] if brands else []
+    if brand_list:
+        conditions.append("brand IN :brands")
+        params["brands"] = brand_list
+    if min_price is not None:
+        conditions.append("min_price >= :min_price")
+        params["min_price"] = min_price
+    if max_price is not None:
+        conditions.append("min_price <= :max_price")
+        params["max_price"] = max_price
+    # 0 means no minimum, as before (unrated/undiscounted models stay in)
+    if min_discount:
+        conditions.append("max_discount >= :min_discount")
+        params["min_discount"] = min_discount
+    if min_rating:
+        conditions.append("avg_rating >= :min_rating")
+        params["min_rating"] = min_rating
+    if search:
+        conditions.append(
+            "(LOWER(full_name) LIKE :search OR LOWER(brand) LIKE :search OR LOWER(model_id) LIKE :search)"
+        )
+        params["search"] = f"%{search.strip().lower()}%"
+
+    def deals_query(source):
+        query = text(f"""
+            SELECT
                 model_id, full_name, brand, display_type, image_url,
                 platform_count, min_price, max_price, avg_price,
                 price_difference, original_cost, max_discount, avg_rating,
-                platforms, platform_prices, stock_status,
-                ROUND((price_difference / max_price) * 100, 1) as savings_percent
-            FROM price_stats
-            WHERE 1=1
-            {brand_filter}
-            {price_filter}
-            {discount_filter}
-            {rating_filter}
-            {search_filter}
-            ORDER BY {sort_column} {sort_order}
+                platforms, platform_prices, stock_status, savings_percent
+            FROM {source}
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY {BEST_DEALS_SORT_COLUMNS[sort_by]} {"ASC" if order == "asc" else "DESC"}, model_id
             LIMIT :limit OFFSET :offset
-        """.format(
-            brand_filter="AND brand IN ({})".format(
-                ",".join([f"'{b.strip()}'" for b in brands.split(",")])
-            ) if brands else "",
-            price_filter=price_filter,  #  Use the correctly built filter
-            discount_filter=f"AND max_discount >= {min_discount}" if min_discount else "",
-            rating_filter=f"AND avg_rating >= {min_rating}" if min_rating else "",
-            search_filter=f"AND (LOWER(full_name) LIKE '%{search.lower()}%' OR LOWER(brand) LIKE '%{search.lower()}%' OR LOWER(model_id) LIKE '%{search.lower()}%')" if search else "",
-            sort_column={
-                "savings": "price_difference",
-                "savings_percent": "savings_percent",
-                "price": "min_price",
-                "discount": "max_discount",
-                "rating": "avg_rating"
-            }.get(sort_by, "price_difference"),
-            sort_order=order.upper()
-        ))
-
-        # ... rest of your code remains the same
+        """)
+        if brand_list:
+            query = query.bindparams(bindparam("brands", expanding=True))
+        return query
 
-        result = db.execute(query, {"limit": page_size, "offset": (page - 1) * page_size})
-
-        deals = []
-        for row in result:
-            row_dict = dict(row._mapping)
-            platform_prices = {}
-            if row_dict.get("platform_prices"):
-                for pp in row_dict["platform_prices"].split(","):
-                    if ":" in pp:
-                        platform, price = pp.split(":")
-                        platform_prices[platform] = float(price)
-            row_dict["platform_prices"] = platform_prices
-            row_dict["platforms"] = row_dict.get("platforms", "").split(",") if row_dict.get("platforms") else []
-            deals.append(row_dict)
-
-        return deals
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    try:
+        rows = db.execute(deals_query("model_deals"), params).fetchall()
+    except ProgrammingError:
+        # model_deals not built yet: aggregate the listings per request
+        db.rollback()
+        rows = db.execute(deals_query(_live_deals_source()), params).fetchall()
+        return [_parse_live_deal(dict(row._mapping)) for row in rows]
+
+    deals = []
+    for row in rows:
+        deal = dict(row._mapping)
+        for column in ("platforms", "platform_prices"):
+            if isinstance(deal[column], (str, bytes)):
+                deal[column] = json.loads(deal[column])
+        deals.append(deal)
+
+    return deals
+
+
+def _live_deals_source():
+    """model_deals computed from the listings, as a derived table"""
+    table, listing_rows = listings_source()
+    return f"""(
+        SELECT
+            model_id,
+            MIN(full_name) AS full_name,
+            MIN(brand) AS brand,
+            MIN(display_type) AS display_type,
+            MIN(image_url) AS image_url,
+            COUNT(DISTINCT platform) AS platform_count,
+            MIN(sale_price) AS min_price,
+            MAX(sale_price) AS max_price,
+            AVG(sale_price) AS avg_price,
+            MAX(sale_price) - MIN(sale_price) AS price_difference,
+            ROUND((MAX(sale_price) - MIN(sale_price)) / MAX(sale_price) * 100, 1) AS savings_percent,
+            MAX(original_cost) AS original_cost,
+            MAX(discount) AS max_discount,
+            AVG(rating) AS avg_rating,
+            MIN(stock_status) AS stock_status,
+            GROUP_CONCAT(DISTINCT platform ORDER BY platform) AS platforms,
+            GROUP_CONCAT(DISTINCT CONCAT(platform, ':', sale_price) ORDER BY platform) AS platform_prices
+        FROM {table}
+        WHERE {listing_rows}
+        GROUP BY model_id
+    ) live_deals"""
+
+
+def _parse_live_deal(deal):
+    """Shape the GROUP_CONCAT columns like model_deals' JSON ones"""
+    platform_prices = {}
+    for pair in (deal["platform_prices"] or "").split(","):
+        if ":" in pair:
+            platform, price = pair.rsplit(":", 1)
+            platform_prices[platform] = float(price)
+
+    deal["platform_prices"] = platform_prices
+    deal["platforms"] = deal["platforms"].split(",") if deal["platforms"] else []
+    return deal
 
 
 # ======================================================
@@ -327,16 +699,19 @@ def get_best_deals(
 # ======================================================
 
 @app.get("/analytics/brands", response_model=List[BrandAnalyticsOut])
+@cached_response(model=List[BrandAnalyticsOut])
 def brand_analytics(db: Session = Depends(get_db)):
     return db.query(TVBrandMaster).all()
 
 
 @app.get("/analytics/platforms", response_model=List[PlatformAnalyticsOut])
+@cached_response(model=List[PlatformAnalyticsOut])
 def platform_analytics(db: Session = Depends(get_db)):
     return db.query(TVPlatformMaster).all()
 
 
 @app.get("/analytics/products")
+@cached_response()
 def product_statistics(db: Session = Depends(get_db)):
     try:
         result = db.execute(
@@ -354,15 +729,134 @@ def product_statistics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/analytics/column-statistics")
+@cached_response()
+def column_statistics(
+    table: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Per-column statistics and correlations of the master tables,
+    precomputed by the ETL (column_statistics.py).
+    """
+    params = {"table": table}
+    where = "WHERE table_name = :table" if table else ""
+
+    try:
+        stats = db.execute(text(f"""
+            SELECT table_name, column_name, count, mean, std, min, q1, median, q3, max,
+                   mode, skew, iqr, lower_bound, upper_bound, computed_at
+            FROM column_statistics
+            {where}
+            ORDER BY table_name, column_name
+        """), params).fetchall()
+
+        correlations = db.execute(text(f"""
+            SELECT table_name, column_x, column_y, correlation, covariance
+            FROM column_correlations
+            {where}
+            ORDER BY table_name, column_x, column_y
+        """), params).fetchall()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    tables = {}
+    for row in stats:
+        entry = tables.setdefault(row.table_name, {"columns": {}, "correlations": []})
+        entry["columns"][row.column_name] = {
+            key: value for key, value in row._mapping.items()
+            if key not in ("table_name", "column_name", "computed_at")
+        }
+
+    for row in correlations:
+        entry = tables.setdefault(row.table_name, {"columns": {}, "correlations": []})
+        entry["correlations"].append({
+            "x": row.column_x,
+            "y": row.column_y,
+            "correlation": row.correlation,
+            "covariance": row.covariance
+        })
+
+    return {
+        "tables": tables,
+        "computed_at": stats[0].computed_at.isoformat() if stats else None
+    }
+
+
+@app.get("/analytics/views")
+@cached_response()
+def list_analytics_views(db: Session = Depends(get_db)):
+    """Analytics views materialized by the ETL (tv_analytics.py)"""
+    try:
+        rows = db.execute(text("""
+            SELECT view_name, description, row_count, refreshed_at
+            FROM analytics_views
+            ORDER BY view_name
+        """)).fetchall()
+    except ProgrammingError:
+        db.rollback()
+        return []
+
+    return [dict(row._mapping) for row in rows]
+
+
+@app.get("/analytics/views/{view_name}")
+@cached_response()
+def get_analytics_view(
+    view_name: str,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Rows of one materialized analytics view in display order.
+    Only views registered in analytics_views can be read, so the
+    table name interpolated below always comes from the registry.
+    """
+    try:
+        view = db.execute(text("""
+            SELECT view_name, table_name, description, row_count, refreshed_at
+            FROM analytics_views
+            WHERE view_name = :view_name
+        """), {"view_name": view_name}).fetchone()
+    except ProgrammingError:
+        db.rollback()
+        view = None
+
+    if not view:
+        raise HTTPException(status_code=404, detail=f"Unknown analytics view: {view_name}")
+
+    rows = db.execute(text(f"""
+        SELECT * FROM `{view.table_name}`
+        WHERE position > :offset
+        ORDER BY position
+        LIMIT :limit
+    """), {"offset": offset, "limit": limit}).fetchall()
+
+    return {
+        "view": view.view_name,
+        "description": view.description,
+        "total": view.row_count,
+        "refreshed_at": view.refreshed_at.isoformat() if view.refreshed_at else None,
+        "items": [
+            {key: value for key, value in row._mapping.items() if key != "position"}
+            for row in rows
+        ]
+    }
+
+
 # ======================================================
 #  NEW BEST STATISTICS ENDPOINT (DASHBOARD READY)
 # ======================================================
 
 @app.get("/analytics/statistics")
+@cached_response()
 def get_best_statistics(db: Session = Depends(get_db)):
     try:
+        table, statistics_rows = statistics_source()
+
         # -------------------- OVERALL KPIs --------------------
-        overall = db.execute(text("""
+        overall = db.execute(text(f"""
             SELECT 
                 COUNT(*) as total_tvs,
                 ROUND(AVG(sale_price), 2) as avg_sale_price,
@@ -370,8 +864,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 ROUND(AVG(rating), 2) as avg_rating,
                 MIN(sale_price) as min_sale_price,
                 MAX(sale_price) as max_sale_price
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
         """)).fetchone()
 
         overall_stats = {
@@ -384,7 +878,7 @@ def get_best_statistics(db: Session = Depends(get_db)):
         }
 
         # -------------------- BEST VALUE TVs --------------------
-        best_value = db.execute(text("""
+        best_value = db.execute(text(f"""
             SELECT 
                 model_id,
                 MIN(full_name) as full_name,
@@ -395,8 +889,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 MAX(discount) as discount,
                 ROUND(AVG(rating), 2) as rating,
                 ROUND((MAX(discount)*0.6 + (AVG(rating)*10)*0.4), 2) as value_score
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY model_id
             ORDER BY value_score DESC
             LIMIT 10
@@ -405,15 +899,15 @@ def get_best_statistics(db: Session = Depends(get_db)):
         top_best_value_tvs = [dict(row._mapping) for row in best_value]
 
         # -------------------- BRAND STATS --------------------
-        brand_stats = db.execute(text("""
+        brand_stats = db.execute(text(f"""
             SELECT
                 brand,
                 COUNT(DISTINCT model_id) as total_models,
                 ROUND(AVG(sale_price), 2) as avg_price,
                 ROUND(AVG(discount), 2) as avg_discount,
                 ROUND(AVG(rating), 2) as avg_rating
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY brand
             ORDER BY avg_rating DESC
             LIMIT 20
@@ -437,7 +931,7 @@ def get_best_statistics(db: Session = Depends(get_db)):
         platform_stats = [dict(row._mapping) for row in platform_stats]
 
         # -------------------- PRICE SEGMENTS --------------------
-        segment_stats = db.execute(text("""
+        segment_stats = db.execute(text(f"""
             SELECT 
                 CASE
                     WHEN sale_price BETWEEN 1 AND 25000 THEN 'Budget'
@@ -448,8 +942,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 COUNT(*) as total_tvs,
                 ROUND(AVG(discount), 2) as avg_discount,
                 ROUND(AVG(rating), 2) as avg_rating
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY segment
             ORDER BY total_tvs DESC
         """)).fetchall()
@@ -473,6 +967,7 @@ def get_best_statistics(db: Session = Depends(get_db)):
 # ======================================================
 
 @app.get("/platforms/list", response_model=List[str])
+@cached_response(model=List[str])
 def get_platforms(db: Session = Depends(get_db)):
     platforms = (
         db.query(TVPlatformLatest.platform)
@@ -484,6 +979,7 @@ def get_platforms(db: Session = Depends(get_db)):
 
 
 @app.get("/platforms/{platform}/brands", response_model=List[str])
+@cached_response(model=List[str])
 def get_brands_by_platform(platform: str, db: Session = Depends(get_db)):
     brands = (
         db.query(TVPlatformLatest.brand)
@@ -503,10 +999,21 @@ def get_brands_by_platform(platform: str, db: Session = Depends(get_db)):
 def get_models_by_platform_brand(
     platform: str,
     brand: str,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
+    """
+    Models of a brand on a platform, cheapest first, with keyset
+    pagination (see /products). Reads the master table with its
+    original sale_price > 0 filter, so listings the clean table drops
+    (no original cost, discount or rating out of range) are still
+    listed; its (platform, brand, sale_price, model_id) index serves
+    every page with one range scan.
+    """
     base_query = (
         db.query(TVPlatformLatest)
         .filter(
@@ -516,17 +1023,30 @@ def get_models_by_platform_brand(
         )
     )
 
-    total = base_query.count()
-    if total == 0:
+    if cursor or page == 1:
+        rows, next_cursor = keyset_page(base_query, TVPlatformLatest, "asc", page_size, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        rows = (
+            base_query
+            .order_by(*keyset_order(TVPlatformLatest, "asc"))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+
+    if not rows and not cursor and page == 1:
         raise HTTPException(status_code=404, detail="No models found")
 
-    return (
-        base_query
-        .order_by(TVPlatformLatest.sale_price.asc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    if include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(cached_value(
+            "platform_brand_models_total",
+            {"platform": platform, "brand": brand},
+            base_query.count
+        ))
+
+    return rows
 
 
 # ======================================================
@@ -534,6 +1054,7 @@ def get_models_by_platform_brand(
 # ======================================================
 
 @app.get("/filters/brands")
+@cached_response()
 def get_all_brands(db: Session = Depends(get_db)):
     result = db.execute(text("""
         SELECT DISTINCT brand, COUNT(*) as count
@@ -546,6 +1067,7 @@ def get_all_brands(db: Session = Depends(get_db)):
 
 
 @app.get("/filters/price-range")
+@cached_response()
 def get_price_range(db: Session = Depends(get_db)):
     result = db.execute(text("""
         SELECT MIN(sale_price) as min_price, MAX(sale_price) as max_price
@@ -560,6 +1082,30 @@ def get_price_range(db: Session = Depends(get_db)):
 # PRICE HISTORY CHART ENDPOINTS
 # ======================================================
 
+def get_daily_prices(db: Session, model_id: str, start_date: date, end_date: date):
+    """Daily lowest price per platform from the price_daily rollup"""
+    return db.execute(text("""
+        SELECT platform, price_date, min_price
+        FROM price_daily
+        WHERE model_id = :model_id
+            AND price_date BETWEEN :start_date AND :end_date
+        ORDER BY price_date, min_price
+    """), {
+        "model_id": model_id,
+        "start_date": start_date,
+        "end_date": end_date
+    }).fetchall()
+
+
+def get_product_info(db: Session, model_id: str):
+    return db.execute(text("""
+        SELECT full_name, brand, image_url
+        FROM tv_platform_latest_master
+        WHERE model_id = :model_id
+        LIMIT 1
+    """), {"model_id": model_id}).fetchone()
+
+
 @app.get("/products/{model_id}/charts/price-history")
 def get_price_history_chart(
     model_id: str,
@@ -579,27 +1125,7 @@ def get_price_history_chart(
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
 
-        result = db.execute(text("""
-            SELECT 
-                platform,
-                DATE(scraped_at) as price_date,
-                MIN(sale_price) as min_price,
-                MIN(full_name) as full_name,
-                MIN(brand) as brand
-            FROM tv_platform_latest_master
-            WHERE model_id = :model_id
-                AND sale_price > 0
-                AND DATE(scraped_at) >= :start_date
-                AND DATE(scraped_at) <= :end_date
-            GROUP BY platform, DATE(scraped_at)
-            ORDER BY price_date
-        """), {
-            "model_id": model_id,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-
-        rows = result.fetchall()
+        rows = get_daily_prices(db, model_id, start_date, end_date)
 
         if not rows:
             empty_chart = create_empty_chart(f"No price history for last {days} days")
@@ -614,8 +1140,18 @@ def get_price_history_chart(
                 }
             }
 
-        data = [dict(row._mapping) for row in rows]
-        product_name = data[0].get('full_name', model_id)
+        info = get_product_info(db, model_id)
+        data = [
+            {
+                "platform": row.platform,
+                "price_date": row.price_date,
+                "min_price": row.min_price,
+                "full_name": info.full_name if info else None,
+                "brand": info.brand if info else None
+            }
+            for row in rows
+        ]
+        product_name = data[0].get('full_name') or model_id
 
         return {
             "model_id": model_id,
@@ -650,26 +1186,7 @@ def get_best_price_chart(
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
 
-        result = db.execute(text("""
-            SELECT 
-                platform,
-                DATE(scraped_at) as price_date,
-                MIN(sale_price) as min_price,
-                MIN(full_name) as full_name
-            FROM tv_platform_latest_master
-            WHERE model_id = :model_id
-                AND sale_price > 0
-                AND DATE(scraped_at) >= :start_date
-                AND DATE(scraped_at) <= :end_date
-            GROUP BY platform, DATE(scraped_at)
-            ORDER BY price_date, min_price
-        """), {
-            "model_id": model_id,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-
-        rows = result.fetchall()
+        rows = get_daily_prices(db, model_id, start_date, end_date)
         print(f"[DEBUG] Best price - Found {len(rows)} rows for model_id: {model_id}")
 
         if not rows:
@@ -682,15 +1199,14 @@ def get_best_price_chart(
             }
 
         date_prices = {}
-        product_name = None
+        info = get_product_info(db, model_id)
+        product_name = info.full_name if info else None
 
         for row in rows:
             price_date = row.price_date
             if price_date not in date_prices:
                 date_prices[price_date] = {}
             date_prices[price_date][row.platform] = float(row.min_price)
-            if not product_name:
-                product_name = row.full_name
 
         best_price_data = []
         for price_date in sorted(date_prices.keys()):
@@ -783,10 +1299,13 @@ def debug_check_data(model_id: str, db: Session = Depends(get_db)):
 # ======================================================
 
 @app.get("/analytics/statistics")
+@cached_response()
 def get_best_statistics(db: Session = Depends(get_db)):
     try:
+        table, statistics_rows = statistics_source()
+
         # -------------------- OVERALL KPIs --------------------
-        overall = db.execute(text("""
+        overall = db.execute(text(f"""
             SELECT 
                 COUNT(*) as total_tvs,
                 ROUND(AVG(sale_price), 2) as avg_sale_price,
@@ -794,8 +1313,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 ROUND(AVG(rating), 2) as avg_rating,
                 MIN(sale_price) as min_sale_price,
                 MAX(sale_price) as max_sale_price
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
         """)).fetchone()
 
         overall_stats = {
@@ -808,7 +1327,7 @@ def get_best_statistics(db: Session = Depends(get_db)):
         }
 
         # -------------------- BEST VALUE TVs --------------------
-        best_value = db.execute(text("""
+        best_value = db.execute(text(f"""
             SELECT 
                 model_id,
                 MIN(full_name) as full_name,
@@ -819,8 +1338,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 MAX(discount) as discount,
                 ROUND(AVG(rating), 2) as rating,
                 ROUND((MAX(discount)*0.6 + (AVG(rating)*10)*0.4), 2) as value_score
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY model_id
             ORDER BY value_score DESC
             LIMIT 10
@@ -829,15 +1348,15 @@ def get_best_statistics(db: Session = Depends(get_db)):
         top_best_value_tvs = [dict(row._mapping) for row in best_value]
 
         # -------------------- BRAND STATS --------------------
-        brand_stats = db.execute(text("""
+        brand_stats = db.execute(text(f"""
             SELECT
                 brand,
                 COUNT(DISTINCT model_id) as total_models,
                 ROUND(AVG(sale_price), 2) as avg_price,
                 ROUND(AVG(discount), 2) as avg_discount,
                 ROUND(AVG(rating), 2) as avg_rating
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY brand
             ORDER BY avg_rating DESC
             LIMIT 20
@@ -861,7 +1380,7 @@ def get_best_statistics(db: Session = Depends(get_db)):
         platform_stats = [dict(row._mapping) for row in platform_stats]
 
         # -------------------- PRICE SEGMENTS --------------------
-        segment_stats = db.execute(text("""
+        segment_stats = db.execute(text(f"""
             SELECT 
                 CASE
                     WHEN sale_price BETWEEN 1 AND 25000 THEN 'Budget'
@@ -872,8 +1391,8 @@ def get_best_statistics(db: Session = Depends(get_db)):
                 COUNT(*) as total_tvs,
                 ROUND(AVG(discount), 2) as avg_discount,
                 ROUND(AVG(rating), 2) as avg_rating
-            FROM tv_platform_latest_master
-            WHERE sale_price > 0 AND original_cost > 0
+            FROM {table}
+            WHERE {statistics_rows}
             GROUP BY segment
             ORDER BY total_tvs DESC
         """)).fetchall()
@@ -904,26 +1423,21 @@ def get_price_history_data(
     days: int = Query(30, ge=7, le=365),
     db: Session = Depends(get_db)
 ):
-    """Return price history data from tvs_unified table"""
+    """Return price history data from the price_daily rollup"""
     try:
         # First, get the date range from the actual data (not today's date)
         date_range_result = db.execute(text("""
             SELECT 
-                MIN(DATE(scraped_at)) as min_date,
-                MAX(DATE(scraped_at)) as max_date
-            FROM tvs_unified
-            WHERE model_id = :model_id AND sale_price > 0
+                MIN(price_date) as min_date,
+                MAX(price_date) as max_date
+            FROM price_daily
+            WHERE model_id = :model_id
         """), {"model_id": model_id}).fetchone()
         
+        product_info = get_product_info(db, model_id)
+
         if not date_range_result or not date_range_result.max_date:
             # No data found
-            product_info = db.execute(text("""
-                SELECT full_name, brand, image_url 
-                FROM tv_platform_latest_master 
-                WHERE model_id = :model_id 
-                LIMIT 1
-            """), {"model_id": model_id}).fetchone()
-            
             return {
                 "model_id": model_id,
                 "product_name": product_info.full_name if product_info else None,
@@ -942,28 +1456,7 @@ def get_price_history_data(
         start_date = end_date - timedelta(days=days)
         
         # Query all price history data
-        result = db.execute(text("""
-            SELECT 
-                platform,
-                DATE(scraped_at) as price_date,
-                MIN(sale_price) as price,
-                MIN(full_name) as full_name,
-                MIN(brand) as brand,
-                MIN(image_url) as image_url
-            FROM tvs_unified
-            WHERE model_id = :model_id
-                AND sale_price > 0
-                AND DATE(scraped_at) >= :start_date
-                AND DATE(scraped_at) <= :end_date
-            GROUP BY platform, DATE(scraped_at)
-            ORDER BY price_date ASC
-        """), {
-            "model_id": model_id, 
-            "start_date": start_date,
-            "end_date": end_date
-        })
-        
-        rows = result.fetchall()
+        rows = get_daily_prices(db, model_id, start_date, end_date)
         
         if not rows:
             return {
@@ -979,19 +1472,14 @@ def get_price_history_data(
         
         # Group by platform
         platforms_data = {}
-        product_name = None
-        brand = None
-        image_url = None
+        product_name = product_info.full_name if product_info else None
+        brand = product_info.brand if product_info else None
+        image_url = product_info.image_url if product_info else None
         all_prices = []
         
         for row in rows:
-            if not product_name:
-                product_name = row.full_name
-                brand = row.brand
-                image_url = row.image_url
-            
             platform = row.platform
-            price = float(row.price)
+            price = float(row.min_price)
             date_str = str(row.price_date)
             all_prices.append({"price": price, "date": date_str, "platform": platform})
             
@@ -1077,8 +1565,67 @@ def get_price_history_data(
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-        
-        
+
+
+# ======================================================
+# PRICE CHANGE EVENTS (price_events, maintained by ETL)
+# ======================================================
+
+@app.get("/products/{model_id}/price-events")
+def get_price_events(
+    model_id: str,
+    at: Optional[datetime] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    platform: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Price/stock intervals of a model.
+    - at: the state of every listing at that moment (as-of lookup)
+    - start/end: every interval overlapping that range
+    """
+    params = {"model_id": model_id}
+    conditions = ["model_id = :model_id"]
+
+    if at is not None:
+        conditions.append("valid_from <= :at AND (valid_to IS NULL OR valid_to > :at)")
+        params["at"] = at
+    else:
+        if end is not None:
+            conditions.append("valid_from <= :end")
+            params["end"] = end
+        if start is not None:
+            conditions.append("(valid_to IS NULL OR valid_to > :start)")
+            params["start"] = start
+
+    if platform:
+        conditions.append("platform = :platform")
+        params["platform"] = platform.lower()
+
+    rows = db.execute(text(f"""
+        SELECT platform, valid_from, valid_to, last_seen_at, sale_price, stock_status
+        FROM price_events
+        WHERE {" AND ".join(conditions)}
+        ORDER BY platform, valid_from
+    """), params).fetchall()
+
+    return {
+        "model_id": model_id,
+        "events": [
+            {
+                "platform": row.platform,
+                "valid_from": row.valid_from.isoformat(),
+                "valid_to": row.valid_to.isoformat() if row.valid_to else None,
+                "last_seen_at": row.last_seen_at.isoformat(),
+                "price": float(row.sale_price) if row.sale_price is not None else None,
+                "stock_status": row.stock_status
+            }
+            for row in rows
+        ]
+    }
+
+
 # ======================================================
 # DEBUG ENDPOINTS
 # ======================================================
@@ -1191,14 +1738,20 @@ def debug_tvs_unified(model_id: str, db: Session = Depends(get_db)):
 
 @app.get("/admin/stats")
 async def admin_stats(
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """Admin-only statistics"""
-    total_users = db.query(User).count()
-    active_sessions = db.query(RefreshSession).filter(
-        RefreshSession.is_revoked == False
-    ).count()
+    async def count_users(session):
+        return await session.scalar(select(func.count()).select_from(User))
+
+    async def count_active_sessions(session):
+        return await session.scalar(
+            select(func.count()).select_from(RefreshSession).where(
+                RefreshSession.is_revoked == False
+            )
+        )
+
+    total_users, active_sessions = await run_concurrently(count_users, count_active_sessions)
 
     return {
         "total_users": total_users,
@@ -1207,6 +1760,12 @@ async def admin_stats(
     }
 
 
+@app.get("/admin/cache")
+async def admin_cache_stats(current_user: User = Depends(require_admin)):
+    """Response cache size, hit rate and the data version it is keyed on"""
+    return cache_stats()
+
+
 # ======================================================
 # RUN SERVER
 # ======================================================
@@ -176,6 +176,35 @@ class TVPlatformLatest(Base):
     product_url = Column(String(500))
     rating = Column(Float)
     image_url = Column("image_url", String(500))
+    screen_resolution = Column(String(100))
+
+
+class TVPlatformLatestClean(Base):
+    """
+    tv_platform_latest_master rows with valid prices, discount and
+    rating, published by the ETL clean_latest stage.
+
+    Left out of create_all: an empty table created at startup would
+    hide the master table fallback (listing_source.py).
+    """
+    __tablename__ = "tv_platform_latest_clean"
+    __table_args__ = {"info": {"published_by_etl": True}}
+
+    platform = Column(String(50), primary_key=True)
+    model_id = Column(String(100), primary_key=True)
+    brand = Column(String(100))
+    full_name = Column(String(255))
+    display_type = Column(String(50))
+    sale_price = Column(Float)
+    original_cost = Column(Float)
+    discount = Column(Float)
+    stock_status = Column(String(50))
+    scraped_at = Column(DateTime)
+    product_url = Column(String(500))
+    rating = Column(Float)
+    image_url = Column("image_url", String(500))
+    screen_resolution = Column(String(100))
+    is_outlier = Column(Boolean, default=False)
 
 
 class TVProductMaster(Base):
@@ -260,4 +289,11 @@ class AlertNotification(Base):
     alert = relationship("PriceAlert", back_populates="notifications")
 
     def __repr__(self):
-        return f"<AlertNotification(alert_id={self.alert_id}, price={self.triggered_price})>"
\ No newline at end of file
+        return f"<AlertNotification(alert_id={self.alert_id}, price={self.triggered_price})>"
+
+def api_tables():
+    """Tables created at startup; the ETL creates the ones it publishes"""
+    return [
+        table for table in Base.metadata.sorted_tables
+        if not table.info.get("published_by_etl")
+    ]
@@ -0,0 +1,93 @@
+"""
+Keyset (cursor) pagination over (sale_price, platform, model_id)
+
+A cursor is the opaque, URL-safe encoding of the last row of a page:
+
+    [order, sale_price, platform, model_id]
+
+The next page is read with a range condition on the index
+(sale_price, platform, model_id) that starts right after that row, so
+page N costs the same as page 1, unlike OFFSET which reads and throws
+away every earlier row. The order includes the unique
+(platform, model_id) pair, so rows never repeat or go missing between
+pages.
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_key(order, sale_price, platform, model_id):
+    raw = json.dumps([order, sale_price, platform, model_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def encode_cursor(order, row):
+    return encode_key(order, row.sale_price, row.platform, row.model_id)
+
+
+def decode_cursor(cursor, order):
+    """(sale_price, platform, model_id) from a cursor, 400 if invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, sale_price, platform, model_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        sale_price = float(sale_price)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor_order != order:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+
+    return sale_price, str(platform), str(model_id)
+
+
+def keyset_order(model, order):
+    columns = [model.sale_price, model.platform, model.model_id]
+    return [c.desc() for c in columns] if order == "desc" else [c.asc() for c in columns]
+
+
+def keyset_after(model, order, key):
+    """Rows strictly after key in keyset_order, written as a range the index can use"""
+    sale_price, platform, model_id = key
+
+    if order == "desc":
+        return or_(
+            model.sale_price < sale_price,
+            and_(model.sale_price == sale_price, or_(
+                model.platform < platform,
+                and_(model.platform == platform, model.model_id < model_id)
+            ))
+        )
+
+    return or_(
+        model.sale_price > sale_price,
+        and_(model.sale_price == sale_price, or_(
+            model.platform > platform,
+            and_(model.platform == platform, model.model_id > model_id)
+        ))
+    )
+
+
+def keyset_page(query, model, order, page_size, cursor=None):
+    """
+    One page of query in keyset order.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(keyset_after(model, order, decode_cursor(cursor, order)))
+
+    rows = query.order_by(*keyset_order(model, order)).limit(page_size + 1).all()
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(order, rows[-1])
+
+    return rows, None
@@ -0,0 +1,345 @@
+"""
+Response cache for read-only catalog endpoints
+
+Responses are cached as encoded JSON under a key built from:
+    route handler + normalized query/path parameters + data version
+
+The data version is a counter the ETL increments every time it
+publishes a table (Scrapers/etl/data_version.py). A new version makes
+every older key unreachable, so invalidation is exact and entries
+never have to be deleted by hand; old ones simply age out of the LRU.
+
+Backends:
+    in-process LRU  - always on, bounded by entry count, total bytes and TTL
+    Redis           - optional, shared by all uvicorn workers when
+                      CACHE_REDIS_URL is set and the redis package is installed
+
+Usage:
+    @app.get("/filters/brands")
+    @cached_response(ttl=600)
+    def get_all_brands(db: Session = Depends(get_db)):
+        ...
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import engine
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+CACHE_DEFAULT_TTL = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_MB", "64")) * 1024 * 1024
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+# How long a data version read from the database is trusted before it
+# is read again (one tiny primary key lookup)
+VERSION_CHECK_SECONDS = float(os.getenv("DATA_VERSION_CHECK_SECONDS", "1"))
+
+DATA_VERSION_TABLE = "etl_data_version"
+KEY_PREFIX = "offerzone:response:"
+
+
+# ======================================================
+# DATA VERSION
+# ======================================================
+
+_version_lock = threading.Lock()
+_version = {"value": 0, "published_at": None, "checked_at": 0.0}
+
+
+def _refresh_version():
+    now = time.monotonic()
+
+    if now - _version["checked_at"] < VERSION_CHECK_SECONDS:
+        return _version
+
+    with _version_lock:
+        if now - _version["checked_at"] < VERSION_CHECK_SECONDS:
+            return _version
+
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(
+                    text(f"SELECT version, published_at FROM {DATA_VERSION_TABLE} WHERE id = 1")
+                ).fetchone()
+        except SQLAlchemyError:
+            # Keep the last known version (0 before the table exists):
+            # falling back to 0 would serve entries cached for it
+            _version["checked_at"] = now
+            return _version
+
+        _version["value"] = int(row.version) if row else 0
+        _version["published_at"] = row.published_at if row else None
+        _version["checked_at"] = now
+
+        return _version
+
+
+def get_data_version():
+    """Current ETL data version (0 until the ETL has published once)"""
+    return _refresh_version()["value"]
+
+
+def get_data_published_at():
+    """When the current data version was published (None if never)"""
+    return _refresh_version()["published_at"]
+
+
+# ======================================================
+# BACKENDS
+# ======================================================
+
+class LRUCache:
+    """Thread-safe LRU of bytes values with a TTL, entry and byte bounds"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl):
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._bytes += len(value)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class RedisCache:
+    """Shared cache in Redis, in front of which the local LRU still sits"""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        try:
+            return self.client.get(key)
+        except redis.RedisError:
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(key, value, ex=ttl)
+        except redis.RedisError:
+            pass
+
+    def stats(self):
+        try:
+            keys = sum(1 for _ in self.client.scan_iter(f"{KEY_PREFIX}*", count=1000))
+        except redis.RedisError as e:
+            return {"backend": "redis", "error": str(e)}
+        return {"backend": "redis", "entries": keys}
+
+
+local_cache = LRUCache()
+shared_cache = RedisCache(CACHE_REDIS_URL) if CACHE_REDIS_URL and redis else None
+
+if CACHE_REDIS_URL and redis is None:
+    print("CACHE_REDIS_URL is set but the redis package is not installed, using memory only")
+
+
+def cache_get(key):
+    value = local_cache.get(key)
+
+    if value is None and shared_cache is not None:
+        value = shared_cache.get(key)
+        if value is not None:
+            local_cache.set(key, value, CACHE_DEFAULT_TTL)
+
+    return value
+
+
+def cache_set(key, value, ttl):
+    local_cache.set(key, value, ttl)
+
+    if shared_cache is not None:
+        shared_cache.set(key, value, ttl)
+
+
+def cache_stats():
+    stats = {"data_version": get_data_version(), "local": local_cache.stats()}
+    if shared_cache is not None:
+        stats["shared"] = shared_cache.stats()
+    return stats
+
+
+# ======================================================
+# KEYS
+# ======================================================
+
+def normalize_params(params):
+    """
+    Query/path parameters in a canonical order, values as stripped
+    strings. Parameters left at None are dropped.
+    """
+    return sorted(
+        (name, str(value).strip())
+        for name, value in params.items()
+        if value is not None
+    )
+
+
+def cache_key(route, params, version):
+    raw = json.dumps([route, normalize_params(params), version], separators=(",", ":"))
+    return KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cached_value(name, params, builder, ttl=CACHE_DEFAULT_TTL):
+    """
+    JSON-serializable value of builder() cached under name + params for
+    the current data version, e.g. row counts reported as page totals.
+    """
+    key = cache_key(name, params, get_data_version())
+
+    body = cache_get(key)
+    if body is not None:
+        return json.loads(body)
+
+    value = builder()
+    cache_set(key, json.dumps(value, separators=(",", ":")).encode(), ttl)
+
+    return value
+
+
+# ======================================================
+# DECORATOR
+# ======================================================
+
+def _is_cacheable_param(parameter):
+    """Only plain values identify a response; sessions and users do not"""
+    return parameter.annotation in (str, int, float, bool) or (
+        getattr(parameter.annotation, "__origin__", None) is not None
+        and all(arg in (str, int, float, bool, type(None))
+                for arg in getattr(parameter.annotation, "__args__", ()))
+    )
+
+
+def cached_response(ttl=CACHE_DEFAULT_TTL, model=None):
+    """
+    Cache the JSON response of a sync route handler.
+
+    model: the route's response_model, if any. Cached responses bypass
+    FastAPI's response_model serialization, so the handler result is
+    serialized with it here before it is stored.
+    """
+    adapter = TypeAdapter(model) if model is not None else None
+
+    def decorator(handler):
+        signature = inspect.signature(handler)
+        key_params = [
+            name for name, parameter in signature.parameters.items()
+            if _is_cacheable_param(parameter)
+        ]
+        route = f"{handler.__module__}.{handler.__qualname__}"
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED:
+                return handler(*args, **kwargs)
+
+            bound = signature.bind_partial(*args, **kwargs)
+            params = {name: bound.arguments.get(name) for name in key_params}
+            key = cache_key(route, params, get_data_version())
+
+            body = cache_get(key)
+            if body is not None:
+                return Response(
+                    content=body,
+                    media_type="application/json",
+                    headers={"X-Cache": "HIT"}
+                )
+
+            result = handler(*args, **kwargs)
+
+            if isinstance(result, Response):
+                return result
+
+            if adapter is not None:
+                content = adapter.dump_python(
+                    adapter.validate_python(result, from_attributes=True),
+                    mode="json"
+                )
+            else:
+                content = jsonable_encoder(result)
+
+            body = json.dumps(content, separators=(",", ":")).encode()
+            cache_set(key, body, ttl)
+
+            return Response(
+                content=body,
+                media_type="application/json",
+                headers={"X-Cache": "MISS"}
+            )
+
+        return wrapper
+
+    return decorator
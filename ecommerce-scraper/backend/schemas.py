@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 # ============================
@@ -53,4 +53,44 @@ class PlatformAnalyticsOut(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         protected_namespaces=()  # ✅ ADDED
-    )
\ No newline at end of file
+    )
+
+
+# ============================
+# SEARCH SUGGESTIONS
+# ============================
+class SuggestionOut(BaseModel):
+    text: str
+    kind: str
+    listings: int
+    wishlists: int
+
+
+# ============================
+# SPELLING CORRECTIONS
+# ============================
+class TermCorrectionOut(BaseModel):
+    term: str
+    distance: int
+    count: int
+
+
+class DidYouMeanOut(BaseModel):
+    query: str
+    corrected: Optional[str] = None
+    suggestions: Dict[str, List[TermCorrectionOut]]
+
+
+# ============================
+# FACETED SEARCH
+# ============================
+class FacetValueOut(BaseModel):
+    value: str
+    count: int
+
+
+class FacetedProductsOut(BaseModel):
+    items: List[TVProductOut]
+    total: int
+    next_cursor: Optional[str] = None
+    facets: Dict[str, List[FacetValueOut]]
@@ -0,0 +1,279 @@
+"""
+Inverted-index product search with BM25 ranking
+
+Built from the catalog snapshot each time it is (re)loaded:
+
+    postings    term -> (doc ids, precomputed BM25 weight per doc),
+                merged over the searched fields with field boosts
+    vocabulary  sorted array of all terms, for prefix expansion of
+                query terms that are not whole words ("sams" -> samsung)
+    n-grams     character trigrams of model codes (model_id and the
+                code-like tokens of titles), so partial codes such as
+                "ur75" find 43UR7500PSC
+
+A query only touches the postings of its own terms, so its cost grows
+with the number of matching documents rather than the catalog size.
+
+Scoring (BM25F-style, k1 = 1.2, b = 0.75):
+    score(doc) = sum over query terms t:
+                 idf(t) * sum over fields f:
+                     boost(f) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len))
+
+Documents matching more query terms rank above documents matching
+fewer; ties are broken by lower price.
+
+Query terms that match nothing can be corrected to the closest
+vocabulary term or model code (fuzzy_index.py), for "did you mean".
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from fuzzy_index import FuzzyIndex
+
+FIELD_BOOSTS = {
+    "model_id": 3.0,
+    "brand": 2.0,
+    "display_type": 1.5,
+    "full_name": 1.0,
+}
+
+K1 = 1.2
+B = 0.75
+
+NGRAM_SIZE = 3
+NGRAM_WEIGHT = 2.0
+
+# Above one match per DENSE_RATIO documents, scores are accumulated in
+# a dense array instead of over the sorted unique matches
+DENSE_RATIO = 8
+
+# Query terms that are not whole words expand to at most this many
+# vocabulary terms starting with them
+MAX_PREFIX_EXPANSIONS = 20
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(value):
+    return TOKEN_RE.findall(value.lower())
+
+
+def normalize_code(value):
+    """Model code without case or separators: 43UR-7500.PSC -> 43ur7500psc"""
+    return "".join(TOKEN_RE.findall(value.lower()))
+
+
+def is_code(token):
+    """Tokens mixing letters and digits are treated as model codes"""
+    return len(token) >= NGRAM_SIZE and any(c.isdigit() for c in token) and any(c.isalpha() for c in token)
+
+
+def ngrams(value):
+    return {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+
+    def __init__(self, fields, prices):
+        """
+        fields: {field name: array of strings}, one entry per document
+        prices: float array, used to break score ties
+        """
+        self.size = len(prices)
+        self.prices = prices
+
+        term_weights = defaultdict(Counter)
+        document_frequency = Counter()
+        codes = [set() for _ in range(self.size)]
+
+        for field, boost in FIELD_BOOSTS.items():
+            tokens = [tokenize(value) for value in fields[field]]
+            lengths = np.array([len(t) for t in tokens], dtype="float64")
+            avg_length = lengths.mean() if self.size and lengths.mean() > 0 else 1.0
+
+            for doc, doc_tokens in enumerate(tokens):
+                norm = K1 * (1 - B + B * lengths[doc] / avg_length)
+
+                for term, tf in Counter(doc_tokens).items():
+                    term_weights[term][doc] += boost * tf * (K1 + 1) / (tf + norm)
+
+                    if field in ("model_id", "full_name") and is_code(term):
+                        codes[doc].add(term)
+
+            if field == "model_id":
+                for doc, value in enumerate(fields[field]):
+                    code = normalize_code(value)
+                    if len(code) >= NGRAM_SIZE:
+                        codes[doc].add(code)
+
+        for term, weights in term_weights.items():
+            document_frequency[term] = len(weights)
+
+        self.postings = {}
+        for term, weights in term_weights.items():
+            docs = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+            values = np.fromiter(weights.values(), dtype="float64", count=len(weights))
+            self.postings[term] = (docs, values * self.idf(document_frequency[term]))
+
+        self.vocabulary = np.array(sorted(self.postings), dtype=str)
+
+        # Trigram postings over model codes, and the codes themselves
+        # so candidate documents can be verified with a substring check
+        grams = defaultdict(set)
+        for doc, doc_codes in enumerate(codes):
+            for code in doc_codes:
+                for gram in ngrams(code):
+                    grams[gram].add(doc)
+
+        self.ngram_postings = {
+            gram: np.fromiter(sorted(docs), dtype=np.int64, count=len(docs))
+            for gram, docs in grams.items()
+        }
+        self.codes = np.array(["\x1f".join(sorted(c)) for c in codes], dtype=str)
+
+        code_counts = Counter(code for doc_codes in codes for code in doc_codes)
+        self.fuzzy = FuzzyIndex(document_frequency, code_counts)
+
+    def idf(self, df):
+        return math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+    # ------------------------------------------------------
+    # Term lookup
+    # ------------------------------------------------------
+
+    def prefix_terms(self, prefix):
+        start = np.searchsorted(self.vocabulary, prefix, side="left")
+        end = np.searchsorted(self.vocabulary, prefix + "\uffff", side="left")
+        return self.vocabulary[start:min(end, start + MAX_PREFIX_EXPANSIONS)]
+
+    def code_matches(self, term):
+        """(docs, weights) of documents whose model codes contain term"""
+        candidates = None
+        for gram in ngrams(term):
+            docs = self.ngram_postings.get(gram)
+            if docs is None:
+                return None
+            candidates = docs if candidates is None else np.intersect1d(candidates, docs, assume_unique=True)
+            if len(candidates) == 0:
+                return None
+
+        docs = candidates[np.char.find(self.codes[candidates], term) >= 0]
+        if len(docs) == 0:
+            return None
+
+        return docs, np.full(len(docs), NGRAM_WEIGHT * self.idf(len(docs)))
+
+    def term_matches(self, term):
+        """
+        (docs, weights) for one query term: the exact term, else the
+        vocabulary terms it prefixes, plus model codes containing it.
+        """
+        parts = []
+
+        if term in self.postings:
+            parts.append(self.postings[term])
+        else:
+            for expanded in self.prefix_terms(term):
+                docs, weights = self.postings[expanded]
+                # Expansions count for less than an exact match
+                parts.append((docs, weights * len(term) / len(expanded)))
+
+        if len(term) >= NGRAM_SIZE and (is_code(term) or not parts):
+            code = self.code_matches(term)
+            if code is not None:
+                parts.append(code)
+
+        return parts
+
+    # ------------------------------------------------------
+    # Spelling
+    # ------------------------------------------------------
+
+    def corrections(self, query, limit=5):
+        """
+        {term: [(correction, distance, document count)]} for the query
+        terms that match nothing
+        """
+        return {
+            term: self.fuzzy.lookup(term, limit=limit)
+            for term in dict.fromkeys(tokenize(query))
+            if not self.term_matches(term)
+        }
+
+    def correct(self, query):
+        """query with unmatched terms replaced by their best correction, None if unchanged"""
+        corrected, changed = [], False
+
+        for term in tokenize(query):
+            replacement = None if self.term_matches(term) else self.fuzzy.correct(term)
+            corrected.append(replacement or term)
+            changed = changed or replacement is not None
+
+        return " ".join(corrected) if changed else None
+
+    # ------------------------------------------------------
+    # Query
+    # ------------------------------------------------------
+
+    def search(self, query, limit=50, mask=None):
+        """
+        Positions of the best `limit` documents for query, best first.
+        mask: optional boolean array of documents allowed by filters.
+
+        Scores are summed with bincount over the matching postings; only
+        queries matching a large share of the catalog use a dense array.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        empty = np.array([], dtype=np.int64)
+
+        if not terms or self.size == 0:
+            return empty
+
+        docs, weights, term_hits = [], [], []
+        for term in terms:
+            parts = self.term_matches(term)
+            if not parts:
+                continue
+            docs.extend(part[0] for part in parts)
+            weights.extend(part[1] for part in parts)
+            term_hits.append(
+                parts[0][0] if len(parts) == 1
+                else np.unique(np.concatenate([part[0] for part in parts]))
+            )
+
+        if not docs:
+            return empty
+
+        docs = np.concatenate(docs)
+        weights = np.concatenate(weights)
+        term_hits = np.concatenate(term_hits)
+
+        if len(docs) * DENSE_RATIO > self.size:
+            # Many matches: one pass of bincount over the catalog is
+            # cheaper than sorting the matches
+            scores = np.bincount(docs, weights=weights, minlength=self.size)
+            matched_terms = np.bincount(term_hits, minlength=self.size)
+            positions = np.flatnonzero(matched_terms)
+            scores, matched_terms = scores[positions], matched_terms[positions]
+        else:
+            positions, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights)
+            # Each document appears once per matched term in term_hits
+            _, matched_terms = np.unique(term_hits, return_counts=True)
+
+        if mask is not None:
+            allowed = mask[positions]
+            positions, scores, matched_terms = positions[allowed], scores[allowed], matched_terms[allowed]
+
+        if len(positions) > limit:
+            # Documents with more query terms always outrank fewer
+            rank_key = matched_terms * (scores.max() + 1) + scores
+            top = np.argpartition(-rank_key, limit - 1)[:limit]
+            positions, scores, matched_terms = positions[top], scores[top], matched_terms[top]
+
+        ranked = np.lexsort((self.prices[positions], -scores, -matched_terms))
+        return positions[ranked]
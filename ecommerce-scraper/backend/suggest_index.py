@@ -0,0 +1,155 @@
+"""
+Autocomplete for the search bar
+
+Built from the catalog snapshot each time it is (re)loaded. Every
+completion is one entry of a sorted array of lowercase keys:
+
+    brand   "samsung"        -> Samsung
+    model   "43ur7500psc"    -> 43UR7500PSC (model code without separators)
+    term    "qled"           -> a word from product titles
+
+A prefix selects a contiguous range of the array with two binary
+searches, and the best completions of that range are picked with
+argpartition, so a keystroke costs microseconds rather than a scan.
+
+Completions are ranked by popularity:
+
+    weight = listings + WISHLIST_WEIGHT * wishlists
+
+listings is the number of catalog rows the completion appears in and
+wishlists the number of wishlist entries for its models. Wishlist
+counts are read with the snapshot, so they refresh with each reload.
+"""
+
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from search_index import tokenize, normalize_code
+
+WISHLIST_WEIGHT = 2.0
+
+# Title words shorter than this are not offered as completions
+MIN_TERM_LENGTH = 2
+
+# When the same key is a brand, a model code and a title word, the
+# completion is shown as the first of these
+KIND_PRIORITY = ["brand", "model", "term"]
+
+
+class SuggestIndex:
+
+    def __init__(self, brands, model_ids, titles, wishlist_counts=None):
+        """
+        brands, model_ids, titles: arrays of strings, one entry per listing
+        wishlist_counts: {model_id: number of wishlist entries}
+        """
+        wishlist_counts = wishlist_counts or {}
+
+        entries = {kind: {} for kind in KIND_PRIORITY}
+        listings = {kind: Counter() for kind in KIND_PRIORITY}
+        models = {kind: defaultdict(set) for kind in KIND_PRIORITY}
+
+        def add(kind, key, label, model_id):
+            entries[kind].setdefault(key, label)
+            listings[kind][key] += 1
+            models[kind][key].add(model_id)
+
+        for brand, model_id, title in zip(brands, model_ids, titles):
+            brand, model_id, title = str(brand), str(model_id), str(title)
+
+            if brand:
+                add("brand", brand.lower(), brand, model_id)
+
+            code = normalize_code(model_id)
+            if code:
+                add("model", code, model_id, model_id)
+
+            for term in set(tokenize(title)):
+                if len(term) >= MIN_TERM_LENGTH:
+                    add("term", term, term, model_id)
+
+        keys, labels, kinds, listing_counts, wishlist_totals = [], [], [], [], []
+        seen = set()
+
+        for kind in KIND_PRIORITY:
+            for key, label in entries[kind].items():
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                keys.append(key)
+                labels.append(label)
+                kinds.append(kind)
+                listing_counts.append(listings[kind][key])
+                wishlist_totals.append(sum(wishlist_counts.get(m, 0) for m in models[kind][key]))
+
+        order = np.argsort(np.array(keys, dtype=str), kind="stable")
+
+        self.keys = np.array(keys, dtype=str)[order]
+        self.labels = np.array(labels, dtype=object)[order]
+        self.kinds = np.array(kinds, dtype=object)[order]
+        self.listings = np.array(listing_counts, dtype=np.int64)[order]
+        self.wishlists = np.array(wishlist_totals, dtype=np.int64)[order]
+        self.weights = self.listings + WISHLIST_WEIGHT * self.wishlists
+
+    def prefix_range(self, prefix):
+        start = np.searchsorted(self.keys, prefix, side="left")
+        end = np.searchsorted(self.keys, prefix + "\uffff", side="left")
+        return start, end
+
+    def top(self, positions, limit):
+        """positions ordered by weight (desc), then key, at most limit of them"""
+        if len(positions) > limit:
+            positions = positions[np.argpartition(-self.weights[positions], limit - 1)[:limit]]
+
+        return positions[np.lexsort((self.keys[positions], -self.weights[positions]))]
+
+    def completions(self, prefix, limit):
+        start, end = self.prefix_range(prefix)
+        return self.top(np.arange(start, end), limit)
+
+    def code_completions(self, code, limit):
+        """Model codes starting with code, ignoring separators ("43ur-75")"""
+        start, end = self.prefix_range(code)
+        positions = np.arange(start, end)
+        return self.top(positions[self.kinds[positions] == "model"], limit)
+
+    def suggest(self, query, limit=8):
+        """
+        Best completions of query as dicts (text, kind, listings, wishlists).
+
+        The last word is completed; earlier words are kept as typed, so
+        "55 inch sams" suggests "55 inch Samsung". A query that spells
+        a model code with separators also completes to the model code.
+        """
+        words = tokenize(query)
+        if not words or len(self.keys) == 0:
+            return []
+
+        context = " ".join(words[:-1])
+        candidates = [(context, self.completions(words[-1], limit))]
+
+        if len(words) > 1:
+            candidates.append(("", self.code_completions(normalize_code(query), limit)))
+
+        ranked, seen = [], set()
+
+        for context, positions in candidates:
+            for position in positions:
+                label = self.labels[position]
+                text = f"{context} {label}" if context else label
+
+                if text.lower() in seen:
+                    continue
+                seen.add(text.lower())
+
+                ranked.append((-self.weights[position], len(ranked), {
+                    "text": text,
+                    "kind": self.kinds[position],
+                    "listings": int(self.listings[position]),
+                    "wishlists": int(self.wishlists[position]),
+                }))
+
+        ranked.sort(key=lambda item: item[:2])
+        return [suggestion for _, _, suggestion in ranked[:limit]]
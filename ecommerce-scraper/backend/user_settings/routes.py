@@ -3,11 +3,11 @@ User Settings & Account Management Routes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, func, case, update, delete
 from datetime import datetime, timezone
 
-from db import get_db
+from db import get_async_db, run_concurrently
 from models import User, Wishlist, PriceAlert, RefreshSession, EmailVerificationToken
 from auth.dependencies import get_current_active_user
 from auth.security import SecurityUtils
@@ -16,22 +16,39 @@ from email_service import EmailService
 router = APIRouter(prefix="/settings", tags=["User Settings"])
 
 
+async def alert_counts(db: AsyncSession, user_id: int) -> tuple:
+    """(total, active) price alerts of a user, in one query"""
+    total, active = (await db.execute(
+        select(
+            func.count(),
+            func.sum(case((PriceAlert.is_active == True, 1), else_=0))
+        ).where(PriceAlert.user_id == user_id)
+    )).one()
+    return total, int(active or 0)
+
+
 # ============================================
 # GET USER PROFILE
 # ============================================
 
 @router.get("/profile")
 async def get_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get user profile with stats"""
     
-    wishlist_count = db.query(Wishlist).filter(Wishlist.user_id == current_user.id).count()
-    alert_count = db.query(PriceAlert).filter(PriceAlert.user_id == current_user.id).count()
-    active_alerts = db.query(PriceAlert).filter(
-        and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == True)
-    ).count()
+    async def count_wishlist(session):
+        return await session.scalar(
+            select(func.count()).select_from(Wishlist).where(Wishlist.user_id == current_user.id)
+        )
+    
+    async def count_alerts(session):
+        return await alert_counts(session, current_user.id)
+    
+    wishlist_count, (alert_count, active_alerts) = await run_concurrently(
+        count_wishlist, count_alerts
+    )
     
     return {
         "id": current_user.id,
@@ -56,7 +73,7 @@ async def get_profile(
 @router.patch("/profile")
 async def update_profile(
     name: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update user profile"""
@@ -66,7 +83,7 @@ async def update_profile(
             raise HTTPException(status_code=400, detail="Name must be at least 2 characters")
         current_user.name = name.strip()
     
-    db.commit()
+    await db.commit()
     
     return {"success": True, "message": "Profile updated"}
 
@@ -81,13 +98,13 @@ async def change_password(
     new_password: str,
     confirm_password: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Change user password"""
     
     # Verify current password
-    if not SecurityUtils.verify_password(current_password, current_user.hashed_password):
+    if not await SecurityUtils.verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Validate new password
@@ -98,14 +115,16 @@ async def change_password(
         raise HTTPException(status_code=400, detail="Passwords do not match")
     
     # Update password
-    current_user.hashed_password = SecurityUtils.hash_password(new_password)
+    current_user.hashed_password = await SecurityUtils.hash_password_async(new_password)
     
     # Revoke all other sessions
-    db.query(RefreshSession).filter(
-        RefreshSession.user_id == current_user.id
-    ).update({"is_revoked": True})
+    await db.execute(
+        update(RefreshSession).where(
+            RefreshSession.user_id == current_user.id
+        ).values(is_revoked=True)
+    )
     
-    db.commit()
+    await db.commit()
     
     # Send notification email
     background_tasks.add_task(
@@ -123,18 +142,12 @@ async def change_password(
 
 @router.get("/alert-preferences")
 async def get_alert_preferences(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get user's alert preferences"""
     
-    total_alerts = db.query(PriceAlert).filter(
-        PriceAlert.user_id == current_user.id
-    ).count()
-    
-    active_alerts = db.query(PriceAlert).filter(
-        and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == True)
-    ).count()
+    total_alerts, active_alerts = await alert_counts(db, current_user.id)
     
     return {
         "email_notifications": True,  # Can be stored in user preferences table
@@ -150,16 +163,18 @@ async def get_alert_preferences(
 
 @router.post("/disable-all-alerts")
 async def disable_all_alerts(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Disable all price alerts for user"""
     
-    updated = db.query(PriceAlert).filter(
-        and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == True)
-    ).update({"is_active": False})
+    updated = (await db.execute(
+        update(PriceAlert).where(
+            and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == True)
+        ).values(is_active=False)
+    )).rowcount
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -174,16 +189,18 @@ async def disable_all_alerts(
 
 @router.post("/enable-all-alerts")
 async def enable_all_alerts(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Enable all price alerts for user"""
     
-    updated = db.query(PriceAlert).filter(
-        and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == False)
-    ).update({"is_active": True})
+    updated = (await db.execute(
+        update(PriceAlert).where(
+            and_(PriceAlert.user_id == current_user.id, PriceAlert.is_active == False)
+        ).values(is_active=True)
+    )).rowcount
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -198,16 +215,16 @@ async def enable_all_alerts(
 
 @router.delete("/delete-all-alerts")
 async def delete_all_alerts(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete all price alerts for user"""
     
-    deleted = db.query(PriceAlert).filter(
-        PriceAlert.user_id == current_user.id
-    ).delete()
+    deleted = (await db.execute(
+        delete(PriceAlert).where(PriceAlert.user_id == current_user.id)
+    )).rowcount
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -222,16 +239,16 @@ async def delete_all_alerts(
 
 @router.delete("/clear-wishlist")
 async def clear_wishlist(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Clear all wishlist items"""
     
-    deleted = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id
-    ).delete()
+    deleted = (await db.execute(
+        delete(Wishlist).where(Wishlist.user_id == current_user.id)
+    )).rowcount
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -246,16 +263,23 @@ async def clear_wishlist(
 
 @router.get("/export-data")
 async def export_user_data(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export all user data (GDPR compliance)"""
     
-    # Get wishlist items
-    wishlists = db.query(Wishlist).filter(Wishlist.user_id == current_user.id).all()
+    async def fetch_wishlists(session):
+        return (await session.scalars(
+            select(Wishlist).where(Wishlist.user_id == current_user.id)
+        )).all()
+    
+    async def fetch_alerts(session):
+        return (await session.scalars(
+            select(PriceAlert).where(PriceAlert.user_id == current_user.id)
+        )).all()
     
-    # Get alerts
-    alerts = db.query(PriceAlert).filter(PriceAlert.user_id == current_user.id).all()
+    # Get wishlist items and alerts, together
+    wishlists, alerts = await run_concurrently(fetch_wishlists, fetch_alerts)
     
     return {
         "user": {
@@ -294,7 +318,7 @@ async def export_user_data(
 async def delete_account(
     password: str,
     confirm: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Permanently delete user account"""
@@ -306,12 +330,14 @@ async def delete_account(
         )
     
     # Verify password
-    if not SecurityUtils.verify_password(password, current_user.hashed_password):
+    if not await SecurityUtils.verify_password_async(password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect password")
     
     # Prevent admin self-deletion if only admin
     if current_user.role.value == "admin":
-        admin_count = db.query(User).filter(User.role == "admin").count()
+        admin_count = await db.scalar(
+            select(func.count()).select_from(User).where(User.role == "admin")
+        )
         if admin_count <= 1:
             raise HTTPException(
                 status_code=400,
@@ -319,8 +345,8 @@ async def delete_account(
             )
     
     # Delete user (cascades to wishlists, alerts, sessions)
-    db.delete(current_user)
-    db.commit()
+    await db.delete(current_user)
+    await db.commit()
     
     return {
         "success": True,
@@ -336,7 +362,7 @@ async def delete_account(
 async def unsubscribe(
     token: str = None,
     email: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Unsubscribe from alert emails (can be used without login)"""
     
@@ -348,17 +374,19 @@ async def unsubscribe(
         pass
     
     if email:
-        user = db.query(User).filter(User.email == email.lower()).first()
+        user = await db.scalar(select(User).where(User.email == email.lower()).limit(1))
     
     if not user:
         # Don't reveal if email exists
         return {"success": True, "message": "If the email exists, alerts have been disabled"}
     
     # Disable all alerts
-    db.query(PriceAlert).filter(
-        PriceAlert.user_id == user.id
-    ).update({"is_active": False})
+    await db.execute(
+        update(PriceAlert).where(
+            PriceAlert.user_id == user.id
+        ).values(is_active=False)
+    )
     
-    db.commit()
+    await db.commit()
     
     return {"success": True, "message": "Successfully unsubscribed from price alerts"}
\ No newline at end of file
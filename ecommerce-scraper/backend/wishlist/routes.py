@@ -3,11 +3,11 @@ Wishlist API Routes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import text, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, and_, select, func
 from typing import List
 
-from db import get_db
+from db import get_async_db, run_concurrently
 from models import Wishlist, User
 from auth.dependencies import get_current_active_user, get_current_verified_user
 from .schemas import (
@@ -26,7 +26,7 @@ router = APIRouter(prefix="/wishlist", tags=["Wishlist"])
 
 @router.get("", response_model=WishlistResponse)
 async def get_wishlist(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get user's wishlist with product details"""
@@ -50,7 +50,7 @@ async def get_wishlist(
         ORDER BY w.created_at DESC
     """)
     
-    result = db.execute(query, {"user_id": current_user.id})
+    result = await db.execute(query, {"user_id": current_user.id})
     
     items = []
     for row in result:
@@ -76,18 +76,30 @@ async def get_wishlist(
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def add_to_wishlist(
     item: WishlistItemCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_verified_user)  # Requires verification
 ):
     """Add product to wishlist (requires verified email)"""
     
-    # Check if already in wishlist
-    existing = db.query(Wishlist).filter(
-        and_(
-            Wishlist.user_id == current_user.id,
-            Wishlist.model_id == item.model_id
+    async def find_existing(session):
+        return await session.scalar(
+            select(Wishlist.id).where(
+                and_(
+                    Wishlist.user_id == current_user.id,
+                    Wishlist.model_id == item.model_id
+                )
+            ).limit(1)
         )
-    ).first()
+    
+    async def find_product(session):
+        result = await session.execute(
+            text("SELECT model_id FROM tv_platform_latest_master WHERE model_id = :model_id LIMIT 1"),
+            {"model_id": item.model_id}
+        )
+        return result.fetchone()
+    
+    # Check if already in wishlist and verify product exists, together
+    existing, product_check = await run_concurrently(find_existing, find_product)
     
     if existing:
         raise HTTPException(
@@ -95,12 +107,6 @@ async def add_to_wishlist(
             detail="Product already in wishlist"
         )
     
-    # Verify product exists
-    product_check = db.execute(
-        text("SELECT model_id FROM tv_platform_latest_master WHERE model_id = :model_id LIMIT 1"),
-        {"model_id": item.model_id}
-    ).fetchone()
-    
     if not product_check:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -113,8 +119,8 @@ async def add_to_wishlist(
         model_id=item.model_id
     )
     db.add(wishlist_item)
-    db.commit()
-    db.refresh(wishlist_item)
+    await db.commit()
+    await db.refresh(wishlist_item)
     
     return {
         "success": True,
@@ -130,17 +136,19 @@ async def add_to_wishlist(
 @router.delete("/{model_id}")
 async def remove_from_wishlist(
     model_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Remove product from wishlist"""
     
-    wishlist_item = db.query(Wishlist).filter(
-        and_(
-            Wishlist.user_id == current_user.id,
-            Wishlist.model_id == model_id
-        )
-    ).first()
+    wishlist_item = await db.scalar(
+        select(Wishlist).where(
+            and_(
+                Wishlist.user_id == current_user.id,
+                Wishlist.model_id == model_id
+            )
+        ).limit(1)
+    )
     
     if not wishlist_item:
         raise HTTPException(
@@ -148,8 +156,8 @@ async def remove_from_wishlist(
             detail="Product not in wishlist"
         )
     
-    db.delete(wishlist_item)
-    db.commit()
+    await db.delete(wishlist_item)
+    await db.commit()
     
     return {
         "success": True,
@@ -164,17 +172,19 @@ async def remove_from_wishlist(
 @router.get("/check/{model_id}", response_model=WishlistStatusResponse)
 async def check_wishlist_status(
     model_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Check if product is in user's wishlist"""
     
-    wishlist_item = db.query(Wishlist).filter(
-        and_(
-            Wishlist.user_id == current_user.id,
-            Wishlist.model_id == model_id
-        )
-    ).first()
+    wishlist_item = await db.scalar(
+        select(Wishlist).where(
+            and_(
+                Wishlist.user_id == current_user.id,
+                Wishlist.model_id == model_id
+            )
+        ).limit(1)
+    )
     
     return WishlistStatusResponse(
         in_wishlist=wishlist_item is not None,
@@ -189,7 +199,7 @@ async def check_wishlist_status(
 @router.post("/check-bulk")
 async def check_wishlist_bulk(
     model_ids: List[str],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Check wishlist status for multiple products"""
@@ -200,14 +210,16 @@ async def check_wishlist_bulk(
             detail="Maximum 100 products per request"
         )
     
-    wishlist_items = db.query(Wishlist).filter(
-        and_(
-            Wishlist.user_id == current_user.id,
-            Wishlist.model_id.in_(model_ids)
+    wishlisted = await db.scalars(
+        select(Wishlist.model_id).where(
+            and_(
+                Wishlist.user_id == current_user.id,
+                Wishlist.model_id.in_(model_ids)
+            )
         )
-    ).all()
+    )
     
-    wishlisted_ids = {item.model_id for item in wishlist_items}
+    wishlisted_ids = set(wishlisted)
     
     return {
         "wishlisted": list(wishlisted_ids),
@@ -222,22 +234,24 @@ async def check_wishlist_bulk(
 @router.post("/toggle/{model_id}")
 async def toggle_wishlist(
     model_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_verified_user)
 ):
     """Toggle product in wishlist (add if not present, remove if present)"""
     
-    existing = db.query(Wishlist).filter(
-        and_(
-            Wishlist.user_id == current_user.id,
-            Wishlist.model_id == model_id
-        )
-    ).first()
+    existing = await db.scalar(
+        select(Wishlist).where(
+            and_(
+                Wishlist.user_id == current_user.id,
+                Wishlist.model_id == model_id
+            )
+        ).limit(1)
+    )
     
     if existing:
         # Remove
-        db.delete(existing)
-        db.commit()
+        await db.delete(existing)
+        await db.commit()
         return {
             "success": True,
             "action": "removed",
@@ -251,7 +265,7 @@ async def toggle_wishlist(
             model_id=model_id
         )
         db.add(wishlist_item)
-        db.commit()
+        await db.commit()
         return {
             "success": True,
             "action": "added",
@@ -266,13 +280,15 @@ async def toggle_wishlist(
 
 @router.get("/count")
 async def get_wishlist_count(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get total items in wishlist"""
     
-    count = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id
-    ).count()
+    count = await db.scalar(
+        select(func.count()).select_from(Wishlist).where(
+            Wishlist.user_id == current_user.id
+        )
+    )
     
     return {"count": count}
\ No newline at end of file
@@ -1,19 +1,49 @@
 import { useEffect, useState } from "react";
+import { suggestProducts } from "../services/api";
 
 export default function SearchBar({ onSearch }) {
   const [value, setValue] = useState("");
+  const [suggestions, setSuggestions] = useState([]);
 
   useEffect(() => {
     const t = setTimeout(() => onSearch(value), 500);
     return () => clearTimeout(t);
   }, [value]);
 
+  // Autocomplete is cheap enough to follow every keystroke
+  useEffect(() => {
+    if (!value.trim()) {
+      setSuggestions([]);
+      return;
+    }
+
+    let cancelled = false;
+    const t = setTimeout(() => {
+      suggestProducts(value)
+        .then(res => !cancelled && setSuggestions(res.data))
+        .catch(() => !cancelled && setSuggestions([]));
+    }, 80);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(t);
+    };
+  }, [value]);
+
   return (
-    <input
-      placeholder="Search brand..."
-      value={value}
-      onChange={e => setValue(e.target.value)}
-      style={{ padding: 8, marginBottom: 10 }}
-    />
+    <>
+      <input
+        placeholder="Search brand or model..."
+        value={value}
+        onChange={e => setValue(e.target.value)}
+        list="search-suggestions"
+        style={{ padding: 8, marginBottom: 10 }}
+      />
+      <datalist id="search-suggestions">
+        {suggestions.map(s => (
+          <option key={`${s.kind}-${s.text}`} value={s.text} />
+        ))}
+      </datalist>
+    </>
   );
 }
@@ -266,11 +266,7 @@ const AdminScrapers = () => {
             <div className="etl-steps">
               <span className="step">db_connection</span>
               <span className="arrow">→</span>
-              <span className="step">croma_std</span>
-              <span className="arrow">→</span>
-              <span className="step">flipkart_std</span>
-              <span className="arrow">→</span>
-              <span className="step">amazon_std</span>
+              <span className="step">standardize</span>
               <span className="arrow">→</span>
               <span className="step">unify_tv</span>
               <span className="arrow">→</span>
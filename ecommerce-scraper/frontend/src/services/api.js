@@ -101,8 +101,17 @@ export const getProducts = (params) => API.get("/products", { params });
 
 export const filterProducts = (params) => API.get("/products/filter", { params });
 
+// Array params are repeated (brand=LG&brand=Sony), as /products/facets expects
+export const getFacets = (params) =>
+  API.get("/products/facets", { params, paramsSerializer: { indexes: null } });
+
 export const searchProducts = (q) => API.get("/products/search", { params: { q } });
 
+export const didYouMean = (q) => API.get("/products/did-you-mean", { params: { q } });
+
+export const suggestProducts = (q, limit = 8) =>
+  API.get("/products/suggest", { params: { q, limit } });
+
 export const compareByModel = (model_id) =>
   API.get("/products/compare", { params: { model_id } });
 